@@ -4,4 +4,6 @@ from typing import Literal
 ROOT = Path(__file__).parent.parent
 
 # 解のステータス
-SolutionStatus = Literal["Optimal", "Feasible", "NotSolved", "Unbounded", "Undefined"]
+SolutionStatus = Literal[
+    "Optimal", "Feasible", "NotSolved", "Infeasible", "Unbounded", "Undefined"
+]
@@ -0,0 +1,283 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import polars as pl
+
+from consts import ROOT
+from data_processor import schema
+from data_processor.loader import (
+    ValidationMode,
+    list_optional_sheet_name,
+    read_csv_dir,
+    read_workbook,
+    sheet_name2column_name2dtype,
+    validate_dataset,
+)
+
+RAW_DATA_DIR = ROOT / "data" / "raw"
+RAW_DATA_FROM_BOOK_DIR = ROOT / "data" / "raw_data_from_book"
+INPUT_CACHE_DIR = ROOT / "data" / "cache" / "input"
+MAX_CACHE_BYTES = 1024**3  # キャッシュディレクトリの最大サイズ
+# 読み込み方法や型を変えたときに上げて、古いキャッシュを使わないようにする
+CACHE_FORMAT_VERSION = 2
+VALIDATION_STAMP_FILE_NAME = "validation.json"  # 検証済みの記録のファイル名
+# 書き込み中の一時ファイル・ディレクトリの拡張子（削除の対象にしない）
+TMP_SUFFIX = ".tmp"
+
+
+def get_list_source_path(dataset_name: str) -> list[Path]:
+    """
+    データセットの元データのファイルのリスト
+    data/raw/<dataset_name>.xlsx があればそれを、なければ data/raw_data_from_book/<dataset_name>/ のCSVを使う
+    """
+    xlsx_path = RAW_DATA_DIR / f"{dataset_name}.xlsx"
+    if xlsx_path.exists():
+        return [xlsx_path]
+    csv_dir = RAW_DATA_FROM_BOOK_DIR / dataset_name
+    if csv_dir.is_dir():
+        return sorted(csv_dir.glob("*.csv"))
+    raise FileNotFoundError(f"データセット {dataset_name} の元データが見つかりません")
+
+
+def get_input_cache_fingerprint(list_source_path: list[Path]) -> str:
+    """
+    元データのファイル名と内容、読み込む列の型から、キャッシュを識別するハッシュ値を計算する
+    """
+    h = hashlib.sha256()
+    h.update(str(CACHE_FORMAT_VERSION).encode())
+    h.update(json.dumps(sheet_name2column_name2dtype, sort_keys=True).encode())
+    for path in list_source_path:
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def get_schema_fingerprint() -> str:
+    """
+    検証スキーマの定義から計算するハッシュ値（スキーマを変更すると検証済みの記録が無効になる）
+    """
+    return hashlib.sha256(inspect.getsource(schema).encode()).hexdigest()
+
+
+def load_validation_stamp(
+    fingerprint: str, cache_dir: Path = INPUT_CACHE_DIR
+) -> dict | None:
+    """
+    キャッシュと一緒に保存した検証済みの記録を読み込む。存在しない場合はNoneを返す
+    """
+    path = cache_dir / fingerprint / VALIDATION_STAMP_FILE_NAME
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+
+
+def save_validation_stamp(
+    fingerprint: str,
+    validation_mode: ValidationMode,
+    sample_size: int,
+    schema_name2validation_time: dict[str, float],
+    cache_dir: Path = INPUT_CACHE_DIR,
+):
+    """
+    キャッシュの内容をどのスキーマ・検証方法で検証したかと、スキーマごとの検証時間を保存する
+    """
+    stamp = {
+        "schema_fingerprint": get_schema_fingerprint(),
+        "validation_mode": validation_mode,
+        "sample_size": sample_size,
+        "schema_name2validation_time": schema_name2validation_time,
+    }
+    path = cache_dir / fingerprint / VALIDATION_STAMP_FILE_NAME
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, suffix=TMP_SUFFIX, delete=False
+    ) as f:
+        f.write(json.dumps(stamp, indent=2))
+    os.replace(f.name, path)
+
+
+def is_validated(
+    stamp: dict | None, validation_mode: ValidationMode, sample_size: int
+) -> bool:
+    """
+    検証済みの記録が、現在のスキーマで指定した検証方法と同等以上の検証をしたものかどうか
+    全行を検証した記録はどの検証方法の代わりにもなるが、抽出して検証した記録は
+    抽出による検証で、かつ抽出行数が指定以上の場合だけ代わりになる
+    """
+    if stamp is None or stamp["schema_fingerprint"] != get_schema_fingerprint():
+        return False
+    if stamp["validation_mode"] != "sampled":
+        return True
+    return validation_mode == "sampled" and stamp["sample_size"] >= sample_size
+
+
+def load_input_cache(
+    fingerprint: str, cache_dir: Path = INPUT_CACHE_DIR
+) -> tuple[pl.DataFrame, ...] | None:
+    """
+    キャッシュからシートごとのデータフレームを読み込む。キャッシュが存在しない場合はNoneを返す
+    Arrow IPC形式はpolarsの内部表現とほぼ同じため、型の推定や変換をせずに読み込める
+    元データになかった省略できるシートはNoneとする
+    """
+    path = cache_dir / fingerprint
+    if not path.is_dir():
+        return None
+
+    # 他のプロセスが削除した場合も、キャッシュがないものとして扱う
+    try:
+        ret = tuple(
+            pl.read_ipc(path / f"{sheet_name}.arrow")
+            if sheet_name not in list_optional_sheet_name
+            or (path / f"{sheet_name}.arrow").exists()
+            else None
+            for sheet_name in sheet_name2column_name2dtype
+        )
+        # 最終利用時刻を更新して、古いものから削除されるようにする
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return ret
+
+
+def save_input_cache(
+    list_df: tuple[pl.DataFrame, ...],
+    fingerprint: str,
+    cache_dir: Path = INPUT_CACHE_DIR,
+    max_cache_bytes: int = MAX_CACHE_BYTES,
+):
+    """
+    検証済みのシートごとのデータフレームをキャッシュに保存し、上限サイズを超えた分を削除する
+    複数のプロセスが同時に保存しても壊れないように、プロセスごとに異なる一時ディレクトリに
+    書き込んでから名前を変える
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / fingerprint
+    tmp_path = Path(
+        tempfile.mkdtemp(dir=cache_dir, prefix=f"{fingerprint}.", suffix=TMP_SUFFIX)
+    )
+    for sheet_name, df in zip(sheet_name2column_name2dtype, list_df, strict=True):
+        if df is None:
+            continue
+        df.write_ipc(tmp_path / f"{sheet_name}.arrow")
+    # 書き込み途中のキャッシュを読まないように、書き終えてから名前を変える
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        # 他のプロセスが同じ元データのキャッシュを先に保存した（内容は同じなのでそれを使う）
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    evict_input_cache(cache_dir, max_cache_bytes, keep=[path])
+
+
+def _get_dir_bytes(path: Path) -> int:
+    """
+    ディレクトリ内のファイルの合計サイズ（他のプロセスが削除したものは0とする）
+    """
+    try:
+        return sum(p.stat().st_size for p in path.iterdir())
+    except FileNotFoundError:
+        return 0
+
+
+def _iter_cache_path(cache_dir: Path):
+    """
+    キャッシュのディレクトリ（書き込み中の一時ディレクトリを除く）
+    """
+    for path in cache_dir.iterdir():
+        if path.is_dir() and path.suffix != TMP_SUFFIX:
+            yield path
+
+
+def evict_input_cache(
+    cache_dir: Path = INPUT_CACHE_DIR,
+    max_cache_bytes: int = MAX_CACHE_BYTES,
+    keep: list[Path] | None = None,
+):
+    """
+    キャッシュの合計サイズがmax_cache_bytes以下になるまで、最終利用時刻の古いものから削除する
+    書き込み中の一時ディレクトリと、他のプロセスが同時に削除したものは無視する
+    """
+    keep = keep or []
+    path2mtime = {}
+    for path in _iter_cache_path(cache_dir):
+        try:
+            path2mtime[path] = path.stat().st_mtime
+        except FileNotFoundError:
+            continue
+    list_path = sorted(path2mtime, key=lambda p: path2mtime[p])
+    path2bytes = {p: _get_dir_bytes(p) for p in list_path}
+    total_bytes = sum(path2bytes.values())
+    for path in list_path:
+        if total_bytes <= max_cache_bytes:
+            break
+        if path in keep:
+            continue
+        total_bytes -= path2bytes[path]
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def clear_input_cache(
+    cache_dir: Path = INPUT_CACHE_DIR, fingerprint: str | None = None
+):
+    """
+    キャッシュを削除する。fingerprintを指定した場合はそのデータセットのみ削除する
+    書き込み中の一時ディレクトリは削除しない
+    """
+    if not cache_dir.exists():
+        return
+    for path in _iter_cache_path(cache_dir):
+        if fingerprint is None or path.name == fingerprint:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def read_dataset(list_source_path: list[Path]) -> tuple[pl.DataFrame | None, ...]:
+    """
+    元データ（ExcelまたはCSV）を検証せずに読み込む
+    """
+    if list_source_path[0].suffix == ".xlsx":
+        return read_workbook(list_source_path[0])
+    return read_csv_dir(list_source_path[0].parent)
+
+
+def load_dataset(
+    dataset_name: str,
+    use_cache: bool = True,
+    validation_mode: ValidationMode = "full",
+    sample_size: int = 10000,
+) -> tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame, pl.DataFrame | None]:
+    """
+    データセットの店舗・店舗間距離・配送注文・車種（ない場合はNone）のデータフレームを読み込む
+    use_cacheがTrueの場合はキャッシュを利用し、なければ元データ（ExcelまたはCSV）を読み込んで保存する
+    キャッシュに同等以上の検証済みの記録があり、スキーマも変わっていなければ検証を省略する
+    """
+    list_source_path = get_list_source_path(dataset_name)
+    if not use_cache:
+        list_df = read_dataset(list_source_path)
+        validate_dataset(list_df, validation_mode, sample_size)
+        return list_df
+
+    fingerprint = get_input_cache_fingerprint(list_source_path)
+    list_df = load_input_cache(fingerprint)
+    if list_df is None:
+        list_df = read_dataset(list_source_path)
+        schema_name2validation_time = validate_dataset(
+            list_df, validation_mode, sample_size
+        )
+        save_input_cache(list_df, fingerprint)
+        save_validation_stamp(
+            fingerprint, validation_mode, sample_size, schema_name2validation_time
+        )
+    elif not is_validated(
+        load_validation_stamp(fingerprint), validation_mode, sample_size
+    ):
+        schema_name2validation_time = validate_dataset(
+            list_df, validation_mode, sample_size
+        )
+        save_validation_stamp(
+            fingerprint, validation_mode, sample_size, schema_name2validation_time
+        )
+    return list_df
@@ -1,32 +1,216 @@
+import time
 from pathlib import Path
+from typing import Literal
 
+import fastexcel
 import pandera.polars as pa
 import polars as pl
 from pandera.typing import DataFrame
 
-from data_processor.schema import DistanceSchema, LocationsSchema, OrdersSchema
+from data_processor.schema import (
+    DistanceSchema,
+    LocationsSchema,
+    OrdersSchema,
+    VehiclesSchema,
+)
+
+# シートごとに読み込む列とその型（型を推定させずに指定する）
+sheet_name2column_name2dtype = {
+    "locations_mst": {
+        "location": "string",
+        "x_cord": "float",
+        "y_cord": "float",
+        "is_depot": "int",
+    },
+    "distances_mst": {
+        "location1": "string",
+        "location2": "string",
+        "time_to_move": "float",
+    },
+    "orders": {
+        "order": "string",
+        "store": "string",
+        "weight": "float",
+        "time_window_start": "int",
+        "time_window_end": "int",
+    },
+    "vehicles_mst": {
+        "vehicle": "string",
+        "count": "int",
+        "capacity": "float",
+        "fixed_cost": "float",
+    },
+}
+# 省略できるシート（ない場合はNoneとし、車種は設定データの値を使う）
+list_optional_sheet_name = ["vehicles_mst"]
+
+# CSV形式のデータセット（data/raw_data_from_book）のファイル名・列名と、シート名・列名の対応
+sheet_name2csv_file_name = {
+    "locations_mst": "locations.csv",
+    "distances_mst": "distances.csv",
+    "orders": "orders.csv",
+    "vehicles_mst": "vehicles.csv",
+}
+sheet_name2csv_column_name2column_name = {
+    "locations_mst": {
+        "k": "location",
+        "x": "x_cord",
+        "y": "y_cord",
+        "depo_flag": "is_depot",
+    },
+    "distances_mst": {"k1": "location1", "k2": "location2", "t": "time_to_move"},
+    "orders": {
+        "r": "order",
+        "s": "store",
+        "w": "weight",
+        "b": "time_window_start",
+        "e": "time_window_end",
+    },
+    "vehicles_mst": {
+        "vehicle": "vehicle",
+        "count": "count",
+        "capacity": "capacity",
+        "fixed_cost": "fixed_cost",
+    },
+}
+dtype_name2polars_dtype = {"string": pl.String, "float": pl.Float64, "int": pl.Int64}
+
+# シートごとの検証スキーマ
+sheet_name2schema = {
+    "locations_mst": LocationsSchema,
+    "distances_mst": DistanceSchema,
+    "orders": OrdersSchema,
+    "vehicles_mst": VehiclesSchema,
+}
+
+# 検証方法
+# full: 全行を検証し、最初の違反で例外を送出する（@pa.check_typesと同じ）
+# lazy: 全行を検証し、すべての違反をまとめて例外を送出する
+# sampled: 行数がsample_sizeを超えるシートはsample_size行を無作為に抽出して検証する
+#          （抽出した行の中でしか重複を検出できないため、全行の検証より弱い）
+ValidationMode = Literal["full", "lazy", "sampled"]
+
+
+def _read_sheet(reader: fastexcel.ExcelReader, sheet_name: str) -> pl.DataFrame | None:
+    """
+    開いたワークブックから、シートの必要な列だけを指定した型で読み込む
+    省略できるシートがない場合はNoneを返す
+    """
+    if sheet_name in list_optional_sheet_name and sheet_name not in reader.sheet_names:
+        return None
+    column_name2dtype = sheet_name2column_name2dtype[sheet_name]
+    return reader.load_sheet_by_name(
+        sheet_name,
+        use_columns=list(column_name2dtype),
+        dtypes=column_name2dtype,
+    ).to_polars()
+
+
+def read_workbook(
+    filepath: Path,
+) -> tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame, pl.DataFrame | None]:
+    """
+    ワークブックを一度だけ開いて、店舗・店舗間距離・配送注文・車種のシートを検証せずに読み込む
+    """
+    reader = fastexcel.read_excel(filepath)
+    return tuple(
+        _read_sheet(reader, sheet_name) for sheet_name in sheet_name2column_name2dtype
+    )
+
+
+@pa.check_types
+def load_workbook(
+    filepath: Path,
+) -> tuple[
+    DataFrame[LocationsSchema], DataFrame[DistanceSchema], DataFrame[OrdersSchema]
+]:
+    """
+    ワークブックを一度だけ開いて、店舗・店舗間距離・配送注文の3つのシートを読み込む
+    """
+    return read_workbook(filepath)[:3]
 
 
 @pa.check_types
 def load_locations_mst(filepath: Path) -> DataFrame[LocationsSchema]:
-    df = pl.read_excel(filepath, sheet_name="locations_mst").with_columns(
-        pl.col("x_cord").cast(pl.Float64),
-        pl.col("y_cord").cast(pl.Float64),
-    )
-    return df
+    return _read_sheet(fastexcel.read_excel(filepath), "locations_mst")
 
 
 @pa.check_types
 def load_distances_mst(filepath: Path) -> DataFrame[DistanceSchema]:
-    df = pl.read_excel(filepath, sheet_name="distances_mst").with_columns(
-        pl.col("time_to_move").cast(pl.Float64)
-    )
-    return df
+    return _read_sheet(fastexcel.read_excel(filepath), "distances_mst")
 
 
 @pa.check_types
 def load_orders(filepath: Path) -> DataFrame[OrdersSchema]:
-    df = pl.read_excel(filepath, sheet_name="orders").with_columns(
-        pl.col("weight").cast(pl.Float64)
+    return _read_sheet(fastexcel.read_excel(filepath), "orders")
+
+
+def load_vehicles_mst(filepath: Path) -> DataFrame[VehiclesSchema] | None:
+    df = _read_sheet(fastexcel.read_excel(filepath), "vehicles_mst")
+    return VehiclesSchema.validate(df) if df is not None else None
+
+
+def _read_csv(csv_dir: Path, sheet_name: str) -> pl.DataFrame | None:
+    """
+    CSVファイルを、対応するシートと同じ列名・型で読み込む
+    省略できるシートのファイルがない場合はNoneを返す
+    """
+    csv_path = csv_dir / sheet_name2csv_file_name[sheet_name]
+    if sheet_name in list_optional_sheet_name and not csv_path.exists():
+        return None
+    column_name2dtype = sheet_name2column_name2dtype[sheet_name]
+    csv_column_name2column_name = sheet_name2csv_column_name2column_name[sheet_name]
+    return pl.read_csv(
+        csv_path,
+        columns=list(csv_column_name2column_name),
+        schema_overrides={
+            csv_column_name: dtype_name2polars_dtype[column_name2dtype[column_name]]
+            for csv_column_name, column_name in csv_column_name2column_name.items()
+        },
+    ).rename(csv_column_name2column_name)
+
+
+def read_csv_dir(
+    csv_dir: Path,
+) -> tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame, pl.DataFrame | None]:
+    """
+    CSV形式のデータセットのディレクトリから、店舗・店舗間距離・配送注文・車種を検証せずに読み込む
+    """
+    return tuple(
+        _read_csv(csv_dir, sheet_name) for sheet_name in sheet_name2column_name2dtype
     )
-    return df
+
+
+@pa.check_types
+def load_csv_dir(
+    csv_dir: Path,
+) -> tuple[
+    DataFrame[LocationsSchema], DataFrame[DistanceSchema], DataFrame[OrdersSchema]
+]:
+    """
+    CSV形式のデータセットのディレクトリから、店舗・店舗間距離・配送注文を読み込む
+    """
+    return read_csv_dir(csv_dir)[:3]
+
+
+def validate_dataset(
+    list_df: tuple[pl.DataFrame, ...],
+    validation_mode: ValidationMode = "full",
+    sample_size: int = 10000,
+) -> dict[str, float]:
+    """
+    シートごとのデータフレームをスキーマで検証し、スキーマ名から検証時間（秒）への辞書を返す
+    省略できるシートがない（None）場合は検証しない
+    """
+    schema_name2validation_time = {}
+    for sheet_name, df in zip(sheet_name2schema, list_df, strict=True):
+        if df is None:
+            continue
+        schema = sheet_name2schema[sheet_name]
+        start_time = time.perf_counter()
+        if validation_mode == "sampled" and df.height > sample_size:
+            schema.validate(df, sample=sample_size, random_state=0, lazy=True)
+        else:
+            schema.validate(df, lazy=validation_mode != "full")
+        schema_name2validation_time[schema.__name__] = time.perf_counter() - start_time
+    return schema_name2validation_time
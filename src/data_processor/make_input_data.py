@@ -1,57 +1,138 @@
+import numpy as np
 import polars as pl
 
-from consts import ROOT
-from data_processor.loader import load_distances_mst, load_locations_mst, load_orders
-from optimize_dataclass.io_dataclass import InputData, OrderData, StoreData
+from data_processor.input_cache import load_dataset
+from data_processor.loader import ValidationMode
+from optimize_dataclass.config_dataclass import VehicleTypeData
+from optimize_dataclass.io_dataclass import (
+    InputData,
+    OrderData,
+    OrderDataView,
+    OrderTable,
+    StoreData,
+)
 
 
-def make_input_data(dataset_name: str) -> InputData:
-    dataset_dir = ROOT / "data" / "raw" / f'{dataset_name + ".xlsx"}'
-    df_locations = load_locations_mst(dataset_dir)
-    df_distances = load_distances_mst(dataset_dir)
-    df_orders = load_orders(dataset_dir)
+def make_input_data(
+    dataset_name: str,
+    use_cache: bool = True,
+    validation_mode: ValidationMode = "full",
+    sample_size: int = 10000,
+    use_order_table: bool = True,
+) -> InputData:
+    df_locations, df_distances, df_orders, df_vehicles = load_dataset(
+        dataset_name, use_cache, validation_mode, sample_size
+    )
+    return build_input_data(
+        df_locations, df_distances, df_orders, df_vehicles, use_order_table
+    )
 
+
+def build_input_data(
+    df_locations: pl.DataFrame,
+    df_distances: pl.DataFrame,
+    df_orders: pl.DataFrame,
+    df_vehicles: pl.DataFrame | None = None,
+    use_order_table: bool = True,
+) -> InputData:
+    """
+    店舗・店舗間距離・配送注文・車種のデータフレームから最適化入力データを作る
+    車種のデータフレームがない場合は、車種を設定データで指定する
+    use_order_tableがTrueの場合は、配送注文を列ごとの配列の表で持ち、配送注文データは参照時に作る
+    Falseの場合は、荷物ごとに配送注文データを作る
+    """
     list_delivery_date = list(
         range(
             df_orders["time_window_start"].min(), df_orders["time_window_end"].max() + 1
         )
     )
 
-    list_order_name = df_orders["order"].to_list()
-    order_name_2data = {}
-    for row in df_orders.iter_rows(named=True):
-        order_name_2data[row["order"]] = OrderData(
-            name=row["order"],
-            destination=row["store"],
-            weight=row["weight"],
-            time_window_start=row["time_window_start"],
-            time_window_end=row["time_window_end"],
+    df_depot = df_locations.filter(pl.col("is_depot") != 0)
+    df_stores = df_locations.filter(pl.col("is_depot") == 0)
+    depot_data = StoreData(
+        name=df_depot["location"][0],
+        x_cord=df_depot["x_cord"][0],
+        y_cord=df_depot["y_cord"][0],
+    )
+    list_store_name = df_stores["location"].to_list()
+    store_name2data = {
+        k: StoreData(name=k, x_cord=x, y_cord=y)
+        for k, x, y in zip(
+            list_store_name,
+            df_stores["x_cord"].to_list(),
+            df_stores["y_cord"].to_list(),
+            strict=True,
         )
+    }
+    list_store_and_depot_data = list(store_name2data.values()) + [depot_data]
+    # デポを0番目、店舗をlist_store_nameの順に並べた添字で、移動時間の行列を作る
+    list_location_name = [depot_data.name] + list_store_name
+    location_name2index = {k: i for i, k in enumerate(list_location_name)}
+    num_location = len(location_name2index)
+    move_time_array = np.full((num_location, num_location), np.nan)
+    move_time_array[
+        df_distances["location1"].replace_strict(location_name2index).to_numpy(),
+        df_distances["location2"].replace_strict(location_name2index).to_numpy(),
+    ] = df_distances["time_to_move"].to_numpy()
+    if np.isnan(move_time_array).any():
+        raise ValueError("移動時間が定義されていない地点の組合せがあります")
 
-    list_store_name = df_locations.filter(pl.col("is_depot") == 0)["location"].to_list()
-    depot_data = None
-    store_name2data = {}
-    for row in df_locations.iter_rows(named=True):
-        if row["is_depot"]:
-            depot_data = StoreData(
-                name=row["location"], x_cord=row["x_cord"], y_cord=row["y_cord"]
+    list_order_name = df_orders["order"].to_list()
+    if use_order_table:
+        order_name2data = OrderDataView(
+            OrderTable(
+                list_order_name=list_order_name,
+                list_location_name=list_location_name,
+                destination_index=df_orders["store"]
+                .replace_strict(location_name2index, return_dtype=pl.Int64)
+                .to_numpy(),
+                weight=df_orders["weight"].to_numpy(),
+                time_window_start=df_orders["time_window_start"].to_numpy(),
+                time_window_end=df_orders["time_window_end"].to_numpy(),
             )
-        else:
-            store_name2data[row["location"]] = StoreData(
-                name=row["location"], x_cord=row["x_cord"], y_cord=row["y_cord"]
+        )
+    else:
+        order_name2data = {
+            r: OrderData(
+                name=r,
+                destination=s,
+                weight=w,
+                time_window_start=b,
+                time_window_end=e,
             )
-    list_store_and_depot_data = list(store_name2data.values()) + [depot_data]
-    move_time_matrix = {
-        (row["location1"], row["location2"]): row["time_to_move"]
-        for row in df_distances.iter_rows(named=True)
-    }
+            for r, s, w, b, e in zip(
+                list_order_name,
+                df_orders["store"].to_list(),
+                df_orders["weight"].to_list(),
+                df_orders["time_window_start"].to_list(),
+                df_orders["time_window_end"].to_list(),
+                strict=True,
+            )
+        }
+
+    list_vehicle_type = (
+        [
+            VehicleTypeData(
+                name=row["vehicle"],
+                count=row["count"],
+                capacity=row["capacity"],
+                fixed_cost=row["fixed_cost"],
+            )
+            for row in df_vehicles.iter_rows(named=True)
+        ]
+        if df_vehicles is not None
+        else []
+    )
+
     return InputData(
         list_delivery_date=list_delivery_date,
         list_order_name=list_order_name,
-        order_name2data=order_name_2data,
+        order_name2data=order_name2data,
         list_store_name=list_store_name,
         store_name2data=store_name2data,
         depot_data=depot_data,
         list_store_and_depot_data=list_store_and_depot_data,
-        move_time_matrix=move_time_matrix,
+        location_name2index=location_name2index,
+        move_time_array=move_time_array,
+        list_vehicle_type=list_vehicle_type,
     )
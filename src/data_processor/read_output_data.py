@@ -0,0 +1,13 @@
+import json
+from pathlib import Path
+
+from consts import ROOT
+from optimize_dataclass.io_dataclass import OutputData
+
+
+def read_output_data(output_dir: Path) -> OutputData:
+    """
+    write_output_dataで保存した出力データ(output_data.json)を読み込む
+    """
+    with open(ROOT / output_dir / "output_data.json") as f:
+        return OutputData.model_validate(json.load(f))
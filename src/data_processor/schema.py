@@ -42,3 +42,17 @@ class OrdersSchema(pa.DataFrameModel):
 
     class Config:
         unique = ["order"]
+
+
+class VehiclesSchema(pa.DataFrameModel):
+    """
+    車種データ（省略可能）
+    """
+
+    vehicle: Series[str]
+    count: int = pa.Field(ge=1)
+    capacity: Series[float] = pa.Field(gt=0)
+    fixed_cost: Series[float] = pa.Field(ge=0)
+
+    class Config:
+        unique = ["vehicle"]
@@ -30,6 +30,13 @@ def write_output_data(
         output_data.total_outsourcing_cost,
         output_data.total_move_time,
     ]
+    is_fleet = any(
+        len(daily_data.list_vehicle_route) > 0
+        for daily_data in output_data.date2daily_data.values()
+    )
+    if is_fleet:
+        index.append("車両費用")
+        value.append(output_data.total_vehicle_cost)
     df = pl.DataFrame({"指標": index, "値": value}, strict=False)
     outputs["summary"] = df.clone()
 
@@ -51,6 +58,31 @@ def write_output_data(
         df = pl.DataFrame(data)
         outputs["daily_info"] = df.clone()
 
+    # vehicle_route_info（複数台を扱うモデルのみ）
+    if is_fleet:
+        data = []
+        for d in input_data.list_delivery_date:
+            for i, vehicle_route_data in enumerate(
+                output_data.date2daily_data[d].list_vehicle_route
+            ):
+                route_str = "→".join(
+                    [s.name for s in vehicle_route_data.list_delivery_route]
+                )
+                data.append(
+                    {
+                        "日付": d,
+                        "トラック番号": i,
+                        "車種": vehicle_route_data.vehicle_type_name,
+                        "配送ルート": route_str,
+                        "配送重量": vehicle_route_data.total_weight,
+                        "移動時間": vehicle_route_data.move_time,
+                        "残業時間": vehicle_route_data.overtime,
+                        "残業費用": vehicle_route_data.overtime_cost,
+                        "車両費用": vehicle_route_data.fixed_cost,
+                    }
+                )
+        outputs["vehicle_route_info"] = pl.DataFrame(data)
+
     # orders_info
     data = []
 
@@ -65,7 +97,7 @@ def write_output_data(
                 "注文名": order_name,
                 "配送店舗名": order_data.destination,
                 "重量": order_data.weight,
-                "配送日": delivery_status_data,
+                "配送日": delivery_status_data.delivered_date,
                 "外注フラグ": delivery_status_data.outsourced_flag,
                 "外注費用": delivery_status_data.outsourcing_cost,
             }
@@ -91,3 +123,16 @@ def write_output_data(
     # output_dataをjsonで保存
     with open(ROOT / output_dir / "output_data.json", "w") as f:
         json.dump(output_data.model_dump(mode="json"), f, ensure_ascii=False, indent=4)
+
+    # 求解の進捗（暫定解と下界の推移）をjsonで保存
+    if output_data.solve_info is not None:
+        with open(ROOT / output_dir / "solve_progress.json", "w") as f:
+            json.dump(
+                [
+                    progress_data.model_dump(mode="json")
+                    for progress_data in output_data.solve_info.list_progress
+                ],
+                f,
+                ensure_ascii=False,
+                indent=4,
+            )
@@ -1,22 +1,449 @@
+import asyncio
+import multiprocessing
+import queue
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+
+from models.column_generation_model import ColumnGenerationModel
+from models.decomposition_model import DecompositionModel
+from models.fleet_model import FleetModel
+from models.heuristic_model import HeuristicModel
+from models.lagrangian_bound import LagrangianBoundSolver
 from models.naive_model import NaiveModel
+from models.set_cover_model import SetCoverModel
+from models.solve_progress import SolveProgressRecorder
 from optimize_dataclass.config_dataclass import ConfigData
-from optimize_dataclass.io_dataclass import InputData, OutputData
+from optimize_dataclass.io_dataclass import (
+    DailyData,
+    DeliveryStatusData,
+    InputData,
+    OutputData,
+    PortfolioMemberLogData,
+    ProgressData,
+    SolveInfoData,
+)
 
 solver_model_name2model_class = {
     "naive_model": NaiveModel,
+    "set_cover_model": SetCoverModel,
+    "column_generation_model": ColumnGenerationModel,
+    "heuristic_model": HeuristicModel,
+    "decomposition_model": DecompositionModel,
+    "fleet_model": FleetModel,
 }
 
+# ポートフォリオで、計算時間に加えてモデルの構築と結果の受け渡しを待つ時間（秒）
+PORTFOLIO_GRACE_TIME = 10.0
+
+
+def execute_model(
+    input_data: InputData,
+    config_data: ConfigData,
+    prior_output_data: OutputData | None = None,
+    progress_callback: Callable[[ProgressData], None] | None = None,
+) -> OutputData:
+    """
+    progress_callbackを渡すと、求解中に暫定解または下界が改善するたびに進捗データを渡して呼び出す
+    （ポートフォリオとローリングホライズンでは呼び出さない）
+    """
+    # 前回の最適化結果がなく、初期解を作るモデルが指定されていれば先に解く
+    warm_start_time = None
+    if prior_output_data is None and config_data.warm_start_solver_model_type:
+        start_time = time.perf_counter()
+        prior_output_data = execute_model(
+            input_data,
+            config_data.model_copy(
+                update={
+                    "solver_model_type": config_data.warm_start_solver_model_type,
+                    "warm_start_solver_model_type": None,
+                }
+            ),
+        )
+        warm_start_time = time.perf_counter() - start_time
+
+    # ポートフォリオが指定されていれば、複数の設定を並列に解く
+    if len(config_data.list_portfolio_member) > 0:
+        output_data = execute_portfolio(input_data, config_data, prior_output_data)
+        output_data.solve_info.warm_start_time = warm_start_time
+        return output_data
+
+    # ローリングホライズンが指定されていれば、配送日の区間ごとに解いてつなぎ合わせる
+    if config_data.rolling_horizon_window is not None:
+        output_data = execute_rolling_horizon(
+            input_data, config_data, prior_output_data
+        )
+        output_data.solve_info.warm_start_time = warm_start_time
+        return output_data
 
-def execute_model(input_data: InputData, config_data: ConfigData) -> OutputData:
     model = solver_model_name2model_class[config_data.solver_model_type](
-        input_data, config_data
+        input_data, config_data, prior_output_data
     )
+    start_time = time.perf_counter()
     model.add_variables().add_constraints().add_objectives()
+    build_time = time.perf_counter() - start_time
+
+    model.progress_recorder = SolveProgressRecorder(progress_callback)
+    start_time = time.perf_counter()
     status = model.optimize()
+    solve_time = time.perf_counter() - start_time
 
     if status in ["Optimal", "Feasible"]:
         output_data = model.get_result()
     else:
         raise Exception(f"最適化が正しく完了しませんでした: {status}")
 
+    # モデルの構築時間と求解時間を分けて記録する
+    if output_data.solve_info is None:
+        output_data.solve_info = SolveInfoData()
+    output_data.solve_info.status = status
+    output_data.solve_info.warm_start_time = warm_start_time
+    output_data.solve_info.build_time = build_time
+    output_data.solve_info.solve_time = solve_time
+    output_data.solve_info.list_progress = model.progress_recorder.list_progress
+
+    if config_data.use_lagrangian_bound and status != "Optimal":
+        add_lagrangian_bound(input_data, config_data, output_data)
+
+    return output_data
+
+
+def iter_execute_model(
+    input_data: InputData,
+    config_data: ConfigData,
+    prior_output_data: OutputData | None = None,
+) -> Iterator[ProgressData | OutputData]:
+    """
+    別スレッドでexecute_modelを実行し、求解中の進捗データを順に返し、最後に出力データを返す
+    execute_modelで発生した例外はそのまま送出する
+
+    使い方:
+        for data in iter_execute_model(input_data, config_data):
+            if isinstance(data, ProgressData):
+                print(data.elapsed_time, data.primal_bound, data.dual_bound)
+            else:
+                output_data = data
+    """
+    data_queue = queue.Queue()
+
+    def target():
+        try:
+            data_queue.put(
+                execute_model(
+                    input_data,
+                    config_data,
+                    prior_output_data,
+                    progress_callback=data_queue.put,
+                )
+            )
+        except Exception as e:
+            data_queue.put(e)
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    while True:
+        data = data_queue.get()
+        if isinstance(data, Exception):
+            thread.join()
+            raise data
+        yield data
+        if isinstance(data, OutputData):
+            break
+    thread.join()
+
+
+async def aiter_execute_model(
+    input_data: InputData,
+    config_data: ConfigData,
+    prior_output_data: OutputData | None = None,
+) -> AsyncIterator[ProgressData | OutputData]:
+    """
+    iter_execute_modelの非同期版（進捗データを待つ間もイベントループを止めない）
+    """
+    iterator = iter_execute_model(input_data, config_data, prior_output_data)
+    while True:
+        data = await asyncio.to_thread(next, iterator, None)
+        if data is None:
+            break
+        yield data
+
+
+def add_lagrangian_bound(
+    input_data: InputData, config_data: ConfigData, output_data: OutputData
+):
+    """
+    ラグランジュ緩和による総費用の下界と、得られた解の総費用との相対ギャップを実行情報に記録する
+    """
+    lagrangian_bound_solver = LagrangianBoundSolver(input_data, config_data)
+    lower_bound = lagrangian_bound_solver.solve(upper_bound=output_data.total_cost)
+    output_data.solve_info.lagrangian_lower_bound = lower_bound
+    output_data.solve_info.lagrangian_gap = (
+        output_data.total_cost - lower_bound
+    ) / max(abs(output_data.total_cost), 1e-9)
+    output_data.solve_info.list_lagrangian_log = lagrangian_bound_solver.list_log
+
+
+def _execute_portfolio_member(
+    index: int,
+    input_data: InputData,
+    config_data: ConfigData,
+    prior_output_data: OutputData | None,
+    result_queue: multiprocessing.Queue,
+):
+    """
+    ポートフォリオの1つの設定を別プロセスで解き、結果をキューに入れる
+    """
+    try:
+        output_data = execute_model(input_data, config_data, prior_output_data)
+        result_queue.put((index, output_data.solve_info.status, output_data))
+    except Exception:
+        result_queue.put((index, "Undefined", None))
+
+
+def execute_portfolio(
+    input_data: InputData,
+    config_data: ConfigData,
+    prior_output_data: OutputData | None = None,
+) -> OutputData:
+    """
+    ポートフォリオの設定ごとに別プロセスで並列に解き、最適性が証明された解が得られたら残りを打ち切る
+    最適解が得られなければ、計算時間の上限までに得られた解のうち総費用が最小のものを返す
+    """
+    list_member_config_data = [
+        config_data.model_copy(
+            update={
+                **member_data.model_dump(),
+                "warm_start_solver_model_type": None,
+                "list_portfolio_member": [],
+            }
+        )
+        for member_data in config_data.list_portfolio_member
+    ]
+
+    context = multiprocessing.get_context("spawn")
+    result_queue = context.Queue()
+    list_process = [
+        context.Process(
+            target=_execute_portfolio_member,
+            args=(
+                index,
+                input_data,
+                member_config_data,
+                prior_output_data,
+                result_queue,
+            ),
+            daemon=True,
+        )
+        for index, member_config_data in enumerate(list_member_config_data)
+    ]
+    start_time = time.perf_counter()
+    deadline = start_time + config_data.time_limit + PORTFOLIO_GRACE_TIME
+    for process in list_process:
+        process.start()
+
+    index2result = {}
+    while len(index2result) < len(list_process):
+        try:
+            index, status, output_data = result_queue.get(
+                timeout=max(deadline - time.perf_counter(), 0)
+            )
+        except queue.Empty:
+            break
+        index2result[index] = (status, output_data, time.perf_counter() - start_time)
+        if status == "Optimal":
+            break
+
+    # 結果が得られていない設定は打ち切る
+    for process in list_process:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    elapsed_time = time.perf_counter() - start_time
+
+    list_member_log = []
+    for index, member_config_data in enumerate(list_member_config_data):
+        status, output_data, member_elapsed_time = index2result.get(
+            index, ("NotSolved", None, elapsed_time)
+        )
+        list_member_log.append(
+            PortfolioMemberLogData(
+                solver_model_type=member_config_data.solver_model_type,
+                solver_backend=member_config_data.solver_backend,
+                status=status,
+                elapsed_time=member_elapsed_time,
+                total_cost=output_data.total_cost if output_data is not None else None,
+            )
+        )
+
+    list_index = [
+        index
+        for index, (_, output_data, _) in index2result.items()
+        if output_data is not None
+    ]
+    if len(list_index) == 0:
+        raise Exception("ポートフォリオのどの設定でも実行可能解が得られませんでした")
+    # 最適性が証明された解があればそれを、なければ総費用が最小の解を採用する
+    selected_index = min(
+        list_index,
+        key=lambda index: (
+            index2result[index][0] != "Optimal",
+            index2result[index][1].total_cost,
+        ),
+    )
+    list_member_log[selected_index].is_selected = True
+
+    output_data = index2result[selected_index][1]
+    output_data.solve_info.list_portfolio_member_log = list_member_log
+    return output_data
+
+
+def _summarize_output_data(
+    date2daily_data: dict[int, DailyData],
+    order_name2delivery_status_data: dict[str, DeliveryStatusData],
+    solve_info: SolveInfoData | None = None,
+) -> OutputData:
+    """
+    配送日ごとの配送結果と荷物ごとの配送状況から、総費用などを集計した出力データを作る
+    """
+    total_overtime = sum([v.daily_overtime for v in date2daily_data.values()])
+    total_overtime_cost = sum([v.daily_overtime_cost for v in date2daily_data.values()])
+    total_outsourcing_cost = sum(
+        [
+            v.outsourcing_cost
+            for v in order_name2delivery_status_data.values()
+            if v.outsourced_flag
+        ]
+    )
+    total_vehicle_cost = sum(
+        [
+            vehicle_route_data.fixed_cost
+            for v in date2daily_data.values()
+            for vehicle_route_data in v.list_vehicle_route
+        ]
+    )
+    return OutputData(
+        date2daily_data=date2daily_data,
+        order_name2delivery_status_data=order_name2delivery_status_data,
+        total_overtime=total_overtime,
+        total_overtime_cost=total_overtime_cost,
+        total_outsourcing_cost=total_outsourcing_cost,
+        total_cost=total_overtime_cost + total_outsourcing_cost + total_vehicle_cost,
+        total_move_time=sum([v.daily_move_time for v in date2daily_data.values()]),
+        total_vehicle_cost=total_vehicle_cost,
+        solve_info=solve_info,
+    )
+
+
+def _slice_output_data(
+    output_data: OutputData, list_date: list[int], list_order_name: list[str]
+) -> OutputData:
+    """
+    出力データのうち、指定した配送日の配送結果と、指定した荷物の配送状況（指定した配送日に
+    配送したものと外注したもの）だけを取り出す
+    """
+    set_date = set(list_date)
+    return _summarize_output_data(
+        {d: v for d, v in output_data.date2daily_data.items() if d in set_date},
+        {
+            r: v
+            for r in list_order_name
+            if (v := output_data.order_name2delivery_status_data.get(r)) is not None
+            and (v.delivered_date is None or v.delivered_date in set_date)
+        },
+    )
+
+
+def execute_rolling_horizon(
+    input_data: InputData,
+    config_data: ConfigData,
+    prior_output_data: OutputData | None = None,
+) -> OutputData:
+    """
+    配送日をrolling_horizon_window日ずつの区間に分けて先頭から順に解き、
+    区間の先頭から(rolling_horizon_window - rolling_horizon_overlap)日分の結果を確定させて区間をずらす
+    確定した配送日で配送しなかった荷物は次の区間に持ち越し、最後の区間は全ての配送日を確定させる
+    計算時間の上限は区間ごとに適用し、前回の最適化結果は区間内の部分だけを初期解に使う
+    総費用は確定させた配送日の残業時間コストと車両の固定費用、外注費用の合計とする
+    """
+    window = config_data.rolling_horizon_window
+    overlap = config_data.rolling_horizon_overlap
+    if overlap >= window:
+        raise ValueError(
+            "ローリングホライズンの重なりの日数は区間の日数より小さくしてください"
+        )
+    window_config_data = config_data.model_copy(
+        update={"rolling_horizon_window": None, "use_lagrangian_bound": False}
+    )
+
+    list_delivery_date = sorted(input_data.list_delivery_date)
+    date2daily_data = {}
+    order_name2delivery_status_data = {}
+    build_time = 0.0
+    solve_time = 0.0
+    start = 0
+    while start < len(list_delivery_date):
+        list_window_date = list_delivery_date[start : start + window]
+        is_last_window = start + window >= len(list_delivery_date)
+        list_fixed_date = (
+            list_window_date if is_last_window else list_window_date[: window - overlap]
+        )
+
+        # 配送していない荷物のうち、区間内に配送できるもの
+        list_order_name = [
+            r
+            for r in input_data.list_order_name
+            if r not in order_name2delivery_status_data
+            and input_data.order_name2data[r].time_window_start <= list_window_date[-1]
+            and list_window_date[0] <= input_data.order_name2data[r].time_window_end
+        ]
+        window_output_data = execute_model(
+            input_data.model_copy(
+                update={
+                    "list_delivery_date": list_window_date,
+                    "list_order_name": list_order_name,
+                    "order_name2data": {
+                        r: input_data.order_name2data[r] for r in list_order_name
+                    },
+                }
+            ),
+            window_config_data,
+            None
+            if prior_output_data is None
+            else _slice_output_data(
+                prior_output_data, list_window_date, list_order_name
+            ),
+        )
+        build_time += window_output_data.solve_info.build_time
+        solve_time += window_output_data.solve_info.solve_time
+
+        for d in list_fixed_date:
+            date2daily_data[d] = window_output_data.date2daily_data[d]
+        for (
+            r,
+            delivery_status_data,
+        ) in window_output_data.order_name2delivery_status_data.items():
+            if delivery_status_data.delivered_date in list_fixed_date:
+                order_name2delivery_status_data[r] = delivery_status_data
+
+        if is_last_window:
+            break
+        start += window - overlap
+
+    # どの区間でも配送しなかった荷物は外注する
+    for r in input_data.list_order_name:
+        if r not in order_name2delivery_status_data:
+            order_name2delivery_status_data[r] = DeliveryStatusData(
+                delivered_date=None,
+                outsourced_flag=True,
+                outsourcing_cost=config_data.outsourcing_cost_per_weight
+                * input_data.order_name2data[r].weight,
+            )
+
+    output_data = _summarize_output_data(
+        date2daily_data,
+        order_name2delivery_status_data,
+        SolveInfoData(status="Feasible", build_time=build_time, solve_time=solve_time),
+    )
+    if config_data.use_lagrangian_bound:
+        add_lagrangian_bound(input_data, config_data, output_data)
     return output_data
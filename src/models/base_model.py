@@ -1,16 +1,52 @@
 from abc import ABC, abstractmethod
 from typing import TypeVar
 
+import numpy as np
+
 from consts import SolutionStatus
-from optimize_dataclass.io_dataclass import OutputData
+from optimize_dataclass.config_dataclass import ConfigData
+from optimize_dataclass.io_dataclass import (
+    DailyData,
+    DeliveryStatusData,
+    OutputData,
+    SolveInfoData,
+)
 
 T = TypeVar("T")
 
 
+def get_max_move_time(config: ConfigData) -> float:
+    """
+    1日あたりの最大移動時間
+    """
+    if config.max_overtime_constraint.is_applied:
+        return config.standartd_work_time + config.max_overtime
+    return float("inf")
+
+
+def get_truck_capacity(config: ConfigData) -> float:
+    """
+    トラックの積載量
+    """
+    if config.truck_capacity_constraint.is_applied:
+        return config.truck_capacity
+    return float("inf")
+
+
 class BaseModel(ABC):
-    def __init__(self, optimize_input_data, optimize_config_data):
+    def __init__(
+        self,
+        optimize_input_data,
+        optimize_config_data,
+        prior_output_data: OutputData | None = None,
+    ):
         self.data = optimize_input_data
         self.config = optimize_config_data
+        # 初期解として利用する前回の最適化結果
+        self.prior_output_data = prior_output_data
+        self.message_callback = None  # ソルバーのログを行のリストで受け取る関数
+        # 暫定解と下界の推移の記録器（SolveProgressRecorder）
+        self.progress_recorder = None
 
     @abstractmethod
     def add_variables(self: T) -> T:
@@ -31,3 +67,90 @@ class BaseModel(ABC):
     @abstractmethod
     def get_result(self) -> OutputData:
         pass
+
+    def _get_max_move_time(self) -> float:
+        """
+        1日あたりの最大移動時間
+        """
+        return get_max_move_time(self.config)
+
+    def _get_truck_capacity(self) -> float:
+        """
+        トラックの積載量
+        """
+        return get_truck_capacity(self.config)
+
+    def _get_overtime(self, move_time: float) -> float:
+        """
+        移動時間に対する残業時間
+        """
+        return max(move_time - self.config.standartd_work_time, 0)
+
+    def _make_daily_data(
+        self, list_store_name: list[str], total_weight: float, move_time: float
+    ) -> DailyData:
+        """
+        デポを出発してlist_store_nameの順に店舗を訪問し、デポに戻る1日分の配送結果データ
+        """
+        overtime = self._get_overtime(move_time)
+        return DailyData(
+            list_delivery_route=[self.data.depot_data]
+            + [self.data.store_name2data[s] for s in list_store_name]
+            + [self.data.depot_data],
+            daily_total_weight=total_weight,
+            daily_overtime=overtime,
+            daily_overtime_cost=self.config.overtime_cost_per_hour * overtime,
+            daily_move_time=move_time,
+        )
+
+    def _make_output_data(
+        self,
+        date2daily_data: dict[int, DailyData],
+        order_name2delivered_date: dict[str, int],
+        total_vehicle_cost: float = 0.0,
+        solve_info: SolveInfoData | None = None,
+    ) -> OutputData:
+        """
+        配送日ごとの配送結果と荷物ごとの配送日から、OutputDataを作る
+        配送日のない荷物は外注とし、総費用は配送結果と外注費用から集計する
+        """
+        list_outsourcing_cost = (
+            self.config.outsourcing_cost_per_weight
+            * np.asarray(self.data.get_order_table().weight)
+        ).tolist()
+        order_name2delivery_status_data = {}
+        total_outsourcing_cost = 0.0
+        for r, outsourcing_cost in zip(
+            self.data.list_order_name, list_outsourcing_cost, strict=True
+        ):
+            if r in order_name2delivered_date:
+                order_name2delivery_status_data[r] = DeliveryStatusData(
+                    delivered_date=order_name2delivered_date[r],
+                    outsourced_flag=False,
+                    outsourcing_cost=None,
+                )
+            else:
+                order_name2delivery_status_data[r] = DeliveryStatusData(
+                    delivered_date=None,
+                    outsourced_flag=True,
+                    outsourcing_cost=outsourcing_cost,
+                )
+                total_outsourcing_cost += outsourcing_cost
+
+        total_overtime = sum([v.daily_overtime for v in date2daily_data.values()])
+        total_overtime_cost = sum(
+            [v.daily_overtime_cost for v in date2daily_data.values()]
+        )
+        return OutputData(
+            date2daily_data=date2daily_data,
+            order_name2delivery_status_data=order_name2delivery_status_data,
+            total_overtime=total_overtime,
+            total_overtime_cost=total_overtime_cost,
+            total_outsourcing_cost=total_outsourcing_cost,
+            total_cost=total_overtime_cost
+            + total_outsourcing_cost
+            + total_vehicle_cost,
+            total_move_time=sum([v.daily_move_time for v in date2daily_data.values()]),
+            total_vehicle_cost=total_vehicle_cost,
+            solve_info=solve_info,
+        )
@@ -0,0 +1,215 @@
+import time
+
+import numpy as np
+from ortools.math_opt.python import mathopt
+
+from models.set_cover_model import SetCoverModel
+from optimize_dataclass.io_dataclass import ColumnGenerationLogData, SolveInfoData
+from optimize_dataclass.pattern_dataclass import PatternData
+from route_processor.pattern_enumerator import get_list_deliverable_order_name
+from route_processor.pricing import PricingSolver
+from route_processor.route_table import RouteTable
+from route_processor.route_table_cache import get_route_table
+
+REDUCED_COST_TOLERANCE = 1e-6  # 配送パターンを追加する被約費用の閾値
+# 列生成で計算時間を使い切った場合に、整数計画問題に与える計算時間（秒）
+MIN_MIP_TIME_LIMIT = 1.0
+
+
+class ColumnGenerationModel(SetCoverModel):
+    """
+    列生成による配送パターンを利用した数理モデル
+    少数の配送パターンから始めて、限定主問題のLP緩和の双対値をもとに価格付け問題を解いて
+    配送パターンを追加し、最後に生成した配送パターンだけで整数計画問題を解く
+    """
+
+    def __init__(
+        self, optimize_input_data, optimize_config_data, prior_output_data=None
+    ):
+        super().__init__(optimize_input_data, optimize_config_data, prior_output_data)
+        self.list_column_generation_log = []  # 価格付けの反復ごとのログ
+        self.start_time = None  # 列生成を開始した時刻
+
+    def _get_route_cost(self, route_table: RouteTable) -> np.ndarray:
+        """
+        店舗の組合せごとの目的関数上の配送ルートの費用（実行不可能ならinf）
+        """
+        route_cost = np.zeros(len(route_table.move_time))
+        if self.config.total_move_time_objective.is_applied:
+            route_cost = self.config.overtime_cost_per_hour * np.maximum(
+                route_table.move_time - self.config.standartd_work_time, 0
+            )
+        return np.where(
+            route_table.move_time <= self._get_max_move_time(), route_cost, np.inf
+        )
+
+    def _get_outsourcing_cost(self, r: str) -> float:
+        """
+        目的関数上の荷物の外注費用
+        """
+        if self.config.total_cost_objective.is_applied:
+            return (
+                self.config.outsourcing_cost_per_weight
+                * self.data.order_name2data[r].weight
+            )
+        return 0.0
+
+    def _make_seed_patterns(
+        self, route_table: RouteTable
+    ) -> dict[int, list[PatternData]]:
+        """
+        初期の配送パターンとして、何も配送しないパターンと1店舗だけを訪問するパターンを作成する
+        """
+        truck_capacity = self._get_truck_capacity()
+        max_move_time = self._get_max_move_time()
+
+        date2list_pattern_data = {}
+        for d in self.data.list_delivery_date:
+            list_pattern_data = [
+                PatternData(
+                    list_order_name=[], route_data=route_table.get_route_data(0)
+                )
+            ]
+            list_order_name = get_list_deliverable_order_name(self.data, d)
+            for s in self.data.list_store_name:
+                mask = route_table.get_mask([s])
+                if route_table.move_time[mask] > max_move_time:
+                    continue
+                # 重い荷物から順に積めるだけ積む
+                list_tar_order_name = []
+                weight = 0.0
+                for r in sorted(
+                    list_order_name, key=lambda r: -self.data.order_name2data[r].weight
+                ):
+                    order_data = self.data.order_name2data[r]
+                    if (
+                        order_data.destination == s
+                        and weight + order_data.weight <= truck_capacity
+                    ):
+                        list_tar_order_name.append(r)
+                        weight += order_data.weight
+                if len(list_tar_order_name) > 0:
+                    list_pattern_data.append(
+                        PatternData(
+                            list_order_name=list_tar_order_name,
+                            route_data=route_table.get_route_data(mask),
+                        )
+                    )
+            date2list_pattern_data[d] = list_pattern_data
+
+        return date2list_pattern_data
+
+    def _generate_patterns(self) -> dict[int, list[PatternData]]:
+        """
+        列生成で配送日ごとの配送パターンを生成する
+        """
+        self.start_time = time.perf_counter()
+        route_table = get_route_table(
+            self.data, use_cache=self.config.use_route_table_cache
+        )
+        route_cost = self._get_route_cost(route_table)
+        pricing_solver = PricingSolver(
+            self.data, route_table, self._get_truck_capacity(), route_cost
+        )
+        # 重量を切り上げて解いた価格付けは近似解のため、下界には切り捨てた緩和問題の値を使う
+        relaxed_pricing_solver = PricingSolver(
+            self.data,
+            route_table,
+            self._get_truck_capacity(),
+            route_cost,
+            is_relaxed=True,
+        )
+        date2list_pattern_data = self._make_seed_patterns(route_table)
+
+        # 限定主問題のLP緩和
+        master = mathopt.Model(name="restricted master problem")
+        date2constraint = {
+            d: master.add_linear_constraint(lb=1, ub=1)
+            for d in self.data.list_delivery_date
+        }
+        order_name2constraint = {
+            r: master.add_linear_constraint(lb=1) for r in self.data.list_order_name
+        }
+        for r in self.data.list_order_name:
+            y = master.add_variable(lb=0)
+            order_name2constraint[r].set_coefficient(y, 1)
+            master.objective.set_linear_coefficient(y, self._get_outsourcing_cost(r))
+
+        def add_column(d: int, pattern_data: PatternData):
+            x = master.add_variable(lb=0)
+            date2constraint[d].set_coefficient(x, 1)
+            for r in pattern_data.list_order_name:
+                order_name2constraint[r].set_coefficient(x, 1)
+            mask = route_table.get_mask(pattern_data.route_data.list_store_name)
+            master.objective.set_linear_coefficient(x, route_cost[mask])
+
+        for d in self.data.list_delivery_date:
+            for pattern_data in date2list_pattern_data[d]:
+                add_column(d, pattern_data)
+
+        solver = mathopt.IncrementalSolver(master, mathopt.SolverType.GLOP)
+        for iteration in range(1, self.config.max_pricing_round + 1):
+            result = solver.solve()
+            if result.termination.reason != mathopt.TerminationReason.OPTIMAL:
+                raise Exception(
+                    f"限定主問題のLP緩和が正しく解けませんでした: {result.termination.reason}"
+                )
+            lp_objective = result.objective_value()
+            order_name2profit = {
+                r: result.dual_values(order_name2constraint[r])
+                for r in self.data.list_order_name
+            }
+
+            # 配送日ごとに被約費用が最小の配送パターンを求める
+            lower_bound = lp_objective
+            num_added_pattern = 0
+            for d in self.data.list_delivery_date:
+                value, pattern_data = pricing_solver.solve(d, order_name2profit)
+                date_dual = result.dual_values(date2constraint[d])
+                reduced_cost = -value - date_dual
+                if reduced_cost < -REDUCED_COST_TOLERANCE:
+                    add_column(d, pattern_data)
+                    date2list_pattern_data[d].append(pattern_data)
+                    num_added_pattern += 1
+                if not pricing_solver.is_exact(d, order_name2profit):
+                    value, _ = relaxed_pricing_solver.solve(d, order_name2profit)
+                lower_bound += min(-value - date_dual, 0)
+
+            elapsed_time = time.perf_counter() - self.start_time
+            self.list_column_generation_log.append(
+                ColumnGenerationLogData(
+                    iteration=iteration,
+                    elapsed_time=elapsed_time,
+                    lp_objective=lp_objective,
+                    lower_bound=lower_bound,
+                    num_added_pattern=num_added_pattern,
+                )
+            )
+            if num_added_pattern == 0 or elapsed_time > self.config.time_limit:
+                break
+
+        # 前回の最適化結果の配送パターンは、生成する配送パターンが変わらないように
+        # 限定主問題には加えず、整数計画問題の候補にだけ加える
+        self.date2prior_pattern_data = self._make_prior_patterns(route_table)
+        for d, pattern_data in self.date2prior_pattern_data.items():
+            date2list_pattern_data[d].append(pattern_data)
+
+        return date2list_pattern_data
+
+    def _get_mip_time_limit(self) -> float | None:
+        """
+        整数計画問題の計算時間（設定データの計算時間のうち、列生成で使った残り）
+        """
+        elapsed_time = time.perf_counter() - self.start_time
+        return max(self.config.time_limit - elapsed_time, MIN_MIP_TIME_LIMIT)
+
+    def get_result(self):
+        """
+        OutputDataへの整形
+        """
+        output_data = super().get_result()
+        output_data.solve_info = SolveInfoData(
+            num_pricing_round=len(self.list_column_generation_log),
+            list_column_generation_log=self.list_column_generation_log,
+        )
+        return output_data
@@ -0,0 +1,552 @@
+import math
+import multiprocessing
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from ortools.math_opt.python import mathopt
+
+from consts import SolutionStatus
+from models.base_model import BaseModel
+from models.solver_backend import get_solution_status, solve
+from optimize_dataclass.io_dataclass import (
+    BendersLogData,
+    InputData,
+    SolveInfoData,
+)
+from optimize_dataclass.pattern_dataclass import RouteData
+from route_processor.pattern_enumerator import get_list_deliverable_order_name
+from route_processor.route_table import (
+    compute_route_table,
+    make_move_time_array,
+    satisfies_triangle_inequality,
+)
+
+OBJECTIVE_TOLERANCE = 1e-6  # 下界と上界が一致したとみなす相対誤差
+# 主問題を解く相対ギャップの許容値（カットが追加されなくなったら設定データの値で解き直す）
+MASTER_RELATIVE_GAP_TOLERANCE = 1e-2
+# 1回の反復の部分問題を別プロセスで並列に解く、逐次に解いた場合の推定計算時間（秒）の下限
+# spawnによるプロセスの起動は1CPUの環境で約3秒かかる一方、medium_datasetの部分問題は
+# 2〜4店舗で1つ1ミリ秒未満（60秒の求解で合計約7ミリ秒）のため、通常は逐次に解く
+PARALLEL_MIN_ROUTE_TIME = 1.0
+
+
+def solve_route(input_data: InputData) -> RouteData:
+    """
+    input_dataの全ての店舗を訪問する最短巡回ルート（部分問題）
+    店舗数が少ないため、動的計画法で厳密に解く
+    """
+    route_table = compute_route_table(input_data)
+    return route_table.get_route_data((1 << route_table.num_store) - 1)
+
+
+class DecompositionModel(BaseModel):
+    """
+    荷物の配送日を決める主問題と、配送日ごとの巡回ルートを求める部分問題に分解して解く数理モデル（論理ベンダーズ分解）
+    主問題は店舗の訪問と荷物の配送日を決め、配送日ごとの残業費用は部分問題から得たカットで下から評価する
+    部分問題は主問題で決めた店舗の組合せの最短巡回ルートで、未計算の組合せを並列に解く
+    移動時間が三角不等式を満たせば、店舗を増やしても移動時間は減らないことを利用してカットを作り、
+    満たさなければ店舗の組合せそのものだけを評価するカット（no-goodカット）を作る
+    """
+
+    def __init__(
+        self, optimize_input_data, optimize_config_data, prior_output_data=None
+    ):
+        super().__init__(optimize_input_data, optimize_config_data, prior_output_data)
+        self.model = mathopt.Model(name="decomposition master model")
+        self.result = None  # 主問題の最適化結果格納用
+
+        # 配送日ごとに配送可能な荷物と、その配送先の店舗
+        self.date2list_order_name = {
+            d: get_list_deliverable_order_name(self.data, d)
+            for d in self.data.list_delivery_date
+        }
+        self.date2list_store_name = {
+            d: sorted({self.data.order_name2data[r].destination for r in list_order})
+            for d, list_order in self.date2list_order_name.items()
+        }
+
+        # 店舗を増やしても移動時間が減らないか（三角不等式を満たすか）
+        self.is_metric = satisfies_triangle_inequality(
+            make_move_time_array(
+                self.data,
+                [self.data.depot_data.name] + list(self.data.list_store_name),
+            )
+        )
+        if not self.is_metric:
+            warnings.warn(
+                "移動時間が三角不等式を満たさないため、カットは店舗の組合せごとのno-goodカットのみとします",
+                stacklevel=2,
+            )
+
+        # 決定変数
+        self.y = {}  # 荷物の自社配送を表すbinary変数 (配送日, 荷物)
+        self.z = {}  # 店舗への訪問を表すbinary変数 (配送日, 店舗)
+        self.w = {}  # デポからの出発を表すbinary変数 (配送日)
+        self.theta = {}  # 日ごとの残業費用の下界を表す変数 (配送日)
+
+        # 部分問題の結果
+        self.store_set2route_data = {
+            frozenset(): RouteData(list_store_name=[], move_time=0.0)
+        }  # 店舗の組合せから最短巡回ルートへの変換
+        self.set_cut_store_set = set()  # カットを追加した店舗の組合せ
+        self.executor = None  # 部分問題を並列に解くプロセスプール
+        # 逐次に解いた部分問題1つあたりの計算時間（秒）
+        self.route_time_per_store_set = 0.0
+
+        # 得られた実行可能解のうち目的関数値が最小のもの
+        self.best_objective_value = float("inf")
+        self.best_date2list_order_name = None
+        self.is_optimal = False
+        self.list_benders_log = []  # 反復ごとのログ
+
+    def _get_overtime_cost(self, move_time: float) -> float:
+        """
+        目的関数上の移動時間に対する残業費用
+        """
+        if self.config.total_move_time_objective.is_applied:
+            return self.config.overtime_cost_per_hour * self._get_overtime(move_time)
+        return 0.0
+
+    def _get_outsourcing_cost(self, r: str) -> float:
+        """
+        目的関数上の荷物の外注費用
+        """
+        if self.config.total_cost_objective.is_applied:
+            return (
+                self.config.outsourcing_cost_per_weight
+                * self.data.order_name2data[r].weight
+            )
+        return 0.0
+
+    def _get_location_name2min_move_time(self) -> dict[str, float]:
+        """
+        地点ごとの、その地点に入る移動時間の最小値と出る移動時間の最小値の平均
+        どの巡回ルートの移動時間も、訪問する地点のこの値の合計以上になる
+        """
+        list_location_name = [self.data.depot_data.name] + list(
+            self.data.list_store_name
+        )
+        move_time = make_move_time_array(self.data, list_location_name)
+        np.fill_diagonal(move_time, np.inf)
+        min_move_time = (move_time.min(axis=0) + move_time.min(axis=1)) / 2
+        return dict(zip(list_location_name, min_move_time.tolist(), strict=True))
+
+    def _get_round_trip_time(self, s: str) -> float:
+        """
+        デポと店舗sの往復時間（店舗sを訪問するルートの移動時間の下界）
+        """
+        depot = self.data.depot_data.name
+        return self.data.get_move_time(depot, s) + self.data.get_move_time(s, depot)
+
+    def add_variables(self):
+        """
+        主問題の決定変数の追加
+        """
+        for d in self.data.list_delivery_date:
+            for r in self.date2list_order_name[d]:
+                self.y[d, r] = self.model.add_variable(lb=0, ub=1, is_integer=True)
+            for s in self.date2list_store_name[d]:
+                self.z[d, s] = self.model.add_variable(lb=0, ub=1, is_integer=True)
+            if len(self.date2list_store_name[d]) > 0:
+                self.w[d] = self.model.add_variable(lb=0, ub=1, is_integer=True)
+            self.theta[d] = self.model.add_variable(lb=0)
+        return self
+
+    def add_constraints(self):
+        """
+        主問題の制約条件の追加
+        """
+        location_name2min_move_time = self._get_location_name2min_move_time()
+
+        # 各荷物は、自社配送するなら期間内で高々1回まで
+        for r in self.data.list_order_name:
+            list_y = [
+                self.y[d, r] for d in self.data.list_delivery_date if (d, r) in self.y
+            ]
+            if len(list_y) > 0:
+                self.model.add_linear_constraint(mathopt.fast_sum(list_y) <= 1)
+
+        for d in self.data.list_delivery_date:
+            # 荷物を配送する店舗にだけ訪問する
+            for s in self.date2list_store_name[d]:
+                list_y = [
+                    self.y[d, r]
+                    for r in self.date2list_order_name[d]
+                    if self.data.order_name2data[r].destination == s
+                ]
+                for y in list_y:
+                    self.model.add_linear_constraint(y <= self.z[d, s])
+                self.model.add_linear_constraint(
+                    self.z[d, s] <= mathopt.fast_sum(list_y)
+                )
+
+                # 1店舗だけを訪問するルートから、移動時間と残業費用を下から評価する
+                # （三角不等式を満たさない場合は、他の店舗を経由すると往復時間より短くなりうる）
+                if self.is_metric:
+                    round_trip_time = self._get_round_trip_time(s)
+                    if round_trip_time > self._get_max_move_time():
+                        self.z[d, s].upper_bound = 0
+                    self.model.add_linear_constraint(
+                        self.theta[d]
+                        >= self._get_overtime_cost(round_trip_time) * self.z[d, s]
+                    )
+
+            # 訪問する地点ごとの移動時間の下界の合計から、移動時間と残業費用を下から評価する
+            # デポは店舗を1つでも訪問する配送日だけ出発する
+            list_store_name = self.date2list_store_name[d]
+            if len(list_store_name) > 0:
+                for s in list_store_name:
+                    self.model.add_linear_constraint(self.z[d, s] <= self.w[d])
+                self.model.add_linear_constraint(
+                    self.w[d]
+                    <= mathopt.fast_sum([self.z[d, s] for s in list_store_name])
+                )
+                move_time_lower_bound = location_name2min_move_time[
+                    self.data.depot_data.name
+                ] * self.w[d] + mathopt.fast_sum(
+                    [
+                        location_name2min_move_time[s] * self.z[d, s]
+                        for s in list_store_name
+                    ]
+                )
+                if self.config.max_overtime_constraint.is_applied:
+                    self.model.add_linear_constraint(
+                        move_time_lower_bound <= self._get_max_move_time()
+                    )
+                if self.config.total_move_time_objective.is_applied:
+                    self.model.add_linear_constraint(
+                        self.theta[d]
+                        >= self.config.overtime_cost_per_hour
+                        * (move_time_lower_bound - self.config.standartd_work_time)
+                    )
+
+            # トラックの積載量
+            if self.config.truck_capacity_constraint.is_applied:
+                self.model.add_linear_constraint(
+                    mathopt.fast_sum(
+                        [
+                            self.data.order_name2data[r].weight * self.y[d, r]
+                            for r in self.date2list_order_name[d]
+                        ]
+                    )
+                    <= self.config.truck_capacity
+                )
+        return self
+
+    def add_objectives(self):
+        """
+        主問題の目的関数（外注費用と残業費用の下界の合計）
+        """
+        self.model.minimize(
+            mathopt.fast_sum(
+                [self._get_outsourcing_cost(r) for r in self.data.list_order_name]
+            )
+            - mathopt.fast_sum(
+                [self._get_outsourcing_cost(r) * y for (_, r), y in self.y.items()]
+            )
+            + mathopt.fast_sum(list(self.theta.values()))
+        )
+        return self
+
+    def _make_route_input_data(self, store_set: frozenset[str]) -> InputData:
+        """
+        部分問題の入力データ（デポと店舗の組合せだけに絞った入力データ）
+        """
+        list_store_name = sorted(store_set)
+        list_location_name = [self.data.depot_data.name] + list_store_name
+        return self.data.model_copy(
+            update={
+                "list_order_name": [],
+                "order_name2data": {},
+                "list_store_name": list_store_name,
+                "store_name2data": {
+                    s: self.data.store_name2data[s] for s in list_store_name
+                },
+                "location_name2index": {k: i for i, k in enumerate(list_location_name)},
+                "move_time_array": make_move_time_array(self.data, list_location_name),
+            }
+        )
+
+    def _solve_routes(self, list_store_set: list[frozenset[str]]) -> int:
+        """
+        未計算の店舗の組合せの最短巡回ルートを求め、求めた組合せの数を返す
+        逐次に解いた場合の推定計算時間が長い場合は、配送日ごとの組合せを計算スレッド数に
+        分けてプロセスで並列に解く
+        """
+        list_store_set = list(
+            {s for s in list_store_set if s not in self.store_set2route_data}
+        )
+        estimated_time = self.route_time_per_store_set * len(list_store_set)
+        if (
+            self.config.threads > 1
+            and len(list_store_set) > 1
+            and estimated_time >= PARALLEL_MIN_ROUTE_TIME
+        ):
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.config.threads,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            list_route_data = self.executor.map(
+                solve_route,
+                [self._make_route_input_data(s) for s in list_store_set],
+                chunksize=math.ceil(len(list_store_set) / self.config.threads),
+            )
+            for store_set, route_data in zip(
+                list_store_set, list_route_data, strict=True
+            ):
+                self.store_set2route_data[store_set] = route_data
+        elif len(list_store_set) > 0:
+            start_time = time.perf_counter()
+            for store_set in list_store_set:
+                self.store_set2route_data[store_set] = solve_route(
+                    self._make_route_input_data(store_set)
+                )
+            self.route_time_per_store_set = (time.perf_counter() - start_time) / len(
+                list_store_set
+            )
+        return len(list_store_set)
+
+    def _get_store_set(self, list_order_name: list[str]) -> frozenset[str]:
+        """
+        荷物の配送先の店舗の組合せ
+        """
+        return frozenset(
+            [self.data.order_name2data[r].destination for r in list_order_name]
+        )
+
+    def _evaluate(self, date2list_order_name: dict[int, list[str]]) -> float:
+        """
+        配送日ごとの配送する荷物から、最大移動時間を超える配送日は配送しないことにして
+        実行可能解とし、その目的関数値が最小なら保持する
+        """
+        date2list_order_name = {
+            d: list_order
+            if self.store_set2route_data[self._get_store_set(list_order)].move_time
+            <= self._get_max_move_time()
+            else []
+            for d, list_order in date2list_order_name.items()
+        }
+        set_delivered = {r for v in date2list_order_name.values() for r in v}
+        objective_value = sum(
+            [
+                self._get_outsourcing_cost(r)
+                for r in self.data.list_order_name
+                if r not in set_delivered
+            ]
+        ) + sum(
+            [
+                self._get_overtime_cost(
+                    self.store_set2route_data[self._get_store_set(v)].move_time
+                )
+                for v in date2list_order_name.values()
+            ]
+        )
+        if objective_value < self.best_objective_value:
+            self.best_objective_value = objective_value
+            self.best_date2list_order_name = date2list_order_name
+        return objective_value
+
+    def _make_prior_date2list_order_name(self) -> dict[int, list[str]]:
+        """
+        前回の最適化結果から、今回配送できない荷物と積載量を超える荷物を除いた配送日ごとの荷物
+        """
+        date2list_order_name = {d: [] for d in self.data.list_delivery_date}
+        date2weight = dict.fromkeys(self.data.list_delivery_date, 0.0)
+        for (
+            r,
+            delivery_status_data,
+        ) in self.prior_output_data.order_name2delivery_status_data.items():
+            d = delivery_status_data.delivered_date
+            if (d, r) not in self.y:
+                continue
+            weight = self.data.order_name2data[r].weight
+            if date2weight[d] + weight <= self._get_truck_capacity():
+                date2list_order_name[d].append(r)
+                date2weight[d] += weight
+        return date2list_order_name
+
+    def _make_solution_hint(self) -> mathopt.SolutionHint | None:
+        """
+        これまでで最良の実行可能解を主問題の初期解（ヒント）に変換する
+        """
+        if self.best_date2list_order_name is None:
+            return None
+        values = dict.fromkeys(
+            [*self.y.values(), *self.z.values(), *self.w.values()], 0.0
+        )
+        for d, list_order_name in self.best_date2list_order_name.items():
+            for r in list_order_name:
+                values[self.y[d, r]] = 1.0
+            store_set = self._get_store_set(list_order_name)
+            for s in store_set:
+                values[self.z[d, s]] = 1.0
+            if len(store_set) > 0:
+                values[self.w[d]] = 1.0
+            values[self.theta[d]] = self._get_overtime_cost(
+                self.store_set2route_data[store_set].move_time
+            )
+        return mathopt.SolutionHint(variable_values=values)
+
+    def _add_cuts(self, store_set: frozenset[str]) -> int:
+        """
+        店舗の組合せの最短巡回ルートから、その組合せを含む全ての配送日にカットを追加し、追加した数を返す
+        - 最大移動時間を超えるなら、組合せの店舗を全て訪問することを禁止する
+        - そうでなければ、組合せの店舗を全て訪問するなら残業費用はそのルートの残業費用以上
+        三角不等式を満たさない場合は、組合せ以外の店舗を訪問しない場合だけに限る（no-goodカット）
+        """
+        if len(store_set) == 0 or store_set in self.set_cut_store_set:
+            return 0
+        self.set_cut_store_set.add(store_set)
+        move_time = self.store_set2route_data[store_set].move_time
+        overtime_cost = self._get_overtime_cost(move_time)
+        is_feasible = move_time <= self._get_max_move_time()
+        if is_feasible and overtime_cost == 0:
+            return 0
+
+        num_added_cut = 0
+        for d in self.data.list_delivery_date:
+            if not store_set <= set(self.date2list_store_name[d]):
+                continue
+            sum_z = mathopt.fast_sum([self.z[d, s] for s in store_set])
+            if not self.is_metric:
+                sum_z -= mathopt.fast_sum(
+                    [
+                        self.z[d, s]
+                        for s in self.date2list_store_name[d]
+                        if s not in store_set
+                    ]
+                )
+            if is_feasible:
+                self.model.add_linear_constraint(
+                    self.theta[d] >= overtime_cost * (sum_z - len(store_set) + 1)
+                )
+            else:
+                self.model.add_linear_constraint(sum_z <= len(store_set) - 1)
+            num_added_cut += 1
+        return num_added_cut
+
+    def optimize(self) -> SolutionStatus:
+        """
+        主問題を解き、主問題で決めた配送日ごとの店舗の組合せの部分問題を解いてカットを追加することを、
+        下界と上界が一致するか、反復回数か計算時間の上限に達するまで繰り返す
+        """
+        start_time = time.perf_counter()
+        deadline = start_time + self.config.time_limit
+        master_config = self.config.model_copy(
+            update={"relative_gap_tolerance": MASTER_RELATIVE_GAP_TOLERANCE}
+        )
+        lower_bound = -float("inf")
+        try:
+            if self.prior_output_data is not None:
+                date2list_order_name = self._make_prior_date2list_order_name()
+                self._solve_routes(
+                    [self._get_store_set(v) for v in date2list_order_name.values()]
+                )
+                self._evaluate(date2list_order_name)
+
+            for iteration in range(1, self.config.max_benders_round + 1):
+                solution_hint = self._make_solution_hint()
+                self.result = solve(
+                    self.model,
+                    master_config,
+                    model_params=mathopt.ModelSolveParameters(
+                        solution_hints=[solution_hint]
+                    )
+                    if solution_hint is not None
+                    else None,
+                    msg_cb=self.message_callback,
+                    time_limit=max(deadline - time.perf_counter(), 0),
+                )
+                status = get_solution_status(self.result)
+                if status not in ["Optimal", "Feasible"]:
+                    break
+                # ギャップを許して解いた主問題の下界は単調とは限らないため、最大値を下界とする
+                lower_bound = max(
+                    lower_bound, self.result.termination.objective_bounds.dual_bound
+                )
+
+                # 主問題の解の配送日ごとの荷物と、その配送先の店舗の組合せ
+                values = self.result.variable_values()
+                date2list_order_name = {
+                    d: [r for r in v if values[self.y[d, r]] > 0.5]
+                    for d, v in self.date2list_order_name.items()
+                }
+                list_store_set = [
+                    self._get_store_set(v) for v in date2list_order_name.values()
+                ]
+                num_solved_route = self._solve_routes(list_store_set)
+                self._evaluate(date2list_order_name)
+
+                # 主問題の残業費用の下界が部分問題の残業費用より小さい配送日にカットを追加
+                num_added_cut = 0
+                for d, store_set in zip(
+                    date2list_order_name, list_store_set, strict=True
+                ):
+                    route_data = self.store_set2route_data[store_set]
+                    if (
+                        route_data.move_time > self._get_max_move_time()
+                        or self._get_overtime_cost(route_data.move_time)
+                        > values[self.theta[d]] + OBJECTIVE_TOLERANCE
+                    ):
+                        num_added_cut += self._add_cuts(store_set)
+
+                elapsed_time = time.perf_counter() - start_time
+                self.list_benders_log.append(
+                    BendersLogData(
+                        iteration=iteration,
+                        elapsed_time=elapsed_time,
+                        lower_bound=lower_bound,
+                        upper_bound=self.best_objective_value,
+                        num_solved_route=num_solved_route,
+                        num_added_cut=num_added_cut,
+                    )
+                )
+                if self.progress_recorder is not None:
+                    self.progress_recorder.record(
+                        primal_bound=self.best_objective_value,
+                        dual_bound=lower_bound,
+                    )
+                self.is_optimal = (
+                    self.best_objective_value - lower_bound
+                    <= OBJECTIVE_TOLERANCE * abs(self.best_objective_value)
+                )
+                if self.is_optimal or time.perf_counter() >= deadline:
+                    break
+                if num_added_cut == 0:
+                    # 主問題をギャップを許して解いた場合は、設定データの値で解き直す
+                    if master_config is self.config:
+                        break
+                    master_config = self.config
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+        if self.best_date2list_order_name is None:
+            return "NotSolved"
+        return "Optimal" if self.is_optimal else "Feasible"
+
+    def get_result(self):
+        """
+        OutputDataへの整形
+        """
+        date2daily_data = {}
+        order_name2delivered_date = {}
+        for d, list_order_name in self.best_date2list_order_name.items():
+            for r in list_order_name:
+                order_name2delivered_date[r] = d
+            route_data = self.store_set2route_data[self._get_store_set(list_order_name)]
+            date2daily_data[d] = self._make_daily_data(
+                route_data.list_store_name,
+                sum([self.data.order_name2data[r].weight for r in list_order_name]),
+                route_data.move_time,
+            )
+
+        return self._make_output_data(
+            date2daily_data,
+            order_name2delivered_date,
+            solve_info=SolveInfoData(list_benders_log=self.list_benders_log),
+        )
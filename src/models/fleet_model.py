@@ -0,0 +1,425 @@
+import itertools
+from collections.abc import Iterable
+
+from ortools.math_opt.python import mathopt
+
+from models.set_cover_model import SetCoverModel
+from optimize_dataclass.config_dataclass import VehicleTypeData
+from optimize_dataclass.io_dataclass import (
+    DailyData,
+    VehicleRouteData,
+)
+from optimize_dataclass.pattern_dataclass import PatternData
+from route_processor.pattern_enumerator import PatternEnumerator
+from route_processor.route_table import RouteTable
+from route_processor.route_table_cache import get_route_table
+
+
+class FleetModel(SetCoverModel):
+    """
+    複数の車種・台数のトラックを扱う配送パターンを利用した数理モデル
+    車種ごとに積載量に応じた配送パターンを列挙し、配送日・車種・配送パターンごとに
+    その配送パターンで配送するトラックの台数を整数変数とする
+    同じ車種のトラックを区別しないため、台数を増やしても変数の数は変わらず、
+    トラックを入れ替えただけの解（対称性）も生じない
+    """
+
+    def __init__(
+        self, optimize_input_data, optimize_config_data, prior_output_data=None
+    ):
+        super().__init__(optimize_input_data, optimize_config_data, prior_output_data)
+        self.model = mathopt.Model(name="fleet model")
+        self.list_vehicle_type = self.config.get_list_vehicle_type(
+            self.data.list_vehicle_type
+        )
+
+        # 配送パターン（配送日と車種の番号の組から配送パターンのリストへの変換）
+        self.date_vehicle2list_pattern_data = {}
+        # 配送日と車種の番号の組から、前回の最適化結果の配送パターンのリストへの変換
+        self.date_vehicle2list_prior_pattern_data = {}
+        # 配送日と車種の番号の組から、前回の最適化結果の配送パターンの番号のリストへの変換
+        self.date_vehicle2list_prior_pattern_index = {}
+
+        # 決定変数
+        self.x = {}  # 配送日・車種・配送パターンごとのトラックの台数を表す整数変数
+
+        # 中間変数
+        self.total_vehicle_cost = None  # 計画期間全体の車両の固定費用
+
+    def _get_vehicle_capacity(self, vehicle_type_data: VehicleTypeData) -> float:
+        """
+        車種の積載量
+        """
+        if self.config.truck_capacity_constraint.is_applied:
+            return vehicle_type_data.capacity
+        return float("inf")
+
+    def _generate_patterns(self) -> dict[tuple[int, int], Iterable[PatternData]]:
+        """
+        配送日と車種ごとの配送パターンを生成する
+        何も配送しない配送パターンは、トラックを使わないことで表すため除く
+        """
+        route_table = get_route_table(
+            self.data, use_cache=self.config.use_route_table_cache
+        )
+        date_vehicle2iter_pattern_data = {}
+        for k, vehicle_type_data in enumerate(self.list_vehicle_type):
+            pattern_enumerator = PatternEnumerator(
+                self.data,
+                route_table,
+                self._get_vehicle_capacity(vehicle_type_data),
+                self._get_max_move_time(),
+            )
+            for d in self.data.list_delivery_date:
+                date_vehicle2iter_pattern_data[d, k] = (
+                    pattern_data
+                    for pattern_data in pattern_enumerator.iter_patterns(d)
+                    if len(pattern_data.list_order_name) > 0
+                )
+
+        # 前回の最適化結果の配送パターンは支配されていても候補に加える
+        self.date_vehicle2list_prior_pattern_data = self._make_prior_fleet_patterns(
+            route_table
+        )
+        for key, list_pattern_data in self.date_vehicle2list_prior_pattern_data.items():
+            date_vehicle2iter_pattern_data[key] = itertools.chain(
+                list_pattern_data, date_vehicle2iter_pattern_data[key]
+            )
+        return date_vehicle2iter_pattern_data
+
+    def _make_prior_fleet_patterns(
+        self, route_table: RouteTable
+    ) -> dict[tuple[int, int], list[PatternData]]:
+        """
+        前回の最適化結果から配送日と車種ごとの配送パターンを作る
+        配送日ごとに、重い荷物から順に、同じ店舗を訪問するトラックか最初に積めるトラックに割り当て、
+        最大残業時間を超えるトラックの荷物と、どのトラックにも積めない荷物は外注する
+        """
+        if self.prior_output_data is None:
+            return {}
+        date2list_order_name = {d: [] for d in self.data.list_delivery_date}
+        for (
+            r,
+            delivery_status_data,
+        ) in self.prior_output_data.order_name2delivery_status_data.items():
+            d = delivery_status_data.delivered_date
+            order_data = self.data.order_name2data.get(r)
+            if (
+                d in date2list_order_name
+                and order_data is not None
+                and order_data.time_window_start <= d <= order_data.time_window_end
+            ):
+                date2list_order_name[d].append(r)
+
+        # 積載量の大きい車種から使う
+        list_vehicle_index = sorted(
+            [
+                k
+                for k, vehicle_type_data in enumerate(self.list_vehicle_type)
+                for _ in range(vehicle_type_data.count)
+            ],
+            key=lambda k: -self.list_vehicle_type[k].capacity,
+        )
+        date_vehicle2list_prior_pattern_data = {}
+        for d, list_order_name in date2list_order_name.items():
+            list_vehicle_order_name = [[] for _ in list_vehicle_index]
+            list_vehicle_weight = [0.0 for _ in list_vehicle_index]
+            for r in sorted(
+                list_order_name, key=lambda r: -self.data.order_name2data[r].weight
+            ):
+                order_data = self.data.order_name2data[r]
+                list_candidate = [
+                    v
+                    for v, k in enumerate(list_vehicle_index)
+                    if list_vehicle_weight[v] + order_data.weight
+                    <= self._get_vehicle_capacity(self.list_vehicle_type[k])
+                ]
+                if len(list_candidate) == 0:
+                    continue
+                v = next(
+                    (
+                        v
+                        for v in list_candidate
+                        if any(
+                            self.data.order_name2data[r2].destination
+                            == order_data.destination
+                            for r2 in list_vehicle_order_name[v]
+                        )
+                    ),
+                    list_candidate[0],
+                )
+                list_vehicle_order_name[v].append(r)
+                list_vehicle_weight[v] += order_data.weight
+
+            for v, k in enumerate(list_vehicle_index):
+                if len(list_vehicle_order_name[v]) == 0:
+                    continue
+                mask = route_table.get_mask(
+                    [
+                        self.data.order_name2data[r].destination
+                        for r in list_vehicle_order_name[v]
+                    ]
+                )
+                if route_table.move_time[mask] > self._get_max_move_time():
+                    continue
+                date_vehicle2list_prior_pattern_data.setdefault((d, k), []).append(
+                    PatternData(
+                        list_order_name=list_vehicle_order_name[v],
+                        route_data=route_table.get_route_data(mask),
+                    )
+                )
+        return date_vehicle2list_prior_pattern_data
+
+    def add_variables(self):
+        """
+        配送パターンの生成と決定変数の追加
+        """
+        date_vehicle2iter_pattern_data = self._generate_patterns()
+
+        # x
+        self.order_name2list_x = {r: [] for r in self.data.list_order_name}
+        for d in self.data.list_delivery_date:
+            for k, vehicle_type_data in enumerate(self.list_vehicle_type):
+                self.date_vehicle2list_pattern_data[d, k] = []
+                list_prior_pattern_data = self.date_vehicle2list_prior_pattern_data.get(
+                    (d, k), []
+                )
+                for q, pattern_data in enumerate(date_vehicle2iter_pattern_data[d, k]):
+                    self.date_vehicle2list_pattern_data[d, k].append(pattern_data)
+                    if any(pattern_data is p for p in list_prior_pattern_data):
+                        self.date_vehicle2list_prior_pattern_index.setdefault(
+                            (d, k), []
+                        ).append(q)
+                    self.x[d, k, q] = self.model.add_integer_variable(
+                        lb=0, ub=vehicle_type_data.count, name=f"x_{d}_{k}_{q}"
+                    )
+                    for r in pattern_data.list_order_name:
+                        self.order_name2list_x[r].append(self.x[d, k, q])
+
+        # y
+        for r in self.data.list_order_name:
+            self.y[r] = self.model.add_variable(lb=0, ub=1, name=f"y_{r}")
+
+        # total_overtime
+        self.total_overtime = self._add_intermediate_variable(
+            sum(
+                [
+                    self._get_overtime(pattern_data.route_data.move_time)
+                    * self.x[d, k, q]
+                    for (d, k), list_pattern_data in (
+                        self.date_vehicle2list_pattern_data.items()
+                    )
+                    for q, pattern_data in enumerate(list_pattern_data)
+                ]
+            ),
+            "total_overtime",
+        )
+        # total_overtime_cost
+        self.total_overtime_cost = self._add_intermediate_variable(
+            self.config.overtime_cost_per_hour * self.total_overtime,
+            "total_overtime_cost",
+        )
+
+        # total_outsourcing_cost
+        self.total_outsourcing_cost = self._add_intermediate_variable(
+            sum(
+                [
+                    self.config.outsourcing_cost_per_weight
+                    * self.data.order_name2data[r].weight
+                    * self.y[r]
+                    for r in self.data.list_order_name
+                ]
+            ),
+            "outsourcing_cost",
+        )
+
+        # total_vehicle_cost
+        self.total_vehicle_cost = self._add_intermediate_variable(
+            sum(
+                [
+                    self.list_vehicle_type[k].fixed_cost * self.x[d, k, q]
+                    for (d, k), list_pattern_data in (
+                        self.date_vehicle2list_pattern_data.items()
+                    )
+                    for q in range(len(list_pattern_data))
+                ]
+            ),
+            "total_vehicle_cost",
+        )
+
+        # total_cost
+        self.total_cost = self._add_intermediate_variable(
+            self.total_overtime_cost
+            + self.total_outsourcing_cost
+            + self.total_vehicle_cost,
+            "total_cost",
+        )
+
+        # total_move_time
+        self.total_move_time = self._add_intermediate_variable(
+            sum(
+                [
+                    pattern_data.route_data.move_time * self.x[d, k, q]
+                    for (d, k), list_pattern_data in (
+                        self.date_vehicle2list_pattern_data.items()
+                    )
+                    for q, pattern_data in enumerate(list_pattern_data)
+                ]
+            ),
+            "total_move_time",
+        )
+
+        return self
+
+    def add_constraints(self):
+        """
+        制約条件の追加
+        積載量と最大残業時間の制約条件は配送パターンの列挙時に考慮済み
+        """
+        # 各配送日に使うトラックは車種ごとの台数以下
+        for (d, k), list_pattern_data in self.date_vehicle2list_pattern_data.items():
+            if len(list_pattern_data) == 0:
+                continue
+            self.model.add_linear_constraint(
+                sum([self.x[d, k, q] for q in range(len(list_pattern_data))])
+                <= self.list_vehicle_type[k].count
+            )
+
+        # 各荷物は外注するか、選択した配送パターンのいずれかで自社配送する
+        for r in self.data.list_order_name:
+            self.model.add_linear_constraint(
+                self.y[r] + sum(self.order_name2list_x[r]) >= 1
+            )
+
+        return self
+
+    def add_objectives(self):
+        obj_value = 0
+        if self.config.total_move_time_objective.is_applied:
+            obj_value += self.total_overtime_cost
+        if self.config.total_cost_objective.is_applied:
+            obj_value += self.total_outsourcing_cost + self.total_vehicle_cost
+
+        self.model.minimize(obj_value)
+        return self
+
+    def _make_solution_hint(self) -> mathopt.SolutionHint | None:
+        """
+        前回の最適化結果の配送パターンを選択する初期解（ヒント）
+        """
+        if self.prior_output_data is None:
+            return None
+        values = {}
+        set_delivered_order_name = set()
+        total_overtime = 0.0
+        total_move_time = 0.0
+        total_vehicle_cost = 0.0
+        for (d, k), list_pattern_data in self.date_vehicle2list_pattern_data.items():
+            list_prior_q = self.date_vehicle2list_prior_pattern_index.get((d, k), [])
+            for q in range(len(list_pattern_data)):
+                values[self.x[d, k, q]] = float(list_prior_q.count(q))
+            for q in list_prior_q:
+                pattern_data = list_pattern_data[q]
+                set_delivered_order_name.update(pattern_data.list_order_name)
+                total_overtime += self._get_overtime(pattern_data.route_data.move_time)
+                total_move_time += pattern_data.route_data.move_time
+                total_vehicle_cost += self.list_vehicle_type[k].fixed_cost
+
+        total_outsourcing_cost = 0.0
+        for r in self.data.list_order_name:
+            values[self.y[r]] = 0.0 if r in set_delivered_order_name else 1.0
+            total_outsourcing_cost += (
+                self.config.outsourcing_cost_per_weight
+                * self.data.order_name2data[r].weight
+                * values[self.y[r]]
+            )
+        total_overtime_cost = self.config.overtime_cost_per_hour * total_overtime
+        values[self.total_overtime] = total_overtime
+        values[self.total_overtime_cost] = total_overtime_cost
+        values[self.total_outsourcing_cost] = total_outsourcing_cost
+        values[self.total_vehicle_cost] = total_vehicle_cost
+        values[self.total_cost] = (
+            total_overtime_cost + total_outsourcing_cost + total_vehicle_cost
+        )
+        values[self.total_move_time] = total_move_time
+        return mathopt.SolutionHint(variable_values=values)
+
+    def get_result(self):
+        """
+        OutputDataへの整形
+        """
+
+        date2daily_data = {}
+        order_name2delivered_date = {}
+        for d in self.data.list_delivery_date:
+            list_vehicle_route = []
+            for k, vehicle_type_data in enumerate(self.list_vehicle_type):
+                for q, pattern_data in enumerate(
+                    self.date_vehicle2list_pattern_data[d, k]
+                ):
+                    num_vehicle = round(self.result.variable_values(self.x[d, k, q]))
+                    for _ in range(num_vehicle):
+                        # 複数の配送パターンに含まれる荷物は、最も早い配送日の最初のトラックで配送する
+                        list_order_name = [
+                            r
+                            for r in pattern_data.list_order_name
+                            if r not in order_name2delivered_date
+                        ]
+                        for r in list_order_name:
+                            order_name2delivered_date[r] = d
+
+                        move_time = pattern_data.route_data.move_time
+                        overtime = self._get_overtime(move_time)
+                        list_vehicle_route.append(
+                            VehicleRouteData(
+                                vehicle_type_name=vehicle_type_data.name,
+                                list_delivery_route=[
+                                    self.data.store_name2data[s]
+                                    for s in pattern_data.route_data.list_store_name
+                                ],
+                                total_weight=sum(
+                                    [
+                                        self.data.order_name2data[r].weight
+                                        for r in list_order_name
+                                    ]
+                                ),
+                                overtime=overtime,
+                                overtime_cost=self.config.overtime_cost_per_hour
+                                * overtime,
+                                fixed_cost=vehicle_type_data.fixed_cost,
+                                move_time=move_time,
+                            )
+                        )
+
+            # 1日分の配送ルートは、トラックごとのルートをデポでつなげたもの
+            list_derivery_route = [self.data.depot_data]
+            for vehicle_route_data in list_vehicle_route:
+                vehicle_route_data.list_delivery_route = (
+                    [self.data.depot_data]
+                    + vehicle_route_data.list_delivery_route
+                    + [self.data.depot_data]
+                )
+                list_derivery_route += vehicle_route_data.list_delivery_route[1:]
+            if len(list_vehicle_route) == 0:
+                list_derivery_route.append(self.data.depot_data)
+
+            date2daily_data[d] = DailyData(
+                list_delivery_route=list_derivery_route,
+                daily_total_weight=sum([v.total_weight for v in list_vehicle_route]),
+                daily_overtime=sum([v.overtime for v in list_vehicle_route]),
+                daily_overtime_cost=sum([v.overtime_cost for v in list_vehicle_route]),
+                daily_move_time=sum([v.move_time for v in list_vehicle_route]),
+                list_vehicle_route=list_vehicle_route,
+            )
+
+        return self._make_output_data(
+            date2daily_data,
+            order_name2delivered_date,
+            total_vehicle_cost=sum(
+                [
+                    v.fixed_cost
+                    for daily_data in date2daily_data.values()
+                    for v in daily_data.list_vehicle_route
+                ]
+            ),
+        )
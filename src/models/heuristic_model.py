@@ -0,0 +1,432 @@
+import time
+
+import numpy as np
+
+from consts import SolutionStatus
+from models.base_model import BaseModel
+from route_processor.route_table import make_move_time_array
+
+EPS = 1e-9  # 改善とみなす費用の減少量の下限
+OUTSOURCED = -1  # 外注した荷物の配送日の添字
+
+
+class HeuristicModel(BaseModel):
+    """
+    数理最適化ソルバーを使わない発見的解法のモデル
+    1. 配送可能日が少ない荷物、重い荷物から順に、費用の増分が最小の配送日へ割り当てる
+       （配送ルートは最安挿入で延ばし、費用の増分が外注費用を上回る荷物は外注する）
+    2. 各配送日の配送ルートの2-opt、荷物の配送日の移動、2つの荷物の配送日の交換を
+       改善がなくなるか計算時間の上限に達するまで繰り返す
+    3. 割り当てる荷物の順番を乱数で揺らして1, 2をheuristic_num_start回繰り返し、最良の解を返す
+    最適性の保証はないが高速に解が得られ、厳密解法の初期解としても利用できる
+    前回の最適化結果が与えられた場合は、1回目の初期解をそこから構築する
+    配送日i、地点k（0番目がデポ）、荷物jは0始まりの整数の添字で扱う
+    """
+
+    def __init__(
+        self, optimize_input_data, optimize_config_data, prior_output_data=None
+    ):
+        super().__init__(optimize_input_data, optimize_config_data, prior_output_data)
+
+        # 添字
+        self.num_date = len(self.data.list_delivery_date)
+        self.list_location_name = [self.data.depot_data.name] + list(
+            self.data.list_store_name
+        )  # 地点名のリスト（0番目がデポ）
+        order_table = self.data.get_order_table()
+        self.order_location = order_table.get_destination(
+            self.list_location_name
+        )  # 荷物ごとの配送先の地点
+        self.order_weight = order_table.weight.copy()  # 荷物ごとの重量
+        date = np.array(self.data.list_delivery_date, dtype=np.int64)
+        start = order_table.time_window_start[None, :]
+        end = order_table.time_window_end[None, :]
+        # 配送日と荷物ごとの配送可否 (配送日数, 荷物数)
+        self.is_deliverable = (start <= date[:, None]) & (date[:, None] <= end)
+        self.move_time = make_move_time_array(
+            self.data, self.list_location_name
+        )  # 地点間の移動時間 (地点数, 地点数)
+
+        # 解
+        self.order_date = np.array([])  # 荷物ごとの配送日（外注ならOUTSOURCED）
+        self.date2route = []  # 配送日ごとの訪問する店舗の順番
+        self.date_move_time = np.array([])  # 配送日ごとの移動時間
+        self.date_weight = np.array([])  # 配送日ごとの配送重量
+        self.store_count = np.array([])  # 配送日と地点ごとの配送する荷物の数
+
+        # 制約条件
+        self.truck_capacity = float("inf")  # トラックの積載量
+        self.max_move_time = float("inf")  # 1日あたりの最大移動時間
+
+        # 目的関数
+        self.overtime_cost_per_hour = 0.0  # 目的関数上の残業時間コスト
+        self.order_outsourcing_cost = np.array([])  # 目的関数上の荷物ごとの外注費用
+
+    def add_variables(self):
+        """
+        解の初期化
+        """
+        self._reset_solution()
+        return self
+
+    def _reset_solution(self):
+        """
+        全ての荷物を外注し、どの配送日も配送しない解に戻す
+        """
+        num_order = len(self.data.list_order_name)
+        self.order_date = np.full(num_order, OUTSOURCED, dtype=np.int64)
+        self.date2route = [[] for _ in range(self.num_date)]
+        self.date_move_time = np.zeros(self.num_date)
+        self.date_weight = np.zeros(self.num_date)
+        self.store_count = np.zeros(
+            (self.num_date, len(self.list_location_name)), dtype=np.int64
+        )
+
+    def add_constraints(self):
+        """
+        制約条件の設定
+        """
+        self.truck_capacity = self._get_truck_capacity()
+        self.max_move_time = self._get_max_move_time()
+        return self
+
+    def add_objectives(self):
+        """
+        目的関数の設定
+        """
+        if self.config.total_move_time_objective.is_applied:
+            self.overtime_cost_per_hour = self.config.overtime_cost_per_hour
+        self.order_outsourcing_cost = np.zeros(len(self.data.list_order_name))
+        if self.config.total_cost_objective.is_applied:
+            self.order_outsourcing_cost = (
+                self.config.outsourcing_cost_per_weight * self.order_weight
+            )
+        return self
+
+    def _get_route_move_time(self, route: list[int]) -> float:
+        """
+        デポを出発して店舗を順に訪問し、デポに戻る移動時間
+        """
+        path = [0, *route, 0]
+        return float(self.move_time[path[:-1], path[1:]].sum())
+
+    def _get_date_cost(self, move_time: float) -> float:
+        """
+        移動時間に対する目的関数上の残業時間コスト
+        """
+        return self.overtime_cost_per_hour * self._get_overtime(move_time)
+
+    def _insert_store(self, route: list[int], s: int) -> list[int]:
+        """
+        移動時間の増分が最小となる位置に店舗を挿入したルート（最安挿入）
+        """
+        path = np.array([0, *route, 0])
+        delta = (
+            self.move_time[path[:-1], s]
+            + self.move_time[s, path[1:]]
+            - self.move_time[path[:-1], path[1:]]
+        )
+        pos = int(np.argmin(delta))
+        return route[:pos] + [s] + route[pos:]
+
+    def _improve_route(self, route: list[int]) -> list[int]:
+        """
+        2-optで区間を反転して移動時間が短くなる限りルートを改善する
+        """
+        best_move_time = self._get_route_move_time(route)
+        improved = True
+        while improved:
+            improved = False
+            for a in range(len(route) - 1):
+                for b in range(a + 2, len(route) + 1):
+                    candidate = route[:a] + route[a:b][::-1] + route[b:]
+                    move_time = self._get_route_move_time(candidate)
+                    if move_time < best_move_time - EPS:
+                        route, best_move_time = candidate, move_time
+                        improved = True
+        return route
+
+    def _evaluate_change(
+        self, i: int, list_removed: list[int], list_added: list[int]
+    ) -> tuple[float, list[int], float] | None:
+        """
+        配送日iから荷物list_removedを外し、荷物list_addedを加えたときの
+        残業時間コストの増分と新しいルートと移動時間（実行不可能ならNone）
+        """
+        weight = (
+            self.date_weight[i]
+            + self.order_weight[list_added].sum()
+            - self.order_weight[list_removed].sum()
+        )
+        if weight > self.truck_capacity + EPS:
+            return None
+
+        location2count = {}
+        for j in list_removed:
+            s = int(self.order_location[j])
+            location2count[s] = location2count.get(s, self.store_count[i, s]) - 1
+        for j in list_added:
+            s = int(self.order_location[j])
+            location2count[s] = location2count.get(s, self.store_count[i, s]) + 1
+
+        route = self.date2route[i]
+        list_removed_store = [
+            s for s, count in location2count.items() if count == 0 and s in route
+        ]
+        if len(list_removed_store) > 0:
+            route = [s for s in route if s not in list_removed_store]
+        for s, count in location2count.items():
+            if count > 0 and self.store_count[i, s] == 0:
+                route = self._insert_store(route, s)
+        if route is self.date2route[i]:
+            move_time = self.date_move_time[i]
+        else:
+            move_time = self._get_route_move_time(route)
+        if move_time > self.max_move_time + EPS:
+            return None
+
+        delta = self._get_date_cost(move_time) - self._get_date_cost(
+            self.date_move_time[i]
+        )
+        return delta, route, move_time
+
+    def _apply_change(
+        self,
+        i: int,
+        list_removed: list[int],
+        list_added: list[int],
+        route: list[int],
+        move_time: float,
+    ):
+        """
+        配送日iから荷物list_removedを外し、荷物list_addedを加える
+        """
+        for j in list_removed:
+            self.store_count[i, self.order_location[j]] -= 1
+            self.date_weight[i] -= self.order_weight[j]
+        for j in list_added:
+            self.store_count[i, self.order_location[j]] += 1
+            self.date_weight[i] += self.order_weight[j]
+            self.order_date[j] = i
+        self.date2route[i] = route
+        self.date_move_time[i] = move_time
+
+    def _get_total_cost(self) -> float:
+        """
+        目的関数上の総費用
+        """
+        return sum(
+            [self._get_date_cost(move_time) for move_time in self.date_move_time]
+        ) + float(self.order_outsourcing_cost[self.order_date == OUTSOURCED].sum())
+
+    def _construct_from_prior(self):
+        """
+        前回の最適化結果で自社配送した荷物を、実行可能な限り同じ配送日に割り当てる
+        """
+        order_name2index = {r: j for j, r in enumerate(self.data.list_order_name)}
+        date2index = {d: i for i, d in enumerate(self.data.list_delivery_date)}
+        for (
+            r,
+            delivery_status_data,
+        ) in self.prior_output_data.order_name2delivery_status_data.items():
+            i = date2index.get(delivery_status_data.delivered_date)
+            j = order_name2index.get(r)
+            if i is None or j is None or not self.is_deliverable[i, j]:
+                continue
+            change = self._evaluate_change(i, [], [j])
+            if change is not None:
+                self._apply_change(i, [], [j], *change[1:])
+
+    def _construct(self, list_order: list[int]):
+        """
+        貪欲法による初期解の構築（list_orderの順に荷物を割り当てる）
+        """
+        for j in list_order:
+            if self.order_date[j] != OUTSOURCED:
+                continue
+            best = None
+            for i in np.nonzero(self.is_deliverable[:, j])[0].tolist():
+                change = self._evaluate_change(i, [], [j])
+                if change is None:
+                    continue
+                delta, route, move_time = change
+                key = (delta, move_time - self.date_move_time[i])
+                if best is None or key < best[0]:
+                    best = (key, i, route, move_time)
+            if best is not None and best[0][0] <= self.order_outsourcing_cost[j]:
+                _, i, route, move_time = best
+                self._apply_change(i, [], [j], route, move_time)
+
+    def _relocate(self, deadline: float) -> bool:
+        """
+        荷物を1つずつ別の配送日または外注に移して費用が減れば移す
+        """
+        improved = False
+        for j in range(len(self.order_date)):
+            if time.perf_counter() > deadline:
+                break
+            i1 = int(self.order_date[j])
+            if i1 == OUTSOURCED:
+                delta1, change1 = -self.order_outsourcing_cost[j], None
+            else:
+                change1 = self._evaluate_change(i1, [j], [])
+                # 三角不等式を満たさない場合は、店舗を外すと移動時間が増えて実行不可能になりうる
+                if change1 is None:
+                    continue
+                delta1 = change1[0]
+
+            # 外注に移す
+            best = None
+            if i1 != OUTSOURCED:
+                best = (delta1 + self.order_outsourcing_cost[j], OUTSOURCED, None)
+            # 別の配送日に移す
+            for i2 in np.nonzero(self.is_deliverable[:, j])[0].tolist():
+                if i2 == i1:
+                    continue
+                change2 = self._evaluate_change(i2, [], [j])
+                if change2 is not None and (
+                    best is None or delta1 + change2[0] < best[0]
+                ):
+                    best = (delta1 + change2[0], i2, change2)
+            if best is None or best[0] >= -EPS:
+                continue
+
+            _, i2, change2 = best
+            if i1 != OUTSOURCED:
+                self._apply_change(i1, [j], [], *change1[1:])
+                self.order_date[j] = OUTSOURCED
+            if i2 != OUTSOURCED:
+                self._apply_change(i2, [], [j], *change2[1:])
+            improved = True
+        return improved
+
+    def _swap(self, deadline: float) -> bool:
+        """
+        2つの荷物の配送日（外注を含む）を入れ替えて費用が減れば入れ替える
+        """
+        improved = False
+        num_order = len(self.order_date)
+        for j1 in range(num_order):
+            for j2 in range(j1 + 1, num_order):
+                if time.perf_counter() > deadline:
+                    return improved
+                i1, i2 = int(self.order_date[j1]), int(self.order_date[j2])
+                if i1 == i2:
+                    continue
+                if (i2 != OUTSOURCED and not self.is_deliverable[i2, j1]) or (
+                    i1 != OUTSOURCED and not self.is_deliverable[i1, j2]
+                ):
+                    continue
+
+                delta = 0.0
+                list_change = []
+                for i, removed, added in [(i1, j1, j2), (i2, j2, j1)]:
+                    if i == OUTSOURCED:
+                        delta += (
+                            self.order_outsourcing_cost[added]
+                            - self.order_outsourcing_cost[removed]
+                        )
+                        continue
+                    change = self._evaluate_change(i, [removed], [added])
+                    if change is None:
+                        break
+                    delta += change[0]
+                    list_change.append((i, removed, added, change))
+                else:
+                    if delta < -EPS:
+                        for i, removed, added, change in list_change:
+                            self._apply_change(i, [removed], [added], *change[1:])
+                        for i, added in [(i1, j2), (i2, j1)]:
+                            if i == OUTSOURCED:
+                                self.order_date[added] = OUTSOURCED
+                        improved = True
+        return improved
+
+    def _improve_routes(self) -> bool:
+        """
+        各配送日のルートを2-optで改善する
+        """
+        improved = False
+        for i, route in enumerate(self.date2route):
+            new_route = self._improve_route(route)
+            if new_route != route:
+                self.date2route[i] = new_route
+                self.date_move_time[i] = self._get_route_move_time(new_route)
+                improved = True
+        return improved
+
+    def optimize(self) -> SolutionStatus:
+        """
+        最適化の実行
+        """
+        deadline = time.perf_counter() + self.config.time_limit
+        # 配送可能日が少ない荷物、重い荷物から順に割り当てる（2回目以降は重さを乱数で揺らす）
+        num_deliverable_date = self.is_deliverable.sum(axis=0)
+        list_order = np.lexsort((-self.order_weight, num_deliverable_date)).tolist()
+        rng = np.random.default_rng(0)
+
+        best = None
+        for start in range(self.config.heuristic_num_start):
+            if start > 0:
+                if time.perf_counter() > deadline:
+                    break
+                list_order = np.lexsort(
+                    (
+                        -self.order_weight * rng.uniform(0.5, 1.5, len(list_order)),
+                        num_deliverable_date,
+                    )
+                ).tolist()
+            self._reset_solution()
+            # 前回の最適化結果があれば、1回目はそれを元に初期解を構築する
+            if start == 0 and self.prior_output_data is not None:
+                self._construct_from_prior()
+            self._construct(list_order)
+            self._improve_routes()
+            while time.perf_counter() < deadline:
+                improved = self._relocate(deadline)
+                improved |= self._swap(deadline)
+                improved |= self._improve_routes()
+                if not improved:
+                    break
+
+            total_cost = self._get_total_cost()
+            if best is None or total_cost < best[0] - EPS:
+                best = (
+                    total_cost,
+                    self.order_date.copy(),
+                    [route.copy() for route in self.date2route],
+                    self.date_move_time.copy(),
+                    self.date_weight.copy(),
+                    self.store_count.copy(),
+                )
+                if self.progress_recorder is not None:
+                    self.progress_recorder.record(primal_bound=total_cost)
+
+        (
+            _,
+            self.order_date,
+            self.date2route,
+            self.date_move_time,
+            self.date_weight,
+            self.store_count,
+        ) = best
+        return "Feasible"
+
+    def get_result(self):
+        """
+        OutputDataへの整形
+        """
+        date2daily_data = {}
+        for i, d in enumerate(self.data.list_delivery_date):
+            date2daily_data[d] = self._make_daily_data(
+                [self.list_location_name[k] for k in self.date2route[i]],
+                float(self.order_weight[self.order_date == i].sum()),
+                self._get_route_move_time(self.date2route[i]),
+            )
+
+        order_name2delivered_date = {
+            r: self.data.list_delivery_date[int(self.order_date[j])]
+            for j, r in enumerate(self.data.list_order_name)
+            if self.order_date[j] != OUTSOURCED
+        }
+        return self._make_output_data(date2daily_data, order_name2delivered_date)
@@ -0,0 +1,231 @@
+import numpy as np
+
+from consts import SolutionStatus
+from models.naive_model import NaiveModel
+from optimize_dataclass.io_dataclass import OrderData
+
+
+class IncrementalNaiveModel(NaiveModel):
+    """
+    構築したモデルを保持したまま、荷物の追加・取消・変更を差分としてモデルに反映して解き直す素朴なモデル
+    荷物の変更で影響を受けるyの変数と制約条件だけを追加・削除し、前回の最適化結果を初期解として渡す
+    新しい荷物の配送先がその配送日に訪問しうる店舗になければ、店舗への移動と店舗からの移動の
+    変数と制約条件をその配送日にだけ追加する
+
+    使い方:
+        model = IncrementalNaiveModel(input_data, config_data)
+        model.add_variables().add_constraints().add_objectives()
+        model.optimize()
+        model.add_order(order_data)
+        model.cancel_order(order_name)
+        model.optimize()
+        output_data = model.get_result()
+    """
+
+    def __init__(
+        self, optimize_input_data, optimize_config_data, prior_output_data=None
+    ):
+        # 荷物の変更で入力データを書き換えるため、荷物のリストと辞書は複製する
+        optimize_input_data = optimize_input_data.model_copy(
+            update={
+                "list_order_name": list(optimize_input_data.list_order_name),
+                "order_name2data": dict(optimize_input_data.order_name2data),
+            }
+        )
+        super().__init__(optimize_input_data, optimize_config_data, prior_output_data)
+
+    def add_order(self, order_data: OrderData):
+        """
+        荷物の追加
+        """
+        if order_data.name in self.order_name2index:
+            raise ValueError(f"荷物 {order_data.name} は既に存在します")
+        if order_data.destination not in self.data.store_name2data:
+            raise ValueError(f"店舗 {order_data.destination} は存在しません")
+
+        j = self.num_order
+        self.num_order += 1
+        self.order_name2index[order_data.name] = j
+        self.data.list_order_name.append(order_data.name)
+        self.data.order_name2data[order_data.name] = order_data
+        self.order_location = np.append(
+            self.order_location, self.location_name2index[order_data.destination]
+        )
+        self.order_weight = np.append(self.order_weight, order_data.weight)
+        date = np.array(self.data.list_delivery_date, dtype=np.int64)
+        self.is_deliverable = np.column_stack(
+            [
+                self.is_deliverable,
+                (order_data.time_window_start <= date)
+                & (date <= order_data.time_window_end),
+            ]
+        )
+
+        list_i = np.nonzero(self.is_deliverable[:, j])[0].tolist()
+        s = int(self.order_location[j])
+        for i in list_i:
+            if s not in self.date2list_location[i]:
+                self._add_location(i, s)
+            self.date2list_order[i].append(j)
+            self.y[i, j] = self.model.add_variable(
+                lb=0,
+                ub=1,
+                is_integer=True,
+                name=self._get_name(
+                    "y", self.data.list_delivery_date[i], order_data.name
+                ),
+            )
+        self._add_order_constraints(j)
+
+        # 既存の制約条件に荷物jの係数を追加
+        outsourcing_cost = self.config.outsourcing_cost_per_weight * order_data.weight
+        for i in list_i:
+            self.intermediate_constraint["outsourcing_cost"].set_coefficient(
+                self.y[i, j], outsourcing_cost
+            )
+            if i in self.capacity_constraint:
+                self.capacity_constraint[i].set_coefficient(
+                    self.y[i, j], order_data.weight
+                )
+            if (i, s) in self.flow_balance_constraint:
+                self.flow_balance_constraint[i, s].set_coefficient(
+                    self.y[i, j], -order_data.weight
+                )
+        self._update_order_dependent_bounds(list_i)
+        return self
+
+    def cancel_order(self, order_name: str):
+        """
+        荷物の取消
+        荷物の添字は詰めずに欠番とし、変数と制約条件だけを削除する
+        """
+        if order_name not in self.order_name2index:
+            raise ValueError(f"荷物 {order_name} は存在しません")
+
+        j = self.order_name2index.pop(order_name)
+        self.data.list_order_name.remove(order_name)
+        del self.data.order_name2data[order_name]
+
+        list_i = np.nonzero(self.is_deliverable[:, j])[0].tolist()
+        self.is_deliverable[:, j] = False
+        for i in list_i:
+            self.date2list_order[i].remove(j)
+            # 変数を削除すると、その変数を含む制約条件の係数も削除される
+            self.model.delete_variable(self.y.pop((i, j)))
+            self.model.delete_linear_constraint(self.visit_constraint.pop((i, j)))
+        if j in self.at_most_once_constraint:
+            self.model.delete_linear_constraint(self.at_most_once_constraint.pop(j))
+        self._update_order_dependent_bounds(list_i)
+        return self
+
+    def update_order(self, order_data: OrderData):
+        """
+        荷物の指定配送期間・重量・配送先の変更（取消と追加として反映する）
+        """
+        self.cancel_order(order_data.name)
+        return self.add_order(order_data)
+
+    def _add_location(self, i: int, s: int):
+        """
+        配送日iに訪問しうる地点に店舗sを加え、店舗sへの移動と店舗sからの移動の変数を
+        既存の制約条件に追加する
+        店舗数に依存するMTZ定式化の訪問順の上限も更新する（フローの上限は荷物の追加後に更新する）
+        """
+        list_location = list(self.date2list_location[i])
+        self.date2list_location[i].append(s)
+        list_arc = [(k, s) for k in list_location] + [(s, k) for k in list_location]
+        for k1, k2 in list_arc:
+            self._add_x_variable(i, k1, k2)
+            self.intermediate_constraint["total_move_time"].set_coefficient(
+                self.x[i, k1, k2], -self.move_time[k1, k2]
+            )
+            self.overtime_constraint[i].set_coefficient(
+                self.x[i, k1, k2], self.move_time[k1, k2]
+            )
+
+        # 既存の地点の制約条件に店舗sとの間の移動を追加
+        for k in list_location:
+            self.degree_constraint[i, k].set_coefficient(self.x[i, k, s], 1.0)
+            self.degree_constraint[i, k].set_coefficient(self.x[i, s, k], -1.0)
+            self.in_degree_constraint[i, k].set_coefficient(self.x[i, s, k], 1.0)
+        self._add_location_constraints(i, s)
+        for j in self.date2list_order[i]:
+            self.visit_constraint[i, j].set_coefficient(
+                self.x[i, s, int(self.order_location[j])], -1.0
+            )
+
+        if self.config.subtour_elimination_type == "mtz":
+            self._add_u_variable(i, s)
+            n = len(self.date2list_location[i]) - 1
+            for k in list_location[1:]:
+                self.u[i, k].upper_bound = n
+                self._add_mtz_constraint(i, k, s)
+                self._add_mtz_constraint(i, s, k)
+            for s1 in list_location[1:]:
+                for s2 in list_location[1:]:
+                    if s1 != s2:
+                        constraint = self.mtz_constraint[i, s1, s2]
+                        constraint.set_coefficient(self.x[i, s1, s2], float(n))
+                        constraint.upper_bound = n - 1
+        elif self.config.subtour_elimination_type == "flow":
+            for k1, k2 in list_arc:
+                if k2 != 0:
+                    self._add_f_variable(i, k1, k2)
+                    self._add_flow_capacity_constraint(i, k1, k2, self._get_max_flow(i))
+            for k in list_location[1:]:
+                constraint = self.flow_balance_constraint[i, k]
+                constraint.set_coefficient(self.f[i, s, k], 1.0)
+                constraint.set_coefficient(self.f[i, k, s], -1.0)
+                constraint.set_coefficient(self.x[i, s, k], -1.0)
+            self._add_flow_balance_constraint(i, s)
+
+    def _update_order_dependent_bounds(self, list_i: list[int]):
+        """
+        荷物の集合に依存する定数の更新
+        外注費用の定数項と、配送日list_iのフローの上限（配送可能な荷物の重量と訪問しうる店舗数による）
+        """
+        outsourcing_cost = self.config.outsourcing_cost_per_weight * float(
+            self.order_weight[list(self.order_name2index.values())].sum()
+        )
+        constraint = self.intermediate_constraint["outsourcing_cost"]
+        constraint.lower_bound = outsourcing_cost
+        constraint.upper_bound = outsourcing_cost
+
+        if self.config.subtour_elimination_type != "flow":
+            return
+        for i in list_i:
+            max_flow = self._get_max_flow(i)
+            for k1, s2 in self._iter_arc(i):
+                if s2 != 0:
+                    self.flow_capacity_constraint[i, k1, s2].set_coefficient(
+                        self.x[i, k1, s2], -max_flow
+                    )
+
+    def _add_day_symmetry_constraint(self):
+        """
+        荷物の追加・取消で配送可能な荷物が同じ配送日の組が変わるため、配送日間の対称性除去は加えない
+        （積載量に対するナップサック被覆不等式は、荷物を追加・取消しても妥当なまま）
+        """
+        pass
+
+    def _add_store_capacity_linking_constraint(self):
+        """
+        店舗の追加で訪問しうる店舗への移動が増えると妥当でなくなるため、加えない
+        """
+        pass
+
+    def _add_tour_lower_bound_constraint(self):
+        """
+        店舗の追加で訪問しうる店舗間の移動が増えると妥当でなくなるため、加えない
+        """
+        pass
+
+    def optimize(self) -> SolutionStatus:
+        """
+        最適化の実行
+        実行可能解が得られたら、次に解き直すときの初期解として保持する
+        """
+        status = super().optimize()
+        if status in ["Optimal", "Feasible"]:
+            self.prior_output_data = self.get_result()
+        return status
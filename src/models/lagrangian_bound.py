@@ -0,0 +1,157 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from models.base_model import get_max_move_time, get_truck_capacity
+from optimize_dataclass.config_dataclass import ConfigData
+from optimize_dataclass.io_dataclass import InputData, LagrangianLogData
+from route_processor.pricing import PricingSolver
+from route_processor.route_table_cache import get_route_table
+
+INITIAL_STEP_SCALE = 2.0  # 劣勾配法の更新幅の係数の初期値
+MIN_STEP_SCALE = 1e-4  # 劣勾配法の更新幅の係数の下限
+STEP_SCALE_PATIENCE = 5  # 下界が改善しないときに更新幅の係数を半分にするまでの反復回数
+BOUND_TOLERANCE = 1e-6  # 下界が上界に達したとみなす相対誤差
+
+
+class LagrangianBoundSolver:
+    """
+    各荷物を高々1回配送する制約をラグランジュ緩和し、劣勾配法で総費用（残業費用+外注費用）の下界を求める
+    ラグランジュ乗数を荷物の利得とみなすと、緩和問題は配送日ごとの価格付け問題に分解でき、
+    緩和問題の最適値 = 利得の合計 - 配送日ごとの (利得の合計 - 配送ルートの費用) の最大値
+    となる。価格付け問題は重量を切り捨てた緩和問題として解くため、任意の利得に対して有効な下界となる
+    """
+
+    def __init__(self, input_data: InputData, config: ConfigData):
+        self.data = input_data
+        self.config = config
+        self.list_log = []  # 劣勾配法の反復ごとのログ
+
+        # 荷物の外注費用が利得の上限となる（それ以上の利得では外注する方が安い）
+        self.outsourcing_cost = np.array(
+            [
+                config.outsourcing_cost_per_weight
+                * input_data.order_name2data[r].weight
+                for r in input_data.list_order_name
+            ]
+        )
+
+    def _make_pricing_solver(self) -> PricingSolver:
+        """
+        配送ルートの費用を残業費用とし、重量を切り捨てて解く価格付け問題のソルバー
+        """
+        route_table = get_route_table(
+            self.data, use_cache=self.config.use_route_table_cache
+        )
+        route_cost = self.config.overtime_cost_per_hour * np.maximum(
+            route_table.move_time - self.config.standartd_work_time, 0
+        )
+        route_cost = np.where(
+            route_table.move_time <= get_max_move_time(self.config), route_cost, np.inf
+        )
+        return PricingSolver(
+            self.data,
+            route_table,
+            get_truck_capacity(self.config),
+            route_cost,
+            is_relaxed=True,
+        )
+
+    def solve(self, upper_bound: float | None = None) -> float:
+        """
+        劣勾配法で得られた下界の最大値を返す
+        upper_boundは更新幅の計算に使う総費用の上界で、省略した場合は全ての荷物を外注する費用とする
+        """
+        if upper_bound is None:
+            upper_bound = float(self.outsourcing_cost.sum())
+        pricing_solver = self._make_pricing_solver()
+        order_name2index = {r: i for i, r in enumerate(self.data.list_order_name)}
+        executor = (
+            ThreadPoolExecutor(max_workers=self.config.threads)
+            if self.config.threads > 1
+            else None
+        )
+
+        # 利得は外注費用から始める（全ての荷物を自社配送したい状態）
+        profit = self.outsourcing_cost.copy()
+        lower_bound = -float("inf")
+        step_scale = INITIAL_STEP_SCALE
+        num_no_improvement = 0
+        start_time = time.perf_counter()
+        try:
+            for iteration in range(1, self.config.max_lagrangian_round + 1):
+                order_name2profit = dict(
+                    zip(self.data.list_order_name, profit, strict=True)
+                )
+
+                # 配送日ごとの価格付け問題は独立に解ける
+                list_date = self.data.list_delivery_date
+                if executor is not None:
+                    list_result = list(
+                        executor.map(
+                            pricing_solver.solve,
+                            list_date,
+                            [order_name2profit] * len(list_date),
+                        )
+                    )
+                else:
+                    list_result = [
+                        pricing_solver.solve(d, order_name2profit) for d in list_date
+                    ]
+
+                lagrangian_value = float(profit.sum()) - sum(
+                    value for value, _ in list_result
+                )
+                if lagrangian_value > lower_bound:
+                    lower_bound = lagrangian_value
+                    num_no_improvement = 0
+                else:
+                    num_no_improvement += 1
+                    if num_no_improvement >= STEP_SCALE_PATIENCE:
+                        step_scale /= 2
+                        num_no_improvement = 0
+
+                # 劣勾配: 1 - 各荷物を配送した日数
+                subgradient = np.ones(len(profit))
+                for _, pattern_data in list_result:
+                    for r in pattern_data.list_order_name:
+                        subgradient[order_name2index[r]] -= 1
+                # 利得の上下限に張り付いて動けない成分は除く
+                subgradient[(profit <= 0) & (subgradient < 0)] = 0
+                subgradient[(profit >= self.outsourcing_cost) & (subgradient > 0)] = 0
+                norm = float(subgradient @ subgradient)
+                step_size = (
+                    step_scale * max(upper_bound - lagrangian_value, 0) / norm
+                    if norm > 0
+                    else 0.0
+                )
+
+                elapsed_time = time.perf_counter() - start_time
+                self.list_log.append(
+                    LagrangianLogData(
+                        iteration=iteration,
+                        elapsed_time=elapsed_time,
+                        lagrangian_value=lagrangian_value,
+                        lower_bound=lower_bound,
+                        step_size=step_size,
+                    )
+                )
+                if (
+                    step_size == 0
+                    or step_scale < MIN_STEP_SCALE
+                    or upper_bound - lower_bound
+                    <= BOUND_TOLERANCE * max(abs(upper_bound), 1)
+                    or elapsed_time > self.config.lagrangian_time_limit
+                ):
+                    break
+
+                # 利得を劣勾配の方向に更新し、0以上外注費用以下に射影する
+                profit = np.clip(
+                    profit + step_size * subgradient, 0, self.outsourcing_cost
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return lower_bound
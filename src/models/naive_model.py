@@ -1,23 +1,84 @@
-from datetime import timedelta
-from typing import Literal
+import math
+import time
+import warnings
+from collections.abc import Iterable, Iterator
 
+import numpy as np
 from ortools.math_opt.python import mathopt
 
+from consts import SolutionStatus
 from models.base_model import BaseModel
-from optimize_dataclass.io_dataclass import DailyData, DeliveryStatusData, OutputData
+from models.solver_backend import get_solution_status, solve
+from route_processor.route_table import (
+    make_move_time_array,
+    satisfies_triangle_inequality,
+)
 
 
 class NaiveModel(BaseModel):
-    def __init__(self, optimize_input_data, optimize_config_data):
-        super().__init__(optimize_input_data, optimize_config_data)
+    """
+    地点間の移動と荷物の配送日を直接決める数理モデル
+    配送日・地点・荷物は0始まりの整数の添字で扱い、変数は添字のタプルをキーとする辞書で管理する
+    （配送日iはlist_delivery_date[i]、地点kはlist_location_name[k]（0番目がデポ）、荷物jはlist_order_name[j]）
+    """
+
+    def __init__(
+        self, optimize_input_data, optimize_config_data, prior_output_data=None
+    ):
+        super().__init__(optimize_input_data, optimize_config_data, prior_output_data)
         self.model = mathopt.Model(name="naive model")
         self.result = None  # 最適化結果格納用
+        self.variable_values = {}  # 最適化結果の変数の値
+
+        # 添字
+        self.num_date = len(self.data.list_delivery_date)
+        self.list_location_name = [self.data.depot_data.name] + list(
+            self.data.list_store_name
+        )  # 地点名のリスト（0番目がデポ）
+        self.location_name2index = {k: i for i, k in enumerate(self.list_location_name)}
+        self.num_order = len(self.data.list_order_name)
+        self.order_name2index = {r: j for j, r in enumerate(self.data.list_order_name)}
+        order_table = self.data.get_order_table()
+        self.order_location = order_table.get_destination(
+            self.list_location_name
+        )  # 荷物ごとの配送先の地点
+        self.order_weight = order_table.weight.copy()  # 荷物ごとの重量
+        date = np.array(self.data.list_delivery_date, dtype=np.int64)
+        start = order_table.time_window_start[None, :]
+        end = order_table.time_window_end[None, :]
+        # 配送日と荷物ごとの配送可否 (配送日数, 荷物数)
+        self.is_deliverable = (start <= date[:, None]) & (date[:, None] <= end)
+        # 配送日ごとに配送可能な荷物と、デポおよびそれらの配送先の店舗
+        # 値が非零になりうる変数だけを作るため、これ以外の荷物と地点の変数は作らない
+        self.date2list_order = [
+            np.nonzero(self.is_deliverable[i])[0].tolist() for i in range(self.num_date)
+        ]
+        self.date2list_location = [
+            [0] + np.unique(self.order_location[list_order]).tolist()
+            for list_order in self.date2list_order
+        ]
+        self.move_time = make_move_time_array(
+            self.data, self.list_location_name
+        )  # 地点間の移動時間 (地点数, 地点数)
 
         # 決定変数
-        self.x = {}  # 地点移動を表すbinary変数
-        self.u = {}  # 訪問順を表す補助変数
-        self.y = {}  # 荷物の自社配送を表すbinary変数
-        self.h = {}  # 日ごとの残業時間
+        self.x = {}  # 地点移動を表すbinary変数 (配送日, 地点, 地点)
+        self.u = {}  # 訪問順を表す補助変数 (配送日, 地点)
+        self.y = {}  # 荷物の自社配送を表すbinary変数 (配送日, 荷物)
+        self.h = {}  # 日ごとの残業時間 (配送日)
+        self.f = {}  # 地点間の積載量を表すフロー変数（単一品種フロー定式化のみ） (配送日, 地点, 店舗)
+
+        # 荷物の追加・取消と、配送日に訪問しうる店舗の追加で変更する制約条件
+        self.degree_constraint = {}  # 各地点の入ってくる数と出ていく数は等しい制約条件 (配送日, 地点)
+        self.in_degree_constraint = {}  # 地点に訪問する数は高々1回までの制約条件 (配送日, 地点)
+        self.overtime_constraint = {}  # 移動時間から残業時間を定める制約条件 (配送日)
+        self.mtz_constraint = {}  # 店舗間を移動するなら訪問順を増やす制約条件（MTZ定式化のみ） (配送日, 店舗, 店舗)
+        self.at_most_once_constraint = {}  # 荷物を高々1回配送する制約条件 (荷物)
+        self.visit_constraint = {}  # 荷物を配送するなら店舗に訪問する制約条件 (配送日, 荷物)
+        self.capacity_constraint = {}  # トラックの積載量制約 (配送日)
+        self.flow_balance_constraint = {}  # フローの保存則（単一品種フロー定式化のみ） (配送日, 店舗)
+        self.flow_capacity_constraint = {}  # 枝に流せる量の上限（単一品種フロー定式化のみ） (配送日, 地点, 店舗)
+        self.intermediate_constraint = {}  # 中間変数を定義する制約条件 (中間変数名)
 
         # 中間変数
         self.total_overtime = None  # 計画期間全体の残業時間
@@ -26,205 +87,499 @@ class NaiveModel(BaseModel):
         self.total_cost = None  # 計画期間全体のコスト（残業費用+外注費用）
         self.total_move_time = None  # 計画期間全体の移動時間
 
+    def _get_name(self, prefix: str, *keys) -> str:
+        """
+        変数と制約条件の名前（名前付けはデバッグ時のみ行う）
+        """
+        if not self.config.enable_debug_name:
+            return ""
+        return "_".join([prefix, *map(str, keys)])
+
+    def _add_linear_constraint(
+        self,
+        list_var: Iterable[mathopt.Variable],
+        list_coef: Iterable[float],
+        lb: float = -math.inf,
+        ub: float = math.inf,
+        name: str = "",
+    ) -> mathopt.LinearConstraint:
+        """
+        lb <= Σ coef * var <= ub の制約条件を、式を組み立てずに係数を直接設定して追加する
+        同じ変数を複数回含めると係数は上書きされる
+        """
+        constraint = self.model.add_linear_constraint(lb=lb, ub=ub, name=name)
+        for var, coef in zip(list_var, list_coef, strict=True):
+            constraint.set_coefficient(var, coef)
+        return constraint
+
     def _add_intermediate_variable(
-        self, constraints: mathopt.LinearExpression, name: str
+        self,
+        list_var: list[mathopt.Variable],
+        list_coef: Iterable[float],
+        constant: float,
+        name: str,
     ) -> mathopt.Variable:
         """
-        中間変数を定義するために変数を宣言して制約条件として追加するための関数
+        中間変数 ret = Σ coef * var + constant を宣言して制約条件として追加するための関数
         """
         ret = self.model.add_variable(name=name)
-        self.model.add_linear_constraint(ret == constraints)
+        self.intermediate_constraint[name] = self._add_linear_constraint(
+            [ret, *list_var],
+            [1.0, *(-c for c in list_coef)],
+            lb=constant,
+            ub=constant,
+        )
         return ret
 
+    def _iter_arc(self, i: int) -> Iterator[tuple[int, int]]:
+        """
+        配送日iに移動しうる地点の組（自己ループは含まない）
+        """
+        list_location = self.date2list_location[i]
+        for k1 in list_location:
+            for k2 in list_location:
+                if k1 != k2:
+                    yield k1, k2
+
     def add_variables(self):
         """
         決定変数の追加
         """
         # x
-        for d in self.data.list_delivery_date:
-            for k1 in self.data.list_store_and_depot_data:
-                for k2 in self.data.list_store_and_depot_data:
-                    self.x[d, k1.name, k2.name] = self.model.add_binary_variable(
-                        name=f"x_{d}_{k1.name}_{k2.name}"
-                    )
-
-        # u
-        for d in self.data.list_delivery_date:
-            for k in self.data.list_store_and_depot_data:
-                if k.name == self.data.depot_data.name:
-                    self.u[d, k.name] = self.model.add_integer_variable(
-                        lb=0, ub=0, name=f"u_{d}_{k.name}"
-                    )
-                else:
-                    self.u[d, k.name] = self.model.add_integer_variable(
-                        lb=1,
-                        ub=len(self.data.list_store_and_depot_data) - 1,
-                        name=f"u_{d}_{k.name}",
-                    )
-
-        # y
-        for d in self.data.list_delivery_date:
-            for r in self.data.list_order_name:
-                self.y[d, r] = self.model.add_binary_variable(name=f"y_{d}_{r}")
+        for i in range(self.num_date):
+            for k1, k2 in self._iter_arc(i):
+                self._add_x_variable(i, k1, k2)
+
+        if self.config.subtour_elimination_type == "mtz":
+            self._add_mtz_variables()
+        elif self.config.subtour_elimination_type == "flow":
+            self._add_flow_variables()
+
+        # y（指定配送期間外の配送日の変数は作らない）
+        for i, d in enumerate(self.data.list_delivery_date):
+            for j in self.date2list_order[i]:
+                self.y[i, j] = self.model.add_variable(
+                    lb=0,
+                    ub=1,
+                    is_integer=True,
+                    name=self._get_name("y", d, self.data.list_order_name[j]),
+                )
 
         # h
-        for d in self.data.list_delivery_date:
-            self.h[d] = self.model.add_variable(name=f"h_{d}", lb=0)
+        for i, d in enumerate(self.data.list_delivery_date):
+            self.h[i] = self.model.add_variable(lb=0, name=self._get_name("h", d))
 
         # total_overtime
+        list_h = list(self.h.values())
         self.total_overtime = self._add_intermediate_variable(
-            sum([self.h[d] for d in self.data.list_delivery_date]), "total_overtime"
+            list_h, [1.0] * len(list_h), 0.0, "total_overtime"
         )
         # total_overtime_cost
         self.total_overtime_cost = self._add_intermediate_variable(
-            self.config.overtime_cost_per_hour * self.total_overtime,
+            [self.total_overtime],
+            [self.config.overtime_cost_per_hour],
+            0.0,
             "total_overtime_cost",
         )
 
         # total_outsourcing_cost
+        outsourcing_cost = self.config.outsourcing_cost_per_weight * self.order_weight
         self.total_outsourcing_cost = self._add_intermediate_variable(
-            sum(
-                [
-                    self.config.outsourcing_cost_per_weight
-                    * self.data.order_name2data[r].weight
-                    * (1 - sum([self.y[d, r] for d in self.data.list_delivery_date]))
-                    for r in self.data.list_order_name
-                ]
-            ),
+            list(self.y.values()),
+            [-outsourcing_cost[j] for _, j in self.y],
+            float(outsourcing_cost.sum()),
             "outsourcing_cost",
         )
 
         # total_cost
         self.total_cost = self._add_intermediate_variable(
-            self.total_overtime_cost + self.total_outsourcing_cost, "total_cost"
+            [self.total_overtime_cost, self.total_outsourcing_cost],
+            [1.0, 1.0],
+            0.0,
+            "total_cost",
         )
 
         # total_move_time
         self.total_move_time = self._add_intermediate_variable(
-            sum(
-                [
-                    self.data.move_time_matrix[k1.name, k2.name]
-                    * self.x[d, k1.name, k2.name]
-                    for d in self.data.list_delivery_date
-                    for k1 in self.data.list_store_and_depot_data
-                    for k2 in self.data.list_store_and_depot_data
-                ]
-            ),
+            list(self.x.values()),
+            [self.move_time[k1, k2] for _, k1, k2 in self.x],
+            0.0,
             "total_move_time",
         )
 
         return self
 
+    def _add_x_variable(self, i: int, k1: int, k2: int):
+        """
+        配送日iの地点k1から地点k2への移動を表す変数の追加
+        """
+        self.x[i, k1, k2] = self.model.add_variable(
+            lb=0,
+            ub=1,
+            is_integer=True,
+            name=self._get_name(
+                "x",
+                self.data.list_delivery_date[i],
+                self.list_location_name[k1],
+                self.list_location_name[k2],
+            ),
+        )
+
+    def _add_mtz_variables(self):
+        """
+        MTZ定式化の訪問順を表す変数の追加
+        """
+        for i in range(self.num_date):
+            for k in self.date2list_location[i]:
+                self._add_u_variable(i, k)
+
+    def _add_u_variable(self, i: int, k: int):
+        """
+        配送日iの地点kの訪問順を表す変数の追加（上限はその配送日に訪問しうる店舗数）
+        """
+        self.u[i, k] = self.model.add_variable(
+            lb=0 if k == 0 else 1,
+            ub=0 if k == 0 else len(self.date2list_location[i]) - 1,
+            is_integer=True,
+            name=self._get_name(
+                "u", self.data.list_delivery_date[i], self.list_location_name[k]
+            ),
+        )
+
+    def _add_flow_variables(self):
+        """
+        単一品種フロー定式化のフロー変数の追加
+        デポへ戻る枝は空荷なので変数を作らない
+        """
+        for i in range(self.num_date):
+            for k1, s2 in self._iter_arc(i):
+                if s2 != 0:
+                    self._add_f_variable(i, k1, s2)
+
+    def _add_f_variable(self, i: int, k1: int, s2: int):
+        """
+        配送日iの地点k1から店舗s2への枝を流れる量を表す変数の追加
+        """
+        self.f[i, k1, s2] = self.model.add_variable(
+            lb=0,
+            name=self._get_name(
+                "f",
+                self.data.list_delivery_date[i],
+                self.list_location_name[k1],
+                self.list_location_name[s2],
+            ),
+        )
+
     def add_constraints(self):
         """
         制約条件の追加
         """
         # 必ず適用する制約条件
-        for d in self.data.list_delivery_date:
-            for k1 in self.data.list_store_and_depot_data:
-                # 各地点の入ってくる数と出ていく数は等しい
-                self.model.add_linear_constraint(
-                    sum(
-                        self.x[d, k1.name, k2.name]
-                        for k2 in self.data.list_store_and_depot_data
-                    )
-                    == sum(
-                        self.x[d, k2.name, k1.name]
-                        for k2 in self.data.list_store_and_depot_data
-                    )
-                )
-                # 各配送日について、地点に訪問する数は高々1回まで
-                self.model.add_linear_constraint(
-                    sum(
-                        [
-                            self.x[d, k2.name, k1.name]
-                            for k2 in self.data.list_store_and_depot_data
-                        ]
-                    )
-                    <= 1
-                )
+        for i in range(self.num_date):
+            for k in self.date2list_location[i]:
+                self._add_location_constraints(i, k)
 
-        for d in self.data.list_delivery_date:
-            # 各配送日について、お店間だけのサイクルを禁止
-            for s1 in self.data.list_store_name:
-                for s2 in self.data.list_store_name:
-                    self.model.add_linear_constraint(
-                        self.u[d, s1] + 1
-                        <= self.u[d, s2]
-                        + (len(self.data.list_store_name) - 1) * (1 - self.x[d, s1, s2])
-                    )
+        # 各配送日について、お店間だけのサイクルを禁止
+        if self.config.subtour_elimination_type == "mtz":
+            self._add_mtz_constraints()
+        elif self.config.subtour_elimination_type == "flow":
+            self._add_flow_constraints()
 
-        # 各荷物は、自社配送するなら期間内で高々1回まで
-        for r in self.data.list_order_name:
-            self.model.add_linear_constraint(
-                sum([self.y[d, r] for d in self.data.list_delivery_date]) <= 1
-            )
-
-        # 各配送日について、荷物を自社配送するなら、配送先のお店に訪問
-        for d in self.data.list_delivery_date:
-            for r in self.data.list_order_name:
-                order_data = self.data.order_name2data[r]
-                self.model.add_linear_constraint(
-                    self.y[d, r]
-                    <= sum(
-                        self.x[d, k.name, order_data.destination]
-                        for k in self.data.list_store_and_depot_data
-                    )
-                )
+        # 荷物ごとの制約条件
+        for j in range(self.num_order):
+            self._add_order_constraints(j)
 
         # 各配送日について、ドライバーの残業時間は所定労働時間の8時間を差し引いた労働時間
-        for d in self.data.list_delivery_date:
-            self.model.add_linear_constraint(
-                sum(
-                    [
-                        self.data.move_time_matrix[k1.name, k2.name]
-                        * self.x[d, k1.name, k2.name]
-                        for k1 in self.data.list_store_and_depot_data
-                        for k2 in self.data.list_store_and_depot_data
-                    ]
-                )
-                - self.config.standartd_work_time
-                <= self.h[d]
+        for i in range(self.num_date):
+            list_arc = list(self._iter_arc(i))
+            self.overtime_constraint[i] = self._add_linear_constraint(
+                [self.x[i, k1, k2] for k1, k2 in list_arc] + [self.h[i]],
+                [self.move_time[k1, k2] for k1, k2 in list_arc] + [-1.0],
+                ub=self.config.standartd_work_time,
             )
 
-        # 各荷物は指定配送期間外の配送を禁止
-        for r in self.data.list_order_name:
-            for d in self.data.list_delivery_date:
-                order_data = self.data.order_name2data[r]
-                if d < order_data.time_window_start:
-                    self.model.add_linear_constraint(self.y[d, r] == 0)
-                if order_data.time_window_end < d:
-                    self.model.add_linear_constraint(self.y[d, r] == 0)
-
         # ユーザーが指定する制約条件
         if self.config.truck_capacity_constraint.is_applied:
             self._add_truck_capacity_constraint()
         if self.config.max_overtime_constraint.is_applied:
             self._add_max_overtime_constraint()
 
+        # モデルを強化する妥当不等式
+        if self.config.day_symmetry_constraint.is_applied:
+            self._add_day_symmetry_constraint()
+        if (
+            self.config.knapsack_cover_constraint.is_applied
+            and self.config.truck_capacity_constraint.is_applied
+        ):
+            self._add_knapsack_cover_constraint()
+        if (
+            self.config.store_capacity_linking_constraint.is_applied
+            and self.config.truck_capacity_constraint.is_applied
+        ):
+            self._add_store_capacity_linking_constraint()
+        if self.config.tour_lower_bound_constraint.is_applied:
+            self._add_tour_lower_bound_constraint()
+
         return self
 
+    def _add_location_constraints(self, i: int, k: int):
+        """
+        配送日iの地点kへの移動と地点kからの移動に関する制約条件
+        """
+        list_k2 = [k2 for k2 in self.date2list_location[i] if k2 != k]
+        # 各地点の入ってくる数と出ていく数は等しい
+        self.degree_constraint[i, k] = self._add_linear_constraint(
+            [self.x[i, k, k2] for k2 in list_k2] + [self.x[i, k2, k] for k2 in list_k2],
+            [1.0] * len(list_k2) + [-1.0] * len(list_k2),
+            lb=0,
+            ub=0,
+        )
+        # 各配送日について、地点に訪問する数は高々1回まで
+        self.in_degree_constraint[i, k] = self._add_linear_constraint(
+            [self.x[i, k2, k] for k2 in list_k2], [1.0] * len(list_k2), ub=1
+        )
+
+    def _add_order_constraints(self, j: int):
+        """
+        荷物jの配送に関する制約条件
+        """
+        list_i = np.nonzero(self.is_deliverable[:, j])[0].tolist()
+        # 各荷物は、自社配送するなら期間内で高々1回まで
+        if len(list_i) > 0:
+            self.at_most_once_constraint[j] = self._add_linear_constraint(
+                [self.y[i, j] for i in list_i], [1.0] * len(list_i), ub=1
+            )
+
+        # 各配送日について、荷物を自社配送するなら、配送先のお店に訪問
+        s = int(self.order_location[j])
+        for i in list_i:
+            list_k = [k for k in self.date2list_location[i] if k != s]
+            self.visit_constraint[i, j] = self._add_linear_constraint(
+                [self.y[i, j]] + [self.x[i, k, s] for k in list_k],
+                [1.0] + [-1.0] * len(list_k),
+                ub=0,
+            )
+
+    def _add_mtz_constraints(self):
+        """
+        MTZ定式化: 店舗間を移動するなら訪問順を1以上増やす
+        u[s1] - u[s2] + n * x[s1, s2] <= n - 1 （nはその配送日に訪問しうる店舗数）
+        """
+        for i in range(self.num_date):
+            for s1, s2 in self._iter_arc(i):
+                if s1 != 0 and s2 != 0:
+                    self._add_mtz_constraint(i, s1, s2)
+
+    def _add_mtz_constraint(self, i: int, s1: int, s2: int):
+        """
+        配送日iの店舗s1から店舗s2への移動に関するMTZ定式化の制約条件
+        """
+        n = len(self.date2list_location[i]) - 1
+        self.mtz_constraint[i, s1, s2] = self._add_linear_constraint(
+            [self.u[i, s1], self.u[i, s2], self.x[i, s1, s2]],
+            [1.0, -1.0, float(n)],
+            ub=n - 1,
+        )
+
+    def _add_flow_constraints(self):
+        """
+        単一品種フロー定式化: デポから積み出したフローを訪問した店舗で降ろす
+        各店舗で降ろす量は配送する荷物の重量に訪問1回あたり1を加えたもので、
+        荷物を配送しない店舗だけのサイクルも禁止する
+        """
+        for i in range(self.num_date):
+            max_flow = self._get_max_flow(i)
+            for k1, s2 in self._iter_arc(i):
+                if s2 != 0:
+                    self._add_flow_capacity_constraint(i, k1, s2, max_flow)
+            for s in self.date2list_location[i][1:]:
+                self._add_flow_balance_constraint(i, s)
+
+    def _add_flow_capacity_constraint(self, i: int, k1: int, s2: int, max_flow: float):
+        """
+        配送日iの地点k1から店舗s2への枝は、移動する場合だけmax_flowまで流せる
+        """
+        self.flow_capacity_constraint[i, k1, s2] = self._add_linear_constraint(
+            [self.f[i, k1, s2], self.x[i, k1, s2]], [1.0, -max_flow], ub=0
+        )
+
+    def _add_flow_balance_constraint(self, i: int, s: int):
+        """
+        配送日iの店舗sについて、流入量 - 流出量 - 配送する荷物の重量 - 訪問回数 = 0
+        """
+        list_location = self.date2list_location[i]
+        list_order = self.date2list_order[i]
+        list_j = np.array(list_order, dtype=np.int64)[
+            self.order_location[list_order] == s
+        ].tolist()
+        list_k = [k for k in list_location if k != s]
+        list_s2 = [s2 for s2 in list_location[1:] if s2 != s]
+        self.flow_balance_constraint[i, s] = self._add_linear_constraint(
+            [self.f[i, k, s] for k in list_k]
+            + [self.f[i, s, s2] for s2 in list_s2]
+            + [self.y[i, j] for j in list_j]
+            + [self.x[i, k, s] for k in list_k],
+            [1.0] * len(list_k)
+            + [-1.0] * len(list_s2)
+            + [-self.order_weight[j] for j in list_j]
+            + [-1.0] * len(list_k),
+            lb=0,
+            ub=0,
+        )
+
+    def _get_max_flow(self, i: int) -> float:
+        """
+        配送日iに枝に流せる量の上限（積載量と訪問回数の合計）
+        """
+        if self.config.truck_capacity_constraint.is_applied:
+            max_weight = self.config.truck_capacity
+        else:
+            max_weight = float(self.order_weight[self.date2list_order[i]].sum())
+        return max_weight + len(self.date2list_location[i]) - 1
+
     def _add_truck_capacity_constraint(self):
         """
         各配送日について、荷物の重量は所定の値以下に抑える制約条件
         """
-        for d in self.data.list_delivery_date:
-            self.model.add_linear_constraint(
-                sum(
-                    [
-                        self.y[d, r] * self.data.order_name2data[r].weight
-                        for r in self.data.list_order_name
-                    ]
-                )
-                <= self.config.truck_capacity
+        for i in range(self.num_date):
+            list_j = self.date2list_order[i]
+            self.capacity_constraint[i] = self._add_linear_constraint(
+                [self.y[i, j] for j in list_j],
+                [self.order_weight[j] for j in list_j],
+                ub=self.config.truck_capacity,
             )
 
     def _add_max_overtime_constraint(self):
         """
         残業時間を所定の値以下に抑える制約条件
         """
-        for d in self.data.list_delivery_date:
-            self.model.add_linear_constraint(self.h[d] <= self.config.max_overtime)
+        for i in range(self.num_date):
+            self._add_linear_constraint([self.h[i]], [1.0], ub=self.config.max_overtime)
+
+    def _add_day_symmetry_constraint(self):
+        """
+        配送可能な荷物が同じ配送日どうしは、配送計画を入れ替えても費用が変わらないため、
+        早い配送日ほど配送重量が大きい解に限る（何も配送しない配送日は後ろに寄る）
+        """
+        list_order2list_i = {}
+        for i in range(self.num_date):
+            list_order2list_i.setdefault(tuple(self.date2list_order[i]), []).append(i)
+        for list_order, list_i in list_order2list_i.items():
+            if len(list_order) == 0:
+                continue
+            for i1, i2 in zip(list_i[:-1], list_i[1:], strict=True):
+                self._add_linear_constraint(
+                    [self.y[i1, j] for j in list_order]
+                    + [self.y[i2, j] for j in list_order],
+                    [self.order_weight[j] for j in list_order]
+                    + [-self.order_weight[j] for j in list_order],
+                    lb=0,
+                )
+
+    def _add_knapsack_cover_constraint(self):
+        """
+        各配送日について、積載量を超える荷物の組（被覆）を拡張した被覆不等式
+        重い順に並べた荷物の連続するt個の重量の合計が積載量を超えるとき、
+        それより重い荷物を含めた中から積めるのはt-1個まで
+        """
+        for i in range(self.num_date):
+            list_j = sorted(
+                self.date2list_order[i], key=lambda j: -self.order_weight[j]
+            )
+            list_weight = self.order_weight[list_j]
+            n = len(list_j)
+            for t in range(1, n + 1):
+                # 連続するt個の重量の合計が積載量を超える最も後ろの位置
+                window_weight = np.convolve(list_weight, np.ones(t), mode="valid")
+                list_a = np.nonzero(window_weight > self.config.truck_capacity)[0]
+                if len(list_a) == 0:
+                    continue
+                end = int(list_a[-1]) + t
+                self._add_linear_constraint(
+                    [self.y[i, j] for j in list_j[:end]], [1.0] * end, ub=t - 1
+                )
+                # 全ての荷物を含む不等式が得られたら、それ以降のtでは弱くなる
+                if end == n:
+                    break
+
+    def _add_store_capacity_linking_constraint(self):
+        """
+        各配送日について、配送重量の合計はトラックがデポを出発する場合だけ積載量まで、
+        店舗ごとの配送重量の合計はその店舗に訪問する場合だけ積載量までとする
+        """
+        for i in range(self.num_date):
+            list_location = self.date2list_location[i]
+            list_j = self.date2list_order[i]
+            list_s = [k for k in list_location if k != 0]
+            self._add_linear_constraint(
+                [self.y[i, j] for j in list_j] + [self.x[i, 0, s] for s in list_s],
+                [self.order_weight[j] for j in list_j]
+                + [-self.config.truck_capacity] * len(list_s),
+                ub=0,
+            )
+            for s in list_s:
+                list_store_j = [j for j in list_j if self.order_location[j] == s]
+                # 店舗の荷物が全て積める場合は、荷物ごとの訪問の制約条件から導かれる
+                if self.order_weight[list_store_j].sum() <= self.config.truck_capacity:
+                    continue
+                list_k = [k for k in list_location if k != s]
+                self._add_linear_constraint(
+                    [self.y[i, j] for j in list_store_j]
+                    + [self.x[i, k, s] for k in list_k],
+                    [self.order_weight[j] for j in list_store_j]
+                    + [-self.config.truck_capacity] * len(list_k),
+                    ub=0,
+                )
+
+    def _get_tour_move_time(self, list_store: list[int]) -> float:
+        """
+        デポから店舗を全て訪問してデポに戻る最短の移動時間（1店舗か2店舗のみ）
+        """
+        if len(list_store) == 1:
+            (s,) = list_store
+            return float(self.move_time[0, s] + self.move_time[s, 0])
+        s1, s2 = list_store
+        return float(
+            min(
+                self.move_time[0, s1] + self.move_time[s1, s2] + self.move_time[s2, 0],
+                self.move_time[0, s2] + self.move_time[s2, s1] + self.move_time[s1, 0],
+            )
+        )
+
+    def _add_tour_lower_bound_constraint(self):
+        """
+        各配送日について、店舗の組合せSを全て訪問するなら、移動時間はSの最短ルートの移動時間以上
+        Σ move_time * x >= L(S) * (Sの店舗への訪問数 - |S| + 1) を1店舗と2店舗の組合せについて加える
+        移動時間が三角不等式を満たせば、Sを含むルートはSの最短ルート以上の移動時間となる
+        満たさない場合は妥当でないため、警告を出して加えない
+        """
+        if not satisfies_triangle_inequality(self.move_time):
+            warnings.warn(
+                "移動時間が三角不等式を満たさないため、巡回路の下界の不等式は加えません",
+                stacklevel=2,
+            )
+            return
+        for i in range(self.num_date):
+            list_location = self.date2list_location[i]
+            list_arc = list(self._iter_arc(i))
+            list_s = [k for k in list_location if k != 0]
+            list_store_set = [[s] for s in list_s] + [
+                [s1, s2] for n, s1 in enumerate(list_s) for s2 in list_s[n + 1 :]
+            ]
+            for list_store in list_store_set:
+                tour_move_time = self._get_tour_move_time(list_store)
+                var2coef = {
+                    self.x[i, k1, k2]: self.move_time[k1, k2] for k1, k2 in list_arc
+                }
+                for s in list_store:
+                    for k in list_location:
+                        if k != s:
+                            var2coef[self.x[i, k, s]] -= tour_move_time
+                self._add_linear_constraint(
+                    list(var2coef),
+                    list(var2coef.values()),
+                    lb=-tour_move_time * (len(list_store) - 1),
+                )
 
     def add_objectives(self):
         obj_value = 0
@@ -236,116 +591,335 @@ class NaiveModel(BaseModel):
         self.model.minimize(obj_value)
         return self
 
-    def optimize(
-        self,
-    ) -> Literal["Optimal", "Feasible", "NotSolved", "Unbounded", "Undefined"]:
+    def _make_solution_hint(self) -> mathopt.SolutionHint | None:
         """
-        最適化の実行
+        前回の最適化結果を、全ての変数の値を定めた初期解（ヒント）に変換する
+        今回のモデルで配送できない荷物と訪問できない店舗は除く
         """
-
-        params = mathopt.SolveParameters(
-            time_limit=timedelta(seconds=self.config.time_limit),
-            enable_output=True,
-            threads=self.config.threads,
+        if self.prior_output_data is None:
+            return None
+        date2index = {d: i for i, d in enumerate(self.data.list_delivery_date)}
+        date2list_order = [[] for _ in range(self.num_date)]
+        for (
+            r,
+            delivery_status_data,
+        ) in self.prior_output_data.order_name2delivery_status_data.items():
+            i = date2index.get(delivery_status_data.delivered_date)
+            j = self.order_name2index.get(r)
+            if i is not None and j is not None and (i, j) in self.y:
+                date2list_order[i].append(j)
+
+        # 前回のルートの訪問順
+        date2route = []
+        for d in self.data.list_delivery_date:
+            route = []
+            daily_data = self.prior_output_data.date2daily_data.get(d)
+            if daily_data is not None:
+                for store_data in daily_data.list_delivery_route[1:-1]:
+                    k = self.location_name2index.get(store_data.name)
+                    if k is not None and k not in route:
+                        route.append(k)
+            date2route.append(route)
+        return mathopt.SolutionHint(
+            variable_values=self._make_solution_values(date2list_order, date2route)
         )
-        self.result = mathopt.solve(self.model, mathopt.SolverType.GSCIP, params=params)
-
-        if self.result.termination.reason == mathopt.TerminationReason.OPTIMAL:
-            return "Optimal"
-        elif self.result.termination.reason == mathopt.TerminationReason.FEASIBLE:
-            return "Feasible"
-        elif self.result.termination.reason == mathopt.TerminationReason.NOT_SOLVED:
-            return "NotSolved"
-        elif self.result.termination.reason == mathopt.TerminationReason.UNBOUNDED:
-            return "Unbounded"
-        else:
-            return "INFEASIBLE"
 
-    def get_result(self):
+    def _get_route_move_time(self, route: list[int]) -> float:
         """
-        OutputDataへの整形
+        デポを出発してrouteの順に店舗を訪問し、デポに戻るまでの移動時間
         """
+        path = [0, *route, 0]
+        return float(self.move_time[path[:-1], path[1:]].sum())
 
-        date2daily_data = {}
+    def _make_solution_values(
+        self, date2list_order: list[list[int]], date2route: list[list[int]]
+    ) -> dict[mathopt.Variable, float]:
+        """
+        配送日ごとの配送する荷物と店舗の訪問順から、全ての変数の値を定めた解を作る
+        配送する荷物の店舗をdate2routeの順にたどり、訪問順にない店舗は最後に訪問する
+        積載量を超える荷物は外注し、最大残業時間を超える配送日は配送しないことにして実行可能にする
+        """
+        values = dict.fromkeys(
+            [*self.x.values(), *self.y.values(), *self.f.values()], 0.0
+        )
+        list_move_time = []
+        for i in range(self.num_date):
+            list_order = []
+            weight = 0.0
+            for j in date2list_order[i]:
+                if weight + self.order_weight[j] <= self._get_truck_capacity():
+                    list_order.append(j)
+                    weight += self.order_weight[j]
+            set_store = {int(self.order_location[j]) for j in list_order}
+            route = [k for k in date2route[i] if k in set_store]
+            route += sorted(set_store - set(route))
+            path = [0, *route, 0] if len(route) > 0 else [0]
+            move_time = self._get_route_move_time(route) if len(route) > 0 else 0.0
+            if move_time > self._get_max_move_time():
+                list_order, route, path, move_time = [], [], [0], 0.0
+            list_move_time.append(move_time)
+
+            for k1, k2 in zip(path[:-1], path[1:], strict=True):
+                values[self.x[i, k1, k2]] = 1.0
+            for j in list_order:
+                values[self.y[i, j]] = 1.0
+            values[self.h[i]] = max(move_time - self.config.standartd_work_time, 0)
+            # 訪問順（訪問しない店舗は最後に訪問する店舗の次とする）
+            if len(self.u) > 0:
+                for k in self.date2list_location[i][1:]:
+                    values[self.u[i, k]] = float(len(route) + 1)
+                for n, k in enumerate(route):
+                    values[self.u[i, k]] = float(n + 1)
+                values[self.u[i, 0]] = 0.0
+            # 枝を流れる量は、その先で降ろす荷物の重量と訪問回数の合計
+            store2unload = dict.fromkeys(route, 1.0)
+            for j in list_order:
+                store2unload[int(self.order_location[j])] += self.order_weight[j]
+            for n, (k1, k2) in enumerate(zip(path[:-1], path[1:], strict=True)):
+                if (i, k1, k2) in self.f:
+                    values[self.f[i, k1, k2]] = sum(
+                        [store2unload[s] for s in route[n:]]
+                    )
 
-        for d in self.data.list_delivery_date:
-            list_adjacent = [
-                (k1.name, k2.name)
-                for k1 in self.data.list_store_and_depot_data
-                for k2 in self.data.list_store_and_depot_data
-                if self.result.variable_values(self.x[d, k1.name, k2.name]) > 0.5
+        total_overtime = sum([values[h] for h in self.h.values()])
+        total_overtime_cost = self.config.overtime_cost_per_hour * total_overtime
+        total_outsourcing_cost = self.config.outsourcing_cost_per_weight * (
+            float(self.order_weight[list(self.order_name2index.values())].sum())
+            - sum([self.order_weight[j] for (_, j), y in self.y.items() if values[y]])
+        )
+        values[self.total_overtime] = total_overtime
+        values[self.total_overtime_cost] = total_overtime_cost
+        values[self.total_outsourcing_cost] = total_outsourcing_cost
+        values[self.total_cost] = total_overtime_cost + total_outsourcing_cost
+        values[self.total_move_time] = sum(list_move_time)
+        return values
+
+    def _repair_subtours(self) -> dict[mathopt.Variable, float]:
+        """
+        サイクルが残る解（self.variable_values）を、部分巡回路のない実行可能解に修復する
+        配送日ごとに、デポからの巡回路に含まれない店舗を移動時間の増加が最小の位置に挿入し、
+        最大移動時間を超える場合は、除くと移動時間が最も減る店舗の荷物を外注する
+        """
+        date2list_order = []
+        date2route = []
+        for i in range(self.num_date):
+            list_order = [
+                j
+                for j in self.date2list_order[i]
+                if self.variable_values[self.y[i, j]] > 0.5
             ]
-            # 移動する地点の順番のリストを作成
-            tar = self.data.depot_data.name
-            route = [tar]
-            tmp_list = list_adjacent.copy()
-            while len(tmp_list) >= 1:
-                for k1, k2 in tmp_list:
-                    if k1 == tar:
-                        tar = k2
-                        route.append(k2)
-                        tmp_list.remove((k1, k2))
-
-            list_derivery_route = (
-                [self.data.depot_data]
-                + [self.data.store_name2data[k] for k in route[1:-1]]
-                + [self.data.depot_data]
-            )
-
-            daily_move_time = sum(
-                [self.data.move_time_matrix[k1, k2] for k1, k2 in list_adjacent]
-            )
-            daily_total_weight = sum(
-                [
-                    self.result.variable_values(self.y[d, r])
-                    * self.data.order_name2data[r].weight
-                    for r in self.data.list_order_name
+            set_store = {int(self.order_location[j]) for j in list_order}
+            # デポからの巡回路のうち、配送する荷物がある店舗
+            next_location = self._get_next_location(i)
+            route = []
+            tar = next_location.get(0)
+            while tar is not None and tar != 0 and tar not in route:
+                route.append(tar)
+                tar = next_location.get(tar)
+            route = [k for k in route if k in set_store]
+            # サイクル上の店舗を挿入
+            for s in sorted(set_store - set(route)):
+                path = np.array([0, *route, 0])
+                increase = (
+                    self.move_time[path[:-1], s]
+                    + self.move_time[s, path[1:]]
+                    - self.move_time[path[:-1], path[1:]]
+                )
+                route.insert(int(np.argmin(increase)), s)
+            # 最大移動時間に収まるまで店舗を除く
+            while (
+                len(route) > 0
+                and self._get_route_move_time(route) > self._get_max_move_time()
+            ):
+                list_saving = [
+                    self._get_route_move_time(route)
+                    - self._get_route_move_time(route[:n] + route[n + 1 :])
+                    for n in range(len(route))
                 ]
-            )
-            daily_overtime = self.result.variable_values(self.h[d])
-            daily_overtime_cost = self.config.overtime_cost_per_hour * daily_overtime
-
-            date2daily_data[d] = DailyData(
-                list_delivery_route=list_derivery_route,
-                daily_total_weight=daily_total_weight,
-                daily_overtime=daily_overtime,
-                daily_overtime_cost=daily_overtime_cost,
-                daily_move_time=daily_move_time,
-            )
+                s = route.pop(int(np.argmax(list_saving)))
+                list_order = [j for j in list_order if self.order_location[j] != s]
+            date2list_order.append(list_order)
+            date2route.append(route)
+        return self._make_solution_values(date2list_order, date2route)
 
-        order_name2delivery_status_data = {}
-        for r in self.data.list_order_name:
-            delivered_date = [
-                d
-                for d in self.data.list_delivery_date
-                if self.result.variable_values(self.y[d, r]) > 0.5
+    def _get_next_location(self, i: int) -> dict[int, int]:
+        """
+        配送日iの解で、各地点から次に移動する地点
+        """
+        return {
+            k1: k2
+            for k1, k2 in self._iter_arc(i)
+            if self.variable_values[self.x[i, k1, k2]] > 0.5
+        }
+
+    def _find_subtours(self, i: int) -> list[list[int]]:
+        """
+        配送日iの解から、デポを通らないサイクルを地点のリストとして抽出する
+        """
+        next_location = self._get_next_location(i)
+        list_subtour = []
+        visited = {0}
+        tar = next_location.get(0)
+        while tar is not None and tar not in visited:
+            visited.add(tar)
+            tar = next_location.get(tar)
+        for k in next_location:
+            if k in visited:
+                continue
+            subtour = []
+            tar = k
+            while tar not in visited:
+                visited.add(tar)
+                subtour.append(tar)
+                tar = next_location[tar]
+            list_subtour.append(subtour)
+        return list_subtour
+
+    def _solve_with_lazy_subtour_constraints(
+        self, model_params: mathopt.ModelSolveParameters | None
+    ) -> SolutionStatus:
+        """
+        部分巡回路除去の制約条件を入れずに解き、解に現れたサイクルを禁止する制約条件だけを
+        同じモデルに追加して解き直すことを、サイクルがなくなるか計算時間の上限に達するまで繰り返す
+        1回の求解はlazy_round_time_limit秒で打ち切り、サイクルが残る解は修復して実行可能解にする
+        これまでで最良の実行可能解を次の求解の初期解とし、計算時間の上限に達したらそれを返す
+        GSCIPはIncrementalSolverでの制約条件の追加に失敗することがあるため、ソルバーによらず毎回solveを呼ぶ
+        """
+        deadline = time.perf_counter() + self.config.time_limit
+        round_time_limit = self.config.lazy_round_time_limit
+        best_values = None  # これまでで最良の実行可能解
+        best_objective_value = math.inf  # 最良の実行可能解の目的関数値
+        objective = self.model.objective.as_linear_expression()
+        is_optimal = False
+        while True:
+            remaining_time = max(deadline - time.perf_counter(), 0)
+            self.result = solve(
+                self.model,
+                self.config,
+                model_params=model_params,
+                msg_cb=self.message_callback,
+                time_limit=min(round_time_limit, remaining_time),
+            )
+            status = get_solution_status(self.result)
+            if status not in ["Optimal", "Feasible"]:
+                # 1回の計算時間内に解が得られなかった場合は、計算時間を延ばして解き直す
+                if status == "NotSolved" and time.perf_counter() < deadline:
+                    round_time_limit *= 2
+                    continue
+                break
+            self.variable_values = self.result.variable_values()
+
+            list_subtour = [
+                subtour
+                for i in range(self.num_date)
+                for subtour in self._find_subtours(i)
             ]
-            if len(delivered_date) > 0:
-                order_name2delivery_status_data[r] = DeliveryStatusData(
-                    delivered_date=delivered_date[0],
-                    outsourced_flag=False,
-                    outsourcing_cost=None,
+            values = (
+                self._repair_subtours()
+                if len(list_subtour) > 0
+                else self.variable_values
+            )
+            # 下界と比べられるように、総費用ではなく目的関数値で比べて記録する
+            objective_value = mathopt.evaluate_expression(objective, values)
+            if objective_value < best_objective_value:
+                best_values = values
+                best_objective_value = objective_value
+            # サイクルを禁止する制約条件は妥当なため、緩和問題の下界は元の問題の下界になる
+            dual_bound = self.result.termination.objective_bounds.dual_bound
+            if self.progress_recorder is not None:
+                self.progress_recorder.record(
+                    primal_bound=best_objective_value,
+                    dual_bound=dual_bound if math.isfinite(dual_bound) else None,
                 )
+            # サイクルのない解が最適なら、元の問題の最適解
+            if len(list_subtour) == 0 and status == "Optimal":
+                best_values = values
+                is_optimal = True
+                break
+            if time.perf_counter() >= deadline:
+                break
+
+            if len(list_subtour) == 0:
+                # 計算時間で打ち切られただけなので、残りの計算時間で続けて解く
+                round_time_limit = math.inf
+            # 見つかったサイクルは全ての配送日で、その日に訪問しうる店舗に限って禁止する
+            for subtour in list_subtour:
+                for i in range(self.num_date):
+                    set_location = set(self.date2list_location[i])
+                    list_store = [s for s in subtour if s in set_location]
+                    if len(list_store) < 2:
+                        continue
+                    list_arc = [
+                        (s1, s2) for s1 in list_store for s2 in list_store if s1 != s2
+                    ]
+                    self._add_linear_constraint(
+                        [self.x[i, s1, s2] for s1, s2 in list_arc],
+                        [1.0] * len(list_arc),
+                        ub=len(list_store) - 1,
+                    )
+            model_params = mathopt.ModelSolveParameters(
+                solution_hints=[mathopt.SolutionHint(variable_values=best_values)]
+            )
 
-            else:
-                outsourcing_cost = (
-                    self.config.outsourcing_cost_per_weight
-                    * self.data.order_name2data[r].weight
-                )
-                order_name2delivery_status_data[r] = DeliveryStatusData(
-                    delivered_date=None,
-                    outsourced_flag=True,
-                    outsourcing_cost=outsourcing_cost,
-                )
+        if best_values is None:
+            return status
+        self.variable_values = best_values
+        return "Optimal" if is_optimal else "Feasible"
 
-        return OutputData(
-            date2daily_data=date2daily_data,
-            order_name2delivery_status_data=order_name2delivery_status_data,
-            total_cost=self.result.variable_values(self.total_cost),
-            total_overtime=self.result.variable_values(self.total_overtime),
-            total_overtime_cost=self.result.variable_values(self.total_overtime_cost),
-            total_outsourcing_cost=self.result.variable_values(
-                self.total_outsourcing_cost
-            ),
-            total_move_time=self.result.variable_values(self.total_move_time),
+    def optimize(self) -> SolutionStatus:
+        """
+        最適化の実行
+        """
+        # 前回の最適化結果があれば初期解として渡す
+        solution_hint = self._make_solution_hint()
+        model_params = (
+            mathopt.ModelSolveParameters(solution_hints=[solution_hint])
+            if solution_hint is not None
+            else None
+        )
+        if self.config.subtour_elimination_type == "lazy":
+            return self._solve_with_lazy_subtour_constraints(model_params)
+
+        self.result = solve(
+            self.model,
+            self.config,
+            model_params=model_params,
+            msg_cb=self.message_callback,
+            progress_recorder=self.progress_recorder,
         )
+        status = get_solution_status(self.result)
+        if status in ["Optimal", "Feasible"]:
+            self.variable_values = self.result.variable_values()
+        return status
+
+    def get_result(self):
+        """
+        OutputDataへの整形
+        """
+        # 荷物の取消で欠番になった添字があるため、荷物名は添字から引く
+        index2order_name = {j: r for r, j in self.order_name2index.items()}
+        date2daily_data = {}
+        order_name2delivered_date = {}
+        for i, d in enumerate(self.data.list_delivery_date):
+            next_location = self._get_next_location(i)
+            # デポから順に移動する店舗をたどる
+            route = []
+            tar = next_location.get(0)
+            while tar is not None and tar != 0:
+                route.append(tar)
+                tar = next_location.get(tar)
+
+            list_order = [
+                j
+                for j in self.date2list_order[i]
+                if self.variable_values[self.y[i, j]] > 0.5
+            ]
+            for j in list_order:
+                order_name2delivered_date.setdefault(index2order_name[j], d)
+            date2daily_data[d] = self._make_daily_data(
+                [self.list_location_name[k] for k in route],
+                sum([self.order_weight[j] for j in list_order]),
+                sum([self.move_time[k1, k2] for k1, k2 in next_location.items()]),
+            )
+
+        return self._make_output_data(date2daily_data, order_name2delivered_date)
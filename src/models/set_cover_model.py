@@ -0,0 +1,311 @@
+import itertools
+from collections.abc import Iterable
+
+from ortools.math_opt.python import mathopt
+
+from consts import SolutionStatus
+from models.base_model import BaseModel
+from models.solver_backend import get_solution_status, solve
+from optimize_dataclass.pattern_dataclass import PatternData
+from route_processor.pattern_enumerator import PatternEnumerator
+from route_processor.route_table import RouteTable
+from route_processor.route_table_cache import get_route_table
+
+
+class SetCoverModel(BaseModel):
+    """
+    配送パターンを利用した数理モデル
+    店舗の組合せごとの最短ルートと、配送日ごとの配送パターンを事前に列挙し、
+    各配送日に1つの配送パターンを選択する
+    各荷物は、選択した配送パターンのいずれかに含まれていれば自社配送とする
+    """
+
+    def __init__(
+        self, optimize_input_data, optimize_config_data, prior_output_data=None
+    ):
+        super().__init__(optimize_input_data, optimize_config_data, prior_output_data)
+        self.model = mathopt.Model(name="set cover model")
+        self.result = None  # 最適化結果格納用
+
+        # 配送パターン
+        self.date2list_pattern_data = {}  # 配送日から配送パターンのリストへの変換
+        self.order_name2list_x = {}  # 配送注文名から、その荷物を含む配送パターンの変数への変換
+        self.date2prior_pattern_data = {}  # 配送日から前回の最適化結果の配送パターンへの変換
+        self.date2prior_pattern_index = {}  # 配送日から前回の最適化結果の配送パターンの番号への変換
+
+        # 決定変数
+        self.x = {}  # 配送日ごとの配送パターンの選択を表すbinary変数
+        self.y = {}  # 荷物の外注を表す変数
+
+        # 中間変数
+        self.total_overtime = None  # 計画期間全体の残業時間
+        self.total_overtime_cost = None  # 計画期間全体の残業時間コスト
+        self.total_outsourcing_cost = None  # 計画期間全体の外注費用
+        self.total_cost = None  # 計画期間全体のコスト（残業費用+外注費用）
+        self.total_move_time = None  # 計画期間全体の移動時間
+
+    def _add_intermediate_variable(
+        self, constraints: mathopt.LinearExpression, name: str
+    ) -> mathopt.Variable:
+        """
+        中間変数を定義するために変数を宣言して制約条件として追加するための関数
+        """
+        ret = self.model.add_variable(name=name)
+        self.model.add_linear_constraint(ret == constraints)
+        return ret
+
+    def _generate_patterns(self) -> dict[int, Iterable[PatternData]]:
+        """
+        配送日ごとの配送パターンを生成する
+        """
+        route_table = get_route_table(
+            self.data, use_cache=self.config.use_route_table_cache
+        )
+        pattern_enumerator = PatternEnumerator(
+            self.data,
+            route_table,
+            self._get_truck_capacity(),
+            self._get_max_move_time(),
+        )
+        date2iter_pattern_data = {
+            d: pattern_enumerator.iter_patterns(d) for d in self.data.list_delivery_date
+        }
+        # 前回の最適化結果の配送パターンは支配されていても候補に加える
+        self.date2prior_pattern_data = self._make_prior_patterns(route_table)
+        for d, pattern_data in self.date2prior_pattern_data.items():
+            date2iter_pattern_data[d] = itertools.chain(
+                [pattern_data], date2iter_pattern_data[d]
+            )
+        return date2iter_pattern_data
+
+    def _make_prior_patterns(self, route_table: RouteTable) -> dict[int, PatternData]:
+        """
+        前回の最適化結果から配送日ごとの配送パターンを作る
+        今回配送できない荷物は除き、積載量を超える荷物は外注し、
+        最大残業時間を超える配送日は何も配送しない配送パターンとする
+        """
+        if self.prior_output_data is None:
+            return {}
+        date2list_order_name = {d: [] for d in self.data.list_delivery_date}
+        for (
+            r,
+            delivery_status_data,
+        ) in self.prior_output_data.order_name2delivery_status_data.items():
+            d = delivery_status_data.delivered_date
+            order_data = self.data.order_name2data.get(r)
+            if (
+                d in date2list_order_name
+                and order_data is not None
+                and order_data.time_window_start <= d <= order_data.time_window_end
+            ):
+                date2list_order_name[d].append(r)
+
+        date2prior_pattern_data = {}
+        for d, list_order_name in date2list_order_name.items():
+            list_tar_order_name = []
+            weight = 0.0
+            for r in list_order_name:
+                order_data = self.data.order_name2data[r]
+                if weight + order_data.weight <= self._get_truck_capacity():
+                    list_tar_order_name.append(r)
+                    weight += order_data.weight
+            mask = route_table.get_mask(
+                [self.data.order_name2data[r].destination for r in list_tar_order_name]
+            )
+            if route_table.move_time[mask] > self._get_max_move_time():
+                list_tar_order_name, mask = [], 0
+            date2prior_pattern_data[d] = PatternData(
+                list_order_name=list_tar_order_name,
+                route_data=route_table.get_route_data(mask),
+            )
+        return date2prior_pattern_data
+
+    def add_variables(self):
+        """
+        配送パターンの生成と決定変数の追加
+        """
+        date2iter_pattern_data = self._generate_patterns()
+
+        # x
+        self.order_name2list_x = {r: [] for r in self.data.list_order_name}
+        for d in self.data.list_delivery_date:
+            self.date2list_pattern_data[d] = []
+            for q, pattern_data in enumerate(date2iter_pattern_data[d]):
+                self.date2list_pattern_data[d].append(pattern_data)
+                if pattern_data is self.date2prior_pattern_data.get(d):
+                    self.date2prior_pattern_index[d] = q
+                self.x[d, q] = self.model.add_binary_variable(name=f"x_{d}_{q}")
+                for r in pattern_data.list_order_name:
+                    self.order_name2list_x[r].append(self.x[d, q])
+
+        # y
+        for r in self.data.list_order_name:
+            self.y[r] = self.model.add_variable(lb=0, ub=1, name=f"y_{r}")
+
+        # total_overtime
+        self.total_overtime = self._add_intermediate_variable(
+            sum(
+                [
+                    self._get_overtime(pattern_data.route_data.move_time) * self.x[d, q]
+                    for d in self.data.list_delivery_date
+                    for q, pattern_data in enumerate(self.date2list_pattern_data[d])
+                ]
+            ),
+            "total_overtime",
+        )
+        # total_overtime_cost
+        self.total_overtime_cost = self._add_intermediate_variable(
+            self.config.overtime_cost_per_hour * self.total_overtime,
+            "total_overtime_cost",
+        )
+
+        # total_outsourcing_cost
+        self.total_outsourcing_cost = self._add_intermediate_variable(
+            sum(
+                [
+                    self.config.outsourcing_cost_per_weight
+                    * self.data.order_name2data[r].weight
+                    * self.y[r]
+                    for r in self.data.list_order_name
+                ]
+            ),
+            "outsourcing_cost",
+        )
+
+        # total_cost
+        self.total_cost = self._add_intermediate_variable(
+            self.total_overtime_cost + self.total_outsourcing_cost, "total_cost"
+        )
+
+        # total_move_time
+        self.total_move_time = self._add_intermediate_variable(
+            sum(
+                [
+                    pattern_data.route_data.move_time * self.x[d, q]
+                    for d in self.data.list_delivery_date
+                    for q, pattern_data in enumerate(self.date2list_pattern_data[d])
+                ]
+            ),
+            "total_move_time",
+        )
+
+        return self
+
+    def add_constraints(self):
+        """
+        制約条件の追加
+        積載量と最大残業時間の制約条件は配送パターンの列挙時に考慮済み
+        """
+        # 各配送日に1つの配送パターンを選択
+        for d in self.data.list_delivery_date:
+            self.model.add_linear_constraint(
+                sum([self.x[d, q] for q in range(len(self.date2list_pattern_data[d]))])
+                == 1
+            )
+
+        # 各荷物は外注するか、選択した配送パターンのいずれかで自社配送する
+        for r in self.data.list_order_name:
+            self.model.add_linear_constraint(
+                self.y[r] + sum(self.order_name2list_x[r]) >= 1
+            )
+
+        return self
+
+    def add_objectives(self):
+        obj_value = 0
+        if self.config.total_move_time_objective.is_applied:
+            obj_value += self.total_overtime_cost
+        if self.config.total_cost_objective.is_applied:
+            obj_value += self.total_outsourcing_cost
+
+        self.model.minimize(obj_value)
+        return self
+
+    def _make_solution_hint(self) -> mathopt.SolutionHint | None:
+        """
+        前回の最適化結果の配送パターンを選択する初期解（ヒント）
+        """
+        if len(self.date2prior_pattern_index) == 0:
+            return None
+        values = {}
+        set_delivered_order_name = set()
+        total_overtime = 0.0
+        total_move_time = 0.0
+        for d, prior_q in self.date2prior_pattern_index.items():
+            for q in range(len(self.date2list_pattern_data[d])):
+                values[self.x[d, q]] = 1.0 if q == prior_q else 0.0
+            pattern_data = self.date2list_pattern_data[d][prior_q]
+            set_delivered_order_name.update(pattern_data.list_order_name)
+            total_overtime += self._get_overtime(pattern_data.route_data.move_time)
+            total_move_time += pattern_data.route_data.move_time
+
+        total_outsourcing_cost = 0.0
+        for r in self.data.list_order_name:
+            values[self.y[r]] = 0.0 if r in set_delivered_order_name else 1.0
+            total_outsourcing_cost += (
+                self.config.outsourcing_cost_per_weight
+                * self.data.order_name2data[r].weight
+                * values[self.y[r]]
+            )
+        total_overtime_cost = self.config.overtime_cost_per_hour * total_overtime
+        values[self.total_overtime] = total_overtime
+        values[self.total_overtime_cost] = total_overtime_cost
+        values[self.total_outsourcing_cost] = total_outsourcing_cost
+        values[self.total_cost] = total_overtime_cost + total_outsourcing_cost
+        values[self.total_move_time] = total_move_time
+        return mathopt.SolutionHint(variable_values=values)
+
+    def _get_mip_time_limit(self) -> float | None:
+        """
+        整数計画問題の計算時間（Noneは設定データの計算時間）
+        """
+        return None
+
+    def optimize(self) -> SolutionStatus:
+        """
+        最適化の実行
+        """
+        # 前回の最適化結果があれば初期解として渡す
+        solution_hint = self._make_solution_hint()
+        model_params = (
+            mathopt.ModelSolveParameters(solution_hints=[solution_hint])
+            if solution_hint is not None
+            else None
+        )
+        self.result = solve(
+            self.model,
+            self.config,
+            model_params=model_params,
+            msg_cb=self.message_callback,
+            time_limit=self._get_mip_time_limit(),
+            progress_recorder=self.progress_recorder,
+        )
+        return get_solution_status(self.result)
+
+    def get_result(self):
+        """
+        OutputDataへの整形
+        """
+        date2daily_data = {}
+        order_name2delivered_date = {}
+        for d in self.data.list_delivery_date:
+            pattern_data = next(
+                self.date2list_pattern_data[d][q]
+                for q in range(len(self.date2list_pattern_data[d]))
+                if self.result.variable_values(self.x[d, q]) > 0.5
+            )
+            # 複数の配送パターンに含まれる荷物は、最も早い配送日に配送する
+            list_order_name = [
+                r
+                for r in pattern_data.list_order_name
+                if r not in order_name2delivered_date
+            ]
+            for r in list_order_name:
+                order_name2delivered_date[r] = d
+            date2daily_data[d] = self._make_daily_data(
+                pattern_data.route_data.list_store_name,
+                sum([self.data.order_name2data[r].weight for r in list_order_name]),
+                pattern_data.route_data.move_time,
+            )
+
+        return self._make_output_data(date2daily_data, order_name2delivered_date)
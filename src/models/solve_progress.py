@@ -0,0 +1,178 @@
+import math
+import re
+import time
+from collections.abc import Callable
+
+from optimize_dataclass.io_dataclass import ProgressData
+
+BOUND_TOLERANCE = 1e-9  # 暫定解・下界が改善したとみなす相対誤差
+
+
+class SolveProgressRecorder:
+    """
+    暫定解の目的関数値と下界の推移を記録し、改善するたびに進捗データを通知する
+    同じ記録器を複数回の求解に渡すと、最初の記録器の作成からの経過時間で1つの推移として記録する
+    """
+
+    def __init__(self, on_progress: Callable[[ProgressData], None] | None = None):
+        self.on_progress = on_progress  # 進捗データを受け取る関数
+        self.start_time = time.perf_counter()
+        self.primal_bound = math.inf  # これまでの暫定解の目的関数値の最小値
+        self.dual_bound = -math.inf  # これまでの下界の最大値
+        self.list_progress: list[ProgressData] = []
+
+    def record(
+        self,
+        primal_bound: float | None = None,
+        dual_bound: float | None = None,
+        num_node: int | None = None,
+    ):
+        """
+        暫定解の目的関数値と下界を受け取り、どちらかが改善した場合だけ進捗データを追加する
+        """
+        is_improved = False
+        if primal_bound is not None and primal_bound < self.primal_bound - (
+            BOUND_TOLERANCE * max(abs(self.primal_bound), 1)
+            if math.isfinite(self.primal_bound)
+            else 0
+        ):
+            self.primal_bound = primal_bound
+            is_improved = True
+        if dual_bound is not None and dual_bound > self.dual_bound + (
+            BOUND_TOLERANCE * max(abs(self.dual_bound), 1)
+            if math.isfinite(self.dual_bound)
+            else 0
+        ):
+            self.dual_bound = dual_bound
+            is_improved = True
+        if not is_improved:
+            return
+
+        has_primal_bound = math.isfinite(self.primal_bound)
+        has_dual_bound = math.isfinite(self.dual_bound)
+        progress_data = ProgressData(
+            elapsed_time=time.perf_counter() - self.start_time,
+            primal_bound=self.primal_bound if has_primal_bound else None,
+            dual_bound=self.dual_bound if has_dual_bound else None,
+            gap=(self.primal_bound - self.dual_bound)
+            / max(abs(self.primal_bound), 1e-9)
+            if has_primal_bound and has_dual_bound
+            else None,
+            num_node=num_node,
+        )
+        self.list_progress.append(progress_data)
+        if self.on_progress is not None:
+            self.on_progress(progress_data)
+
+
+def _parse_float(value: str) -> float | None:
+    """
+    ログの数値を変換する（数値でない、または無限大ならNone）
+    """
+    try:
+        ret = float(value)
+    except ValueError:
+        return None
+    return ret if math.isfinite(ret) else None
+
+
+class ScipLogParser:
+    """
+    SCIPのログの表から、暫定解の目的関数値・下界・ノード数を取り出して記録する
+    表の列構成は並列計算の有無で変わるため、見出し行から列を探す
+    並列計算の場合は求解の終了時にしか表が出力されないため、途中の推移は得られない
+    """
+
+    def __init__(self, progress_recorder: SolveProgressRecorder):
+        self.progress_recorder = progress_recorder
+        self.column_name2index = {}  # 見出しの列名から列番号への変換
+
+    def __call__(self, list_line: list[str]):
+        for line in list_line:
+            # 表の出力前に初期解（ヒント）が受理された場合
+            match = re.search(r"new primal bound ([-+\d.eE]+)", line)
+            if match is not None:
+                self.progress_recorder.record(primal_bound=_parse_float(match.group(1)))
+                continue
+            fields = [field.strip() for field in line.split("|")]
+            if "primalbound" in fields:
+                self.column_name2index = {f: i for i, f in enumerate(fields)}
+                continue
+            if (
+                len(self.column_name2index) == 0
+                or re.fullmatch(r"\S?\s*[\d.]+s", fields[0]) is None
+                or len(fields) < len(self.column_name2index)
+            ):
+                continue
+            num_node = None
+            if "node" in self.column_name2index:
+                num_node = int(
+                    _parse_float(fields[self.column_name2index["node"]]) or 0
+                )
+            self.progress_recorder.record(
+                primal_bound=_parse_float(
+                    fields[self.column_name2index["primalbound"]]
+                ),
+                dual_bound=_parse_float(fields[self.column_name2index["dualbound"]]),
+                num_node=num_node,
+            )
+
+
+class HighsLogParser:
+    """
+    HiGHSのログの分枝限定法の表から、暫定解の目的関数値・下界・ノード数を取り出して記録する
+    表の行は「発見方法 ノード数 未探索 葉 探索率 下界 暫定解 ギャップ カット数 LP内 競合 LP反復 時間」の順
+    """
+
+    def __init__(self, progress_recorder: SolveProgressRecorder):
+        self.progress_recorder = progress_recorder
+        self.is_in_table = False  # 表の見出し行より後かどうか
+
+    def __call__(self, list_line: list[str]):
+        for line in list_line:
+            if "BestBound" in line and "BestSol" in line:
+                self.is_in_table = True
+                continue
+            if not self.is_in_table:
+                continue
+            tokens = line.split()
+            # 発見方法の列は空欄の場合がある
+            if len(tokens) > 0 and re.fullmatch(r"[A-Za-z]", tokens[0]):
+                tokens = tokens[1:]
+            if len(tokens) != 12 or re.fullmatch(r"[\d.]+s", tokens[-1]) is None:
+                continue
+            num_node = _parse_float(tokens[0])
+            self.progress_recorder.record(
+                primal_bound=_parse_float(tokens[5]),
+                dual_bound=_parse_float(tokens[4]),
+                num_node=int(num_node) if num_node is not None else None,
+            )
+
+
+class CpSatLogParser:
+    """
+    CP-SATのログの解の発見・下界の更新の行から、暫定解の目的関数値と下界を取り出して記録する
+    行は「#番号 時間 best:暫定解 next:[次に探す目的関数値の範囲]」の形式で、
+    最小化の場合は範囲の下端が下界になる（範囲が空なら最適性が証明されている）
+    CP-SATのコールバックは対応するイベントと統計情報がortoolsのバージョンで異なるため、ログから読み取る
+    """
+
+    def __init__(self, progress_recorder: SolveProgressRecorder):
+        self.progress_recorder = progress_recorder
+
+    def __call__(self, list_line: list[str]):
+        for line in list_line:
+            match = re.match(
+                r"#(?:\d+|Bound|Done)\s+[\d.]+s\s+best:(\S+)\s+next:\[([^\]]*)\]", line
+            )
+            if match is None:
+                continue
+            primal_bound = _parse_float(match.group(1))
+            list_next = [_parse_float(v) for v in match.group(2).split(",") if v]
+            if len(list_next) == 0:
+                dual_bound = primal_bound
+            else:
+                dual_bound = list_next[0]
+            self.progress_recorder.record(
+                primal_bound=primal_bound, dual_bound=dual_bound
+            )
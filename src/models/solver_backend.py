@@ -0,0 +1,135 @@
+import math
+from collections.abc import Callable
+from datetime import timedelta
+
+from ortools.math_opt.python import mathopt
+
+from consts import SolutionStatus
+from models.solve_progress import (
+    CpSatLogParser,
+    HighsLogParser,
+    ScipLogParser,
+    SolveProgressRecorder,
+)
+from optimize_dataclass.config_dataclass import ConfigData
+
+solver_backend_name2solver_type = {
+    "gscip": mathopt.SolverType.GSCIP,
+    "highs": mathopt.SolverType.HIGHS,
+    "cp_sat": mathopt.SolverType.CP_SAT,
+}
+
+presolve_level2emphasis = {
+    "off": mathopt.Emphasis.OFF,
+    "low": mathopt.Emphasis.LOW,
+    "medium": mathopt.Emphasis.MEDIUM,
+    "high": mathopt.Emphasis.HIGH,
+    "very_high": mathopt.Emphasis.VERY_HIGH,
+}
+
+# CP-SATは連続変数を整数変数として解くため、連続変数をこの倍率で拡大して丸め誤差を抑える
+CP_SAT_MIP_VAR_SCALING = 1e6
+# 拡大した連続変数（費用の合計など）が収まるように、変数の上下限の絶対値の上限も広げる
+CP_SAT_MIP_MAX_BOUND = 1e12
+
+
+def make_solve_parameters(
+    config: ConfigData, time_limit: float | None = None
+) -> mathopt.SolveParameters:
+    """
+    設定データから、ソルバーごとに対応しているパラメータだけを設定したソルバーのパラメータを作る
+    time_limitを省略した場合は設定データの計算時間とする
+    """
+    params = mathopt.SolveParameters(
+        time_limit=timedelta(
+            seconds=config.time_limit if time_limit is None else time_limit
+        ),
+        enable_output=config.enable_solver_output,
+        relative_gap_tolerance=config.relative_gap_tolerance,
+    )
+    # HiGHSはスレッド数の指定に対応していない
+    if config.solver_backend != "highs":
+        params.threads = config.threads
+    if config.presolve_level is not None:
+        params.presolve = presolve_level2emphasis[config.presolve_level]
+    if config.solver_backend == "cp_sat":
+        params.cp_sat.mip_var_scaling = CP_SAT_MIP_VAR_SCALING
+        params.cp_sat.mip_max_bound = CP_SAT_MIP_MAX_BOUND
+    return params
+
+
+def solve(
+    model: mathopt.Model,
+    config: ConfigData,
+    model_params: mathopt.ModelSolveParameters | None = None,
+    msg_cb: Callable[[list[str]], None] | None = None,
+    time_limit: float | None = None,
+    progress_recorder: SolveProgressRecorder | None = None,
+) -> mathopt.SolveResult:
+    """
+    設定データで指定したソルバーで求解する
+    progress_recorderを渡すと、暫定解と下界の推移をソルバーのログから読み取って記録する
+    GSCIPは並列計算の場合に求解の終了時にしかログの表を出力しないため、進捗は終了時にまとめて
+    記録する。single_thread_gscip_progressがTrueなら、進捗を逐次通知する場合
+    （on_progressがある場合）は1スレッドで解く
+    """
+    params = make_solve_parameters(config, time_limit)
+    if progress_recorder is not None:
+        if config.solver_backend == "cp_sat":
+            log_parser = CpSatLogParser(progress_recorder)
+        elif config.solver_backend == "gscip":
+            log_parser = ScipLogParser(progress_recorder)
+            if (
+                config.single_thread_gscip_progress
+                and progress_recorder.on_progress is not None
+            ):
+                params.threads = 1
+        else:
+            log_parser = HighsLogParser(progress_recorder)
+        if msg_cb is None:
+            msg_cb = log_parser
+        else:
+            user_msg_cb = msg_cb
+
+            def msg_cb(list_line: list[str]):
+                user_msg_cb(list_line)
+                log_parser(list_line)
+
+    result = mathopt.solve(
+        model,
+        solver_backend_name2solver_type[config.solver_backend],
+        params=params,
+        model_params=model_params,
+        msg_cb=msg_cb,
+    )
+    if progress_recorder is not None:
+        # ログの最後の行より後に確定した暫定解・下界（最適性の証明など）を記録する
+        objective_bounds = result.termination.objective_bounds
+        progress_recorder.record(
+            primal_bound=objective_bounds.primal_bound
+            if math.isfinite(objective_bounds.primal_bound)
+            else None,
+            dual_bound=objective_bounds.dual_bound
+            if math.isfinite(objective_bounds.dual_bound)
+            else None,
+        )
+    return result
+
+
+def get_solution_status(result: mathopt.SolveResult) -> SolutionStatus:
+    """
+    ソルバーの終了理由を解のステータスに変換する
+    """
+    reason = result.termination.reason
+    if reason == mathopt.TerminationReason.OPTIMAL:
+        return "Optimal"
+    elif reason == mathopt.TerminationReason.FEASIBLE:
+        return "Feasible"
+    elif reason == mathopt.TerminationReason.NO_SOLUTION_FOUND:
+        return "NotSolved"
+    elif reason == mathopt.TerminationReason.INFEASIBLE:
+        return "Infeasible"
+    elif reason == mathopt.TerminationReason.UNBOUNDED:
+        return "Unbounded"
+    else:
+        return "Undefined"
@@ -21,12 +21,69 @@ class ConstraintData(BaseModel):
     is_applied: bool = True  # 適用するかどうか
 
 
+class PortfolioMemberData(BaseModel):
+    """
+    ポートフォリオで並列に解く設定データ
+    """
+
+    solver_model_type: str  # 最適化モデルの種類
+    solver_backend: Literal["gscip", "highs", "cp_sat"] = "gscip"  # MIPソルバーの種類
+    # 素朴なモデルの部分巡回路除去の定式化
+    subtour_elimination_type: Literal["mtz", "flow", "lazy"] = "mtz"
+    threads: int = 1  # 計算スレッド数
+
+
+class VehicleTypeData(BaseModel):
+    """
+    車種データ
+    """
+
+    name: str  # 車種名
+    count: int = Field(ge=1)  # 台数
+    capacity: float  # 積載量（kg）
+    fixed_cost: float = 0.0  # 1台を1日使うごとにかかる費用（円）
+
+
 class ConfigData(BaseModel):
     dataset_name: str  # データセット名
     # 計算設定
     solver_model_type: str = "naive_model"  # 最適化モデルの種類
+    warm_start_solver_model_type: str | None = None  # 初期解を作る最適化モデルの種類
+    solver_backend: Literal["gscip", "highs", "cp_sat"] = "gscip"  # MIPソルバーの種類
     time_limit: int  # 計算時間（秒）
     threads: int  # 計算スレッド数
+    # 相対ギャップの許容値（Noneはソルバーの既定値）
+    relative_gap_tolerance: float | None = None
+    # ソルバーの前処理の強さ（Noneはソルバーの既定値）
+    presolve_level: Literal["off", "low", "medium", "high", "very_high"] | None = None
+    enable_solver_output: bool = True  # ソルバーのログを出力するかどうか
+    # GSCIPで進捗を逐次通知する場合に1スレッドで解くかどうか
+    # （GSCIPは並列計算では求解の終了時にしか進捗のログを出力しない）
+    single_thread_gscip_progress: bool = False
+    # 変数と制約条件に名前を付けるかどうか（デバッグ用）
+    enable_debug_name: bool = False
+    # 素朴なモデルの部分巡回路除去の定式化（MTZ or 単一品種フロー or 遅延制約）
+    subtour_elimination_type: Literal["mtz", "flow", "lazy"] = "mtz"
+    # 遅延制約で1回の求解にかける計算時間（秒）。解が得られなければ倍にする
+    lazy_round_time_limit: float = Field(default=10.0, gt=0)
+    use_route_table_cache: bool = True  # 配送ルート表のキャッシュを利用するかどうか
+    max_pricing_round: int = 100  # 列生成の価格付けの最大反復回数
+    max_benders_round: int = 100  # 分解法の主問題と部分問題の最大反復回数
+    # 最適解でない場合にラグランジュ緩和の下界を求めるか
+    use_lagrangian_bound: bool = False
+    lagrangian_time_limit: float = 10.0  # ラグランジュ緩和の劣勾配法の計算時間（秒）
+    max_lagrangian_round: int = 200  # ラグランジュ緩和の劣勾配法の最大反復回数
+    # 発見的解法で初期解の構築と局所探索を繰り返す回数
+    heuristic_num_start: int = Field(default=10, ge=1)
+    list_portfolio_member: list[
+        PortfolioMemberData
+    ] = []  # ポートフォリオで並列に解く設定のリスト（空なら並列に解かない）
+    rolling_horizon_window: int | None = Field(
+        default=None, ge=1
+    )  # ローリングホライズンで一度に解く配送日数（Noneなら計画期間全体を一度に解く）
+    rolling_horizon_overlap: int = Field(
+        default=1, ge=0
+    )  # ローリングホライズンで次の区間と重ねて解き直す配送日数
 
     # 入力データ
     standartd_work_time: float  # 定時の勤務時間（時間）
@@ -34,6 +91,8 @@ class ConfigData(BaseModel):
     overtime_cost_per_hour: float  # 残業時間コスト（円/時間）
     outsourcing_cost_per_weight: float  # 外注費用（円/kg）
     truck_capacity: float  # トラックの積載量（kg）
+    # 車種のリスト（空なら入力データの車種、それもなければ積載量truck_capacityのトラック1台）
+    list_vehicle_type: list[VehicleTypeData] = []
 
     # 目的関数
     total_move_time_objective: ObjectiveData  # 移動時間の総和
@@ -42,6 +101,33 @@ class ConfigData(BaseModel):
     # 制約条件
     max_overtime_constraint: ConstraintData  # 最大残業時間制約
     truck_capacity_constraint: ConstraintData  # トラックの積載量制約
+    # 素朴なモデルを強化する妥当不等式（最適値は変わらない）
+    day_symmetry_constraint: ConstraintData = ConstraintData(
+        is_applied=False
+    )  # 配送可能な荷物が同じ配送日の間の対称性除去
+    knapsack_cover_constraint: ConstraintData = ConstraintData(
+        is_applied=False
+    )  # 積載量に対するナップサック被覆不等式
+    store_capacity_linking_constraint: ConstraintData = ConstraintData(
+        is_applied=False
+    )  # 配送重量とデポからの出発・店舗への訪問を結ぶ制約
+    tour_lower_bound_constraint: ConstraintData = ConstraintData(
+        is_applied=False
+    )  # 店舗の組合せの最短ルートによる移動時間の下界
+
+    def get_list_vehicle_type(
+        self, list_input_vehicle_type: list[VehicleTypeData] | None = None
+    ) -> list[VehicleTypeData]:
+        """
+        車種のリスト
+        設定データ、入力データ（list_input_vehicle_type）の順に指定があればそれを使い、
+        どちらもなければ積載量truck_capacityのトラック1台とする
+        """
+        if len(self.list_vehicle_type) > 0:
+            return self.list_vehicle_type
+        if list_input_vehicle_type:
+            return list_input_vehicle_type
+        return [VehicleTypeData(name="truck", count=1, capacity=self.truck_capacity)]
 
     def get_list_objective(self) -> list[ObjectiveData]:
         return [
@@ -1,4 +1,39 @@
-from pydantic import BaseModel
+from collections.abc import Iterator, Mapping
+from typing import Annotated
+
+import numpy as np
+from pydantic import (
+    BaseModel,
+    PlainSerializer,
+    PlainValidator,
+    TypeAdapter,
+    WithJsonSchema,
+)
+
+from optimize_dataclass.config_dataclass import VehicleTypeData
+
+# 浮動小数点数の2次元配列（JSONには入れ子のリストとして書き出し、読み込み時に配列に戻す）
+FloatMatrix = Annotated[
+    np.ndarray,
+    PlainValidator(lambda value: np.asarray(value, dtype=np.float64)),
+    PlainSerializer(lambda value: value.tolist(), return_type=list[list[float]]),
+    WithJsonSchema(
+        {"type": "array", "items": {"type": "array", "items": {"type": "number"}}}
+    ),
+]
+# 浮動小数点数・整数の1次元配列（JSONにはリストとして書き出し、読み込み時に配列に戻す）
+FloatVector = Annotated[
+    np.ndarray,
+    PlainValidator(lambda value: np.asarray(value, dtype=np.float64)),
+    PlainSerializer(lambda value: value.tolist(), return_type=list[float]),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+]
+IntVector = Annotated[
+    np.ndarray,
+    PlainValidator(lambda value: np.asarray(value, dtype=np.int64)),
+    PlainSerializer(lambda value: value.tolist(), return_type=list[int]),
+    WithJsonSchema({"type": "array", "items": {"type": "integer"}}),
+]
 
 
 # 入力データクラスの定義
@@ -24,6 +59,129 @@ class OrderData(BaseModel):
     time_window_end: int
 
 
+class OrderTable(BaseModel):
+    """
+    配送注文データを項目ごとの配列で持つ表（荷物ごとにOrderDataを作らずに済む）
+    配送先はlist_location_nameの添字で表す
+    """
+
+    list_order_name: list[str]  # 配送注文名のリスト
+    list_location_name: list[str]  # 配送先の添字から地点名への変換
+    destination_index: IntVector  # 荷物ごとの配送先の添字
+    weight: FloatVector  # 荷物ごとの重量
+    time_window_start: IntVector  # 荷物ごとの指定配送期間の開始日
+    time_window_end: IntVector  # 荷物ごとの指定配送期間の終了日
+
+    @classmethod
+    def from_list_order_data(cls, list_order_data: list[OrderData]) -> "OrderTable":
+        """
+        配送注文データのリストから表を作る
+        """
+        list_location_name = sorted({o.destination for o in list_order_data})
+        location_name2index = {k: i for i, k in enumerate(list_location_name)}
+        return cls(
+            list_order_name=[o.name for o in list_order_data],
+            list_location_name=list_location_name,
+            destination_index=[
+                location_name2index[o.destination] for o in list_order_data
+            ],
+            weight=[o.weight for o in list_order_data],
+            time_window_start=[o.time_window_start for o in list_order_data],
+            time_window_end=[o.time_window_end for o in list_order_data],
+        )
+
+    def take(self, rows: np.ndarray) -> "OrderTable":
+        """
+        指定した行の荷物だけを、指定した順番に並べた表
+        """
+        return self.model_copy(
+            update={
+                "list_order_name": [self.list_order_name[j] for j in rows],
+                "destination_index": self.destination_index[rows],
+                "weight": self.weight[rows],
+                "time_window_start": self.time_window_start[rows],
+                "time_window_end": self.time_window_end[rows],
+            }
+        )
+
+    def get_destination(self, list_location_name: list[str]) -> np.ndarray:
+        """
+        荷物ごとの配送先を、list_location_nameの添字に変換した配列
+        """
+        location_name2index = {k: i for i, k in enumerate(list_location_name)}
+        index_map = np.full(len(self.list_location_name), -1, dtype=np.int64)
+        for i in np.unique(self.destination_index):
+            index_map[i] = location_name2index[self.list_location_name[i]]
+        return index_map[self.destination_index]
+
+
+class OrderDataView(Mapping[str, OrderData]):
+    """
+    配送注文の表を、配送注文名から配送注文データへの辞書として参照するための読み取り専用のビュー
+    配送注文データは参照されたときに初めて作り、作ったものは使い回す
+    """
+
+    def __init__(self, order_table: OrderTable):
+        self.order_table = order_table
+        self.order_name2row = {r: j for j, r in enumerate(order_table.list_order_name)}
+        self.order_name2data = {}  # 作成済みの配送注文データ
+
+    def __getitem__(self, order_name: str) -> OrderData:
+        order_data = self.order_name2data.get(order_name)
+        if order_data is None:
+            j = self.order_name2row[order_name]
+            table = self.order_table
+            # 表の値は読み込み時に検証済みのため、検証を省略して作る
+            order_data = OrderData.model_construct(
+                name=order_name,
+                destination=table.list_location_name[table.destination_index[j]],
+                weight=float(table.weight[j]),
+                time_window_start=int(table.time_window_start[j]),
+                time_window_end=int(table.time_window_end[j]),
+            )
+            self.order_name2data[order_name] = order_data
+        return order_data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.order_table.list_order_name)
+
+    def __len__(self) -> int:
+        return len(self.order_table.list_order_name)
+
+    def __contains__(self, order_name) -> bool:
+        return order_name in self.order_name2row
+
+    def get_order_table(self, list_order_name: list[str]) -> OrderTable:
+        """
+        list_order_nameの荷物をその順番に並べた表
+        """
+        if list_order_name == self.order_table.list_order_name:
+            return self.order_table
+        return self.order_table.take(
+            np.array([self.order_name2row[r] for r in list_order_name], dtype=np.int64)
+        )
+
+
+def _validate_order_name2data(value) -> Mapping[str, OrderData]:
+    """
+    配送注文の表のビューはそのまま受け取り、それ以外は配送注文名から配送注文データへの辞書として検証する
+    """
+    if isinstance(value, OrderDataView):
+        return value
+    return _order_name2data_adapter.validate_python(value)
+
+
+_order_name2data_adapter = TypeAdapter(dict[str, OrderData])
+# 配送注文名から配送注文データへの辞書、または配送注文の表のビュー（JSONにはどちらも辞書として書き出す）
+OrderName2Data = Annotated[
+    Mapping[str, OrderData],
+    PlainValidator(
+        _validate_order_name2data, json_schema_input_type=dict[str, OrderData]
+    ),
+    PlainSerializer(lambda value: dict(value), return_type=dict[str, OrderData]),
+]
+
+
 class InputData(BaseModel):
     """
     最適化入力クラス
@@ -31,25 +189,69 @@ class InputData(BaseModel):
 
     list_delivery_date: list[int]  # 配送日のリスト
     list_order_name: list[str]  # 配送注文名のリスト
-    order_name2data: dict[str, OrderData]  # 配送注文名からデータへの変換
+    order_name2data: OrderName2Data  # 配送注文名からデータへの変換
     list_store_name: list[str]  # デポを除く店舗名のリスト
     store_name2data: dict[str, StoreData]  # デポを除く店舗名から店舗データへの変換
     depot_data: StoreData  # デポ(配送センター)のデータ
     list_store_and_depot_data: list[StoreData]  # 店舗とデポのデータリスト
-    move_time_matrix: dict[tuple[str, str], float]  # 店舗間の移動時間
+    # 店舗とデポの名前から移動時間行列の添字への変換
+    location_name2index: dict[str, int]
+    move_time_array: FloatMatrix  # 店舗間の移動時間 (地点数, 地点数)
+    # 車種のリスト（空なら設定データの車種）
+    list_vehicle_type: list[VehicleTypeData] = []
+
+    def get_order_table(self) -> OrderTable:
+        """
+        list_order_nameの荷物をその順番に並べた配送注文の表
+        配送注文データが表のビューの場合は、配送注文データを作らずに表から取り出す
+        """
+        if isinstance(self.order_name2data, OrderDataView):
+            return self.order_name2data.get_order_table(self.list_order_name)
+        return OrderTable.from_list_order_data(
+            [self.order_name2data[r] for r in self.list_order_name]
+        )
+
+    def get_move_time(self, location_name1: str, location_name2: str) -> float:
+        """
+        地点1から地点2への移動時間
+        """
+        return float(
+            self.move_time_array[
+                self.location_name2index[location_name1],
+                self.location_name2index[location_name2],
+            ]
+        )
 
 
 # 出力データクラスの定義
+class VehicleRouteData(BaseModel):
+    """
+    1台のトラックの1日分の配送結果データ
+    """
+
+    vehicle_type_name: str  # 車種名
+    list_delivery_route: list[StoreData]  # 配送ルート
+    total_weight: float  # 配送重量
+    overtime: float  # 残業時間
+    overtime_cost: float  # 残業時間コスト
+    fixed_cost: float  # 車両の固定費用
+    move_time: float  # 移動時間
+
+
 class DailyData(BaseModel):
     """
     1日分の配送結果データ
     """
 
-    list_delivery_route: list[StoreData]  # 自社配送のルート
+    # 自社配送のルート（複数台の場合はつなげたもの）
+    list_delivery_route: list[StoreData]
     daily_total_weight: float  # 配送重量
     daily_overtime: float  # 一日の残業時間
     daily_overtime_cost: float  # 一日の残業時間コスト
     daily_move_time: float  # 移動時間
+    list_vehicle_route: list[
+        VehicleRouteData
+    ] = []  # トラックごとの配送結果（複数台を扱うモデルのみ）
 
 
 class DeliveryStatusData(BaseModel):
@@ -58,6 +260,94 @@ class DeliveryStatusData(BaseModel):
     outsourcing_cost: float | None  # 外注費用
 
 
+class ColumnGenerationLogData(BaseModel):
+    """
+    列生成の価格付けの反復ごとのログ
+    """
+
+    iteration: int  # 価格付けの反復回数
+    elapsed_time: float  # 経過時間（秒）
+    lp_objective: float  # 限定主問題のLP緩和の目的関数値
+    lower_bound: float  # LP緩和の目的関数値と価格付け問題から得られる下界
+    num_added_pattern: int  # 追加した配送パターン数
+
+
+class BendersLogData(BaseModel):
+    """
+    分解法の主問題と部分問題の反復ごとのログ
+    """
+
+    iteration: int  # 反復回数
+    elapsed_time: float  # 経過時間（秒）
+    lower_bound: float  # 主問題から得られる下界
+    upper_bound: float  # これまでに得られた実行可能解の目的関数値の最小値
+    num_solved_route: int  # 部分問題として新たに解いた店舗の組合せの数
+    num_added_cut: int  # 主問題に追加したカット数
+
+
+class LagrangianLogData(BaseModel):
+    """
+    ラグランジュ緩和の劣勾配法の反復ごとのログ
+    """
+
+    iteration: int  # 反復回数
+    elapsed_time: float  # 経過時間（秒）
+    lagrangian_value: float  # 現在のラグランジュ乗数でのラグランジュ緩和問題の最適値
+    lower_bound: float  # これまでに得られた下界の最大値
+    step_size: float  # ラグランジュ乗数の更新幅
+
+
+class ProgressData(BaseModel):
+    """
+    求解中に暫定解または下界が改善した時点の進捗
+    """
+
+    elapsed_time: float  # 求解の開始からの経過時間（秒）
+    primal_bound: float | None = None  # 暫定解の目的関数値（暫定解がなければNone）
+    dual_bound: float | None = None  # 下界（得られていなければNone）
+    gap: float | None = None  # 相対ギャップ（暫定解と下界の両方がなければNone）
+    # 探索した分枝限定法のノード数（ソルバーが出力しない場合はNone）
+    num_node: int | None = None
+
+
+class PortfolioMemberLogData(BaseModel):
+    """
+    ポートフォリオで並列に解いた設定ごとのログ
+    """
+
+    solver_model_type: str  # 最適化モデルの種類
+    solver_backend: str  # MIPソルバーの種類
+    status: str  # 解のステータス（計算時間内に終わらなかった場合はNotSolved）
+    elapsed_time: float  # 開始から結果が得られるまで、または打ち切るまでの時間（秒）
+    total_cost: float | None = None  # 総費用（実行可能解が得られなかった場合はNone）
+    is_selected: bool = False  # 出力データとして採用したかどうか
+
+
+class SolveInfoData(BaseModel):
+    """
+    最適化の実行情報
+    """
+
+    status: str | None = None  # 解のステータス
+    warm_start_time: float | None = None  # 初期解の作成時間（秒）
+    build_time: float | None = None  # モデルの構築時間（秒）
+    solve_time: float | None = None  # 求解時間（秒）
+    num_pricing_round: int | None = None  # 列生成の価格付けの反復回数
+    list_column_generation_log: list[
+        ColumnGenerationLogData
+    ] = []  # 列生成の反復ごとのログ
+    list_benders_log: list[BendersLogData] = []  # 分解法の反復ごとのログ
+    lagrangian_lower_bound: float | None = None  # ラグランジュ緩和による総費用の下界
+    lagrangian_gap: float | None = None  # 総費用とラグランジュ緩和の下界の相対ギャップ
+    list_lagrangian_log: list[
+        LagrangianLogData
+    ] = []  # ラグランジュ緩和の劣勾配法の反復ごとのログ
+    list_portfolio_member_log: list[
+        PortfolioMemberLogData
+    ] = []  # ポートフォリオで並列に解いた設定ごとのログ
+    list_progress: list[ProgressData] = []  # 暫定解または下界が改善するごとの進捗
+
+
 class OutputData(BaseModel):
     """
     最適化出力クラス
@@ -72,3 +362,5 @@ class OutputData(BaseModel):
     total_outsourcing_cost: float  # 総外注費用
     total_cost: float  # 総費用
     total_move_time: float  # 総移動時間
+    total_vehicle_cost: float = 0.0  # 総車両費用（複数台を扱うモデルのみ）
+    solve_info: SolveInfoData | None = None  # 最適化の実行情報
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+
+class RouteData(BaseModel):
+    """
+    配送ルートデータ
+    """
+
+    list_store_name: list[str]  # 訪問する店舗名の順番（デポを除く）
+    move_time: float  # 移動時間
+
+
+class PatternData(BaseModel):
+    """
+    1日分の配送パターンデータ
+    """
+
+    list_order_name: list[str]  # 自社配送する配送注文名のリスト
+    route_data: RouteData  # 配送ルート
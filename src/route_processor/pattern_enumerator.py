@@ -0,0 +1,103 @@
+from collections.abc import Iterator
+
+import numpy as np
+
+from optimize_dataclass.io_dataclass import InputData
+from optimize_dataclass.pattern_dataclass import PatternData, RouteData
+from route_processor.route_table import RouteTable
+
+
+def get_list_deliverable_order_name(input_data: InputData, d: int) -> list[str]:
+    """
+    配送日dに配送可能な配送注文名のリスト
+    """
+    return [
+        r
+        for r in input_data.list_order_name
+        if input_data.order_name2data[r].time_window_start
+        <= d
+        <= input_data.order_name2data[r].time_window_end
+    ]
+
+
+class PatternEnumerator:
+    """
+    配送日ごとの配送パターンを深さ優先探索で列挙する
+    - 積載量を超える荷物の組合せは探索しない
+    - 上位集合を含めて実行可能な配送ルートがない店舗の組合せは探索しない
+    - 同じ店舗の組合せで、さらに荷物を積める配送パターン（支配されるパターン）は列挙しない
+    """
+
+    def __init__(
+        self,
+        input_data: InputData,
+        route_table: RouteTable,
+        truck_capacity: float,
+        max_move_time: float,
+    ):
+        self.data = input_data
+        self.route_table = route_table
+        self.truck_capacity = truck_capacity
+
+        # 実行可能な配送ルートがある店舗の組合せ
+        self.is_feasible = route_table.move_time <= max_move_time
+        # 自身または上位集合に実行可能な配送ルートがある店舗の組合せ
+        self.is_extendable = self.is_feasible.copy()
+        masks = np.arange(len(self.is_feasible))
+        for i in range(route_table.num_store):
+            without_i = masks[(masks >> i) & 1 == 0]
+            self.is_extendable[without_i] |= self.is_extendable[without_i | 1 << i]
+
+        self.mask2route_data: dict[int, RouteData] = {}
+
+    def _get_route_data(self, mask: int) -> RouteData:
+        if mask not in self.mask2route_data:
+            self.mask2route_data[mask] = self.route_table.get_route_data(mask)
+        return self.mask2route_data[mask]
+
+    def iter_patterns(self, d: int) -> Iterator[PatternData]:
+        """
+        配送日dの支配されない配送パターンを順に生成する
+        """
+        # 重い荷物から順に探索すると積載量による枝刈りが早く効く
+        list_order_name = sorted(
+            get_list_deliverable_order_name(self.data, d),
+            key=lambda r: -self.data.order_name2data[r].weight,
+        )
+        list_weight = [self.data.order_name2data[r].weight for r in list_order_name]
+        store_name2bit = self.route_table.store_name2bit
+        list_bit = [
+            1 << store_name2bit[self.data.order_name2data[r].destination]
+            for r in list_order_name
+        ]
+        n = len(list_order_name)
+
+        # (次に判定する荷物, 積載重量, 店舗の組合せ, 選択した荷物の番号)
+        stack = [(0, 0.0, 0, ())]
+        while stack:
+            i, weight, mask, chosen = stack.pop()
+            if i == n:
+                if not self.is_feasible[mask]:
+                    continue
+                # 同じ店舗の組合せで、まだ積める荷物があれば支配される
+                chosen_set = set(chosen)
+                if any(
+                    j not in chosen_set
+                    and list_bit[j] & mask
+                    and weight + list_weight[j] <= self.truck_capacity
+                    for j in range(n)
+                ):
+                    continue
+                yield PatternData(
+                    list_order_name=[list_order_name[j] for j in chosen],
+                    route_data=self._get_route_data(mask),
+                )
+                continue
+
+            # 荷物iを積まない
+            stack.append((i + 1, weight, mask, chosen))
+            # 荷物iを積む
+            next_weight = weight + list_weight[i]
+            next_mask = mask | list_bit[i]
+            if next_weight <= self.truck_capacity and self.is_extendable[next_mask]:
+                stack.append((i + 1, next_weight, next_mask, chosen + (i,)))
@@ -0,0 +1,171 @@
+import math
+
+import numpy as np
+
+from optimize_dataclass.io_dataclass import InputData
+from optimize_dataclass.pattern_dataclass import PatternData
+from route_processor.pattern_enumerator import get_list_deliverable_order_name
+from route_processor.route_table import RouteTable
+
+MAX_CAPACITY_UNIT = 2000  # 動的計画法で扱う積載量の最大刻み数
+
+
+def get_weight_unit(list_weight: list[float], capacity: float) -> float:
+    """
+    動的計画法で扱う重量の単位
+    重量と積載量が全て整数ならその最大公約数とし、刻み数が多すぎる場合は積載量を等分する
+    """
+    if all(float(w).is_integer() for w in list_weight) and float(capacity).is_integer():
+        unit = math.gcd(*[int(w) for w in list_weight], int(capacity)) or 1
+        if capacity / unit <= MAX_CAPACITY_UNIT:
+            return float(unit)
+    return capacity / MAX_CAPACITY_UNIT
+
+
+def is_exact_weight_unit(list_weight: list[float], capacity: float) -> bool:
+    """
+    重量が全てget_weight_unitの単位の整数倍で、動的計画法が丸めずに解けるかどうか
+    """
+    if capacity <= 0:
+        return True
+    unit = get_weight_unit(list_weight, capacity)
+    return all(abs(w / unit - round(w / unit)) < 1e-9 for w in list_weight)
+
+
+class PricingSolver:
+    """
+    配送日ごとに、荷物の利得の合計から配送ルートの費用を引いた値が最大となる配送パターンを求める
+    店舗の組合せと積載重量を状態とするナップサック型の動的計画法で解く
+    重量が整数の場合は厳密解、そうでない場合は重量を切り上げて扱うため近似解となる
+    is_relaxedの場合は重量を切り捨てて扱い、値は最大値の上界となる（配送パターンは積載量を超えうる）
+    """
+
+    def __init__(
+        self,
+        input_data: InputData,
+        route_table: RouteTable,
+        truck_capacity: float,
+        route_cost: np.ndarray,
+        is_relaxed: bool = False,
+    ):
+        self.data = input_data
+        self.route_table = route_table
+        self.truck_capacity = truck_capacity
+        # 店舗の組合せごとの配送ルートの費用（実行不可能ならinf）
+        self.route_cost = route_cost
+        self.is_relaxed = is_relaxed  # 重量を切り捨てて緩和問題を解くかどうか
+
+    def _get_list_order_name(
+        self, d: int, order_name2profit: dict[str, float]
+    ) -> list[str]:
+        """
+        配送日dに配送でき、利得が正の荷物のリスト
+        """
+        return [
+            r
+            for r in get_list_deliverable_order_name(self.data, d)
+            if order_name2profit.get(r, 0) > 0
+        ]
+
+    def is_exact(self, d: int, order_name2profit: dict[str, float]) -> bool:
+        """
+        配送日dの価格付け問題を、重量を丸めずに厳密に解くかどうか
+        """
+        list_weight = [
+            self.data.order_name2data[r].weight
+            for r in self._get_list_order_name(d, order_name2profit)
+        ]
+        return is_exact_weight_unit(
+            list_weight, min(self.truck_capacity, sum(list_weight))
+        )
+
+    def solve(
+        self, d: int, order_name2profit: dict[str, float]
+    ) -> tuple[float, PatternData]:
+        """
+        配送日dの最良の配送パターンとその値（利得の合計 - 配送ルートの費用）を返す
+        """
+        list_deliverable_order_name = get_list_deliverable_order_name(self.data, d)
+        list_order_name = self._get_list_order_name(d, order_name2profit)
+        list_store_name = sorted(
+            {self.data.order_name2data[r].destination for r in list_order_name},
+            key=lambda s: self.route_table.store_name2bit[s],
+        )
+        store_name2local_bit = {s: 1 << i for i, s in enumerate(list_store_name)}
+        num_local_mask = 1 << len(list_store_name)
+
+        # 局所的な店舗の組合せからルート表の店舗の組合せへの変換
+        local_masks = np.arange(num_local_mask)
+        global_masks = np.zeros(num_local_mask, dtype=np.int64)
+        for i, s in enumerate(list_store_name):
+            bit = self.route_table.store_name2bit[s]
+            global_masks |= ((local_masks >> i) & 1) << bit
+
+        # 積載量の刻み
+        list_weight = [self.data.order_name2data[r].weight for r in list_order_name]
+        capacity = min(self.truck_capacity, sum(list_weight))
+        unit = get_weight_unit(list_weight, capacity) if capacity > 0 else 1.0
+        capacity_unit = int(math.floor(capacity / unit + 1e-9))
+        if self.is_relaxed:
+            list_weight_unit = [int(math.floor(w / unit + 1e-9)) for w in list_weight]
+        else:
+            list_weight_unit = [int(math.ceil(w / unit - 1e-9)) for w in list_weight]
+
+        # value[c, m]: 積載重量がちょうどc、訪問店舗の組合せがmのときの利得の最大値
+        value = np.full((capacity_unit + 1, num_local_mask), -np.inf)
+        value[0, 0] = 0.0
+        # choice[i, c, m]: 荷物iを積んだか (0:積まない, 1:同じ組合せから, 2:店舗を追加して)
+        choice = np.zeros(
+            (len(list_order_name), capacity_unit + 1, num_local_mask), dtype=np.int8
+        )
+        for i, r in enumerate(list_order_name):
+            w = list_weight_unit[i]
+            if w > capacity_unit:
+                continue
+            bit = store_name2local_bit[self.data.order_name2data[r].destination]
+            tar = local_masks[(local_masks & bit) > 0]
+            from_same = value[: capacity_unit + 1 - w, tar]
+            from_without = value[: capacity_unit + 1 - w, tar ^ bit]
+            cand = np.maximum(from_same, from_without) + order_name2profit[r]
+            cur = value[w:, tar]
+            improved = cand > cur
+            value[w:, tar] = np.where(improved, cand, cur)
+            choice_i = choice[i]
+            choice_i[w:, tar] = np.where(
+                improved, np.where(from_without > from_same, 2, 1), 0
+            )
+
+        # 配送ルートの費用を差し引いて最良の状態を選ぶ
+        net_value = value - self.route_cost[global_masks]
+        c, m = (int(v) for v in np.unravel_index(np.argmax(net_value), net_value.shape))
+        best_value = float(net_value[c, m])
+        global_mask = int(global_masks[m])
+
+        chosen = []
+        for i in reversed(range(len(list_order_name))):
+            if choice[i, c, m] == 0:
+                continue
+            chosen.append(list_order_name[i])
+            if choice[i, c, m] == 2:
+                m ^= store_name2local_bit[
+                    self.data.order_name2data[list_order_name[i]].destination
+                ]
+            c -= list_weight_unit[i]
+        chosen = chosen[::-1]
+
+        # 訪問する店舗の荷物で、まだ積めるものは追加する
+        weight = sum(self.data.order_name2data[r].weight for r in chosen)
+        for r in sorted(
+            [r for r in list_deliverable_order_name if r not in chosen],
+            key=lambda r: -self.data.order_name2data[r].weight,
+        ):
+            order_data = self.data.order_name2data[r]
+            bit = 1 << self.route_table.store_name2bit[order_data.destination]
+            if global_mask & bit and weight + order_data.weight <= self.truck_capacity:
+                chosen.append(r)
+                weight += order_data.weight
+
+        return best_value, PatternData(
+            list_order_name=chosen,
+            route_data=self.route_table.get_route_data(global_mask),
+        )
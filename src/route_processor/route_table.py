@@ -0,0 +1,139 @@
+import numpy as np
+
+from optimize_dataclass.io_dataclass import InputData
+from optimize_dataclass.pattern_dataclass import RouteData
+
+# ルート表を作れる店舗数の上限（表の大きさは2^n×nで、20店舗で約200MBになる）
+MAX_ROUTE_TABLE_NUM_STORE = 20
+
+
+class RouteTable:
+    """
+    店舗の組合せごとの最短巡回ルート表
+    店舗の組合せはlist_store_nameの順番に対応するビットマスクで表す
+    """
+
+    def __init__(
+        self,
+        list_store_name: list[str],
+        move_time: np.ndarray,
+        last_store: np.ndarray,
+        predecessor: np.ndarray,
+    ):
+        self.list_store_name = list_store_name  # ビットの順番に対応する店舗名のリスト
+        self.store_name2bit = {s: i for i, s in enumerate(list_store_name)}
+        self.move_time = move_time  # 組合せごとの最短巡回時間 (2^n,)
+        self.last_store = last_store  # 組合せごとのデポに戻る直前の店舗 (2^n,)
+        self.predecessor = predecessor  # 組合せと最後の店舗ごとの直前の店舗 (2^n, n)
+
+    @property
+    def num_store(self) -> int:
+        return len(self.list_store_name)
+
+    def get_mask(self, list_store_name: list[str]) -> int:
+        """
+        店舗名のリストをビットマスクに変換する
+        """
+        mask = 0
+        for s in list_store_name:
+            mask |= 1 << self.store_name2bit[s]
+        return mask
+
+    def get_list_store_name(self, mask: int) -> list[str]:
+        """
+        ビットマスクを店舗名のリストに変換する
+        """
+        return [s for i, s in enumerate(self.list_store_name) if mask >> i & 1]
+
+    def get_route(self, mask: int) -> list[str]:
+        """
+        組合せの最短巡回ルートにおける店舗の訪問順
+        """
+        route = []
+        last = int(self.last_store[mask])
+        while mask:
+            route.append(self.list_store_name[last])
+            prev = int(self.predecessor[mask, last])
+            mask ^= 1 << last
+            last = prev
+        return route[::-1]
+
+    def get_route_data(self, mask: int) -> RouteData:
+        return RouteData(
+            list_store_name=self.get_route(mask),
+            move_time=float(self.move_time[mask]),
+        )
+
+    def get_feasible_masks(self, max_move_time: float) -> np.ndarray:
+        """
+        移動時間がmax_move_time以内の組合せのビットマスク
+        """
+        return np.flatnonzero(self.move_time <= max_move_time)
+
+
+def make_move_time_array(input_data: InputData, list_location_name: list[str]):
+    """
+    地点名のリストの順番に対応する移動時間の行列
+    """
+    index = [input_data.location_name2index[k] for k in list_location_name]
+    return input_data.move_time_array[np.ix_(index, index)]
+
+
+def satisfies_triangle_inequality(
+    move_time: np.ndarray, tolerance: float = 1e-9
+) -> bool:
+    """
+    移動時間の行列が三角不等式 move_time[k1, k3] <= move_time[k1, k2] + move_time[k2, k3] を満たすか
+    （満たさない場合、店舗を経由すると近道になるため、訪問する店舗を増やしても移動時間が減りうる）
+    """
+    return all(
+        np.all(move_time <= move_time[:, [k]] + move_time[[k], :] + tolerance)
+        for k in range(len(move_time))
+    )
+
+
+def compute_route_table(input_data: InputData) -> RouteTable:
+    """
+    ビットマスクによる動的計画法 (Held-Karp) で全ての店舗の組合せの最短巡回ルートを求める
+    計算量は O(2^n n^2)、必要なメモリは O(2^n n) のため、店舗数が上限を超える場合はエラーとする
+    """
+    list_store_name = list(input_data.list_store_name)
+    n = len(list_store_name)
+    if n > MAX_ROUTE_TABLE_NUM_STORE:
+        raise ValueError(
+            f"店舗数が{n}で、ルート表を作れる店舗数の上限{MAX_ROUTE_TABLE_NUM_STORE}を超えています"
+        )
+    t = make_move_time_array(input_data, [input_data.depot_data.name] + list_store_name)
+    t_depot_to_store = t[0, 1:]
+    t_store_to_depot = t[1:, 0]
+    t_store_to_store = t[1:, 1:]
+
+    # dp[mask, j]: デポを出発してmaskの店舗を全て訪問し、店舗jにいる最短時間
+    dp = np.full((1 << n, n), np.inf)
+    predecessor = np.full((1 << n, n), -1, dtype=np.int8)
+    bits = 1 << np.arange(n)
+    dp[bits, np.arange(n)] = t_depot_to_store
+
+    masks = np.arange(1 << n)
+    popcount = np.zeros(1 << n, dtype=np.int64)
+    for i in range(n):
+        popcount += (masks >> i) & 1
+
+    # 訪問店舗数の少ない組合せから順に、最後の店舗ごとにまとめて更新
+    for m in range(2, n + 1):
+        layer = masks[popcount == m]
+        for k in range(n):
+            tar = layer[(layer >> k) & 1 == 1]
+            cand = dp[tar ^ (1 << k)] + t_store_to_store[:, k]
+            best = np.argmin(cand, axis=1)
+            dp[tar, k] = cand[np.arange(len(tar)), best]
+            predecessor[tar, k] = best
+
+    tour = dp + t_store_to_depot
+    last_store = np.full(1 << n, -1, dtype=np.int8)
+    move_time = np.zeros(1 << n)
+    if n > 0:
+        last_store[1:] = np.argmin(tour[1:], axis=1)
+        move_time[1:] = tour[masks[1:], last_store[1:]]
+
+    return RouteTable(list_store_name, move_time, last_store, predecessor)
@@ -0,0 +1,134 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from consts import ROOT
+from optimize_dataclass.io_dataclass import InputData
+from route_processor.route_table import (
+    RouteTable,
+    compute_route_table,
+    make_move_time_array,
+)
+
+ROUTE_TABLE_CACHE_DIR = ROOT / "data" / "cache" / "route_table"
+MAX_CACHE_BYTES = 512 * 1024**2  # キャッシュディレクトリの最大サイズ
+# 書き込み中の一時ファイルの拡張子（削除の対象にしないように.npzとは別にする）
+TMP_SUFFIX = ".tmp"
+
+
+def get_route_table_fingerprint(input_data: InputData) -> str:
+    """
+    地点の集合と移動時間行列から、ルート表を識別するハッシュ値を計算する
+    """
+    list_location_name = [input_data.depot_data.name] + list(input_data.list_store_name)
+    h = hashlib.sha256()
+    h.update("\n".join(list_location_name).encode())
+    h.update(make_move_time_array(input_data, list_location_name).tobytes())
+    return h.hexdigest()
+
+
+def load_route_table(
+    fingerprint: str, cache_dir: Path = ROUTE_TABLE_CACHE_DIR
+) -> RouteTable | None:
+    """
+    キャッシュからルート表を読み込む。キャッシュが存在しない場合はNoneを返す
+    """
+    path = cache_dir / f"{fingerprint}.npz"
+    # 他のプロセスが削除した場合も、キャッシュがないものとして扱う
+    try:
+        with np.load(path, allow_pickle=False) as f:
+            route_table = RouteTable(
+                list_store_name=f["list_store_name"].tolist(),
+                move_time=f["move_time"],
+                last_store=f["last_store"],
+                predecessor=f["predecessor"],
+            )
+        # 最終利用時刻を更新して、古いものから削除されるようにする
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return route_table
+
+
+def save_route_table(
+    route_table: RouteTable,
+    fingerprint: str,
+    cache_dir: Path = ROUTE_TABLE_CACHE_DIR,
+    max_cache_bytes: int = MAX_CACHE_BYTES,
+):
+    """
+    ルート表をキャッシュに保存し、上限サイズを超えた分を削除する
+    ポートフォリオなどで複数のプロセスが同時に保存しても壊れないように、
+    プロセスごとに異なる一時ファイルに書き込んでから名前を変える
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"{fingerprint}.npz"
+    with tempfile.NamedTemporaryFile(
+        dir=cache_dir, prefix=f"{fingerprint}.", suffix=TMP_SUFFIX, delete=False
+    ) as f:
+        np.savez(
+            f,
+            list_store_name=np.array(route_table.list_store_name, dtype=str),
+            move_time=route_table.move_time,
+            last_store=route_table.last_store,
+            predecessor=route_table.predecessor,
+        )
+    os.replace(f.name, path)
+    evict_route_table_cache(cache_dir, max_cache_bytes, keep=[path])
+
+
+def evict_route_table_cache(
+    cache_dir: Path = ROUTE_TABLE_CACHE_DIR,
+    max_cache_bytes: int = MAX_CACHE_BYTES,
+    keep: list[Path] | None = None,
+):
+    """
+    キャッシュの合計サイズがmax_cache_bytes以下になるまで、最終利用時刻の古いものから削除する
+    他のプロセスが同時に削除したファイルは無視する
+    """
+    keep = keep or []
+    path2stat = {}
+    for path in cache_dir.glob("*.npz"):
+        try:
+            path2stat[path] = path.stat()
+        except FileNotFoundError:
+            continue
+    list_path = sorted(path2stat, key=lambda p: path2stat[p].st_mtime)
+    total_bytes = sum(stat.st_size for stat in path2stat.values())
+    for path in list_path:
+        if total_bytes <= max_cache_bytes:
+            break
+        if path in keep:
+            continue
+        total_bytes -= path2stat[path].st_size
+        path.unlink(missing_ok=True)
+
+
+def clear_route_table_cache(
+    cache_dir: Path = ROUTE_TABLE_CACHE_DIR, fingerprint: str | None = None
+):
+    """
+    キャッシュを削除する。fingerprintを指定した場合はそのルート表のみ削除する
+    書き込み中の一時ファイルは削除しない
+    """
+    pattern = "*.npz" if fingerprint is None else f"{fingerprint}.npz"
+    for path in cache_dir.glob(pattern):
+        path.unlink(missing_ok=True)
+
+
+def get_route_table(input_data: InputData, use_cache: bool = True) -> RouteTable:
+    """
+    ルート表を取得する。use_cacheがTrueの場合はキャッシュを利用し、なければ計算して保存する
+    """
+    if not use_cache:
+        return compute_route_table(input_data)
+
+    fingerprint = get_route_table_fingerprint(input_data)
+    route_table = load_route_table(fingerprint)
+    if route_table is None:
+        route_table = compute_route_table(input_data)
+        save_route_table(route_table, fingerprint)
+    return route_table
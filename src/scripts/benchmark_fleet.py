@@ -0,0 +1,78 @@
+import time
+
+import polars as pl
+
+from data_processor.make_input_data import make_input_data
+from models.fleet_model import FleetModel
+from optimize_dataclass.config_dataclass import VehicleTypeData
+from scripts.benchmark_utils import make_benchmark_config
+
+
+def main(
+    list_dataset_name: list[str],
+    name2list_vehicle_type: dict[str, list[VehicleTypeData]],
+    time_limit: int,
+):
+    """
+    車種と台数ごとに、モデルの大きさ（変数の数）、構築時間、求解時間、総費用を比較する
+    台数は整数変数の上限にしか現れないため、台数を増やしても変数の数は変わらない
+    """
+    rows = []
+    for dataset_name in list_dataset_name:
+        input_data = make_input_data(dataset_name)
+        for fleet_name, list_vehicle_type in name2list_vehicle_type.items():
+            config_data = make_benchmark_config(
+                dataset_name,
+                solver_model_type="fleet_model",
+                time_limit=time_limit,
+                list_vehicle_type=list_vehicle_type,
+            )
+            model = FleetModel(input_data, config_data)
+            start_time = time.perf_counter()
+            model.add_variables().add_constraints().add_objectives()
+            build_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            status = model.optimize()
+            solve_time = time.perf_counter() - start_time
+
+            output_data = model.get_result()
+            rows.append(
+                {
+                    "dataset_name": dataset_name,
+                    "fleet": fleet_name,
+                    "num_variable": len(list(model.model.variables())),
+                    "status": status,
+                    "build_time": build_time,
+                    "solve_time": solve_time,
+                    "total_cost": output_data.total_cost,
+                    "total_vehicle_cost": output_data.total_vehicle_cost,
+                    "max_num_vehicle": max(
+                        len(daily_data.list_vehicle_route)
+                        for daily_data in output_data.date2daily_data.values()
+                    ),
+                }
+            )
+
+    with pl.Config(tbl_cols=-1, tbl_rows=-1, tbl_width_chars=250):
+        print(pl.DataFrame(rows))
+
+
+if __name__ == "__main__":
+    main(
+        ["small_dataset", "medium_dataset"],
+        {
+            "4t x 1": [VehicleTypeData(name="4t", count=1, capacity=4000.0)],
+            "4t x 2": [
+                VehicleTypeData(name="4t", count=2, capacity=4000.0, fixed_cost=5000.0)
+            ],
+            "4t x 5": [
+                VehicleTypeData(name="4t", count=5, capacity=4000.0, fixed_cost=5000.0)
+            ],
+            "4t x 2 + 2t x 3": [
+                VehicleTypeData(name="4t", count=2, capacity=4000.0, fixed_cost=5000.0),
+                VehicleTypeData(name="2t", count=3, capacity=2000.0, fixed_cost=3000.0),
+            ],
+        },
+        time_limit=60,
+    )
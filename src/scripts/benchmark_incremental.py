@@ -0,0 +1,112 @@
+import time
+
+import polars as pl
+
+from data_processor.make_input_data import make_input_data
+from execute_model import execute_model
+from models.incremental_naive_model import IncrementalNaiveModel
+from models.naive_model import NaiveModel
+from optimize_dataclass.io_dataclass import InputData, OrderData
+from scripts.benchmark_utils import make_benchmark_config
+
+
+def make_changed_input_data(
+    input_data: InputData, list_cancel: list[str], list_order_data: list[OrderData]
+) -> InputData:
+    """
+    荷物を取り消し、追加・変更した入力データ
+    """
+    order_name2data = dict(input_data.order_name2data)
+    for order_name in list_cancel:
+        del order_name2data[order_name]
+    for order_data in list_order_data:
+        order_name2data[order_data.name] = order_data
+    return input_data.model_copy(
+        update={
+            "list_order_name": list(order_name2data),
+            "order_name2data": order_name2data,
+        }
+    )
+
+
+def main(list_dataset_name: list[str], time_limit: int):
+    """
+    荷物の追加・取消・変更を、モデルを作り直して解く場合と、
+    構築済みのモデルに差分として反映して前回の解を初期解に解き直す場合で比較する
+    """
+    rows = []
+    for dataset_name in list_dataset_name:
+        input_data = make_input_data(dataset_name)
+        config_data = make_benchmark_config(
+            dataset_name, solver_model_type="naive_model", time_limit=time_limit
+        )
+        prior_output_data = execute_model(
+            input_data,
+            make_benchmark_config(dataset_name, solver_model_type="heuristic_model"),
+        )
+
+        # 先頭の荷物を取り消し、2番目の荷物の重量を半分にし、先頭の荷物と同じ店舗への荷物を追加
+        first_order_data, second_order_data = [
+            input_data.order_name2data[r] for r in input_data.list_order_name[:2]
+        ]
+        list_cancel = [first_order_data.name]
+        list_order_data = [
+            second_order_data.model_copy(
+                update={"weight": second_order_data.weight / 2}
+            ),
+            first_order_data.model_copy(update={"name": "new_order"}),
+        ]
+
+        # モデルを作り直す
+        start_time = time.perf_counter()
+        model = NaiveModel(
+            make_changed_input_data(input_data, list_cancel, list_order_data),
+            config_data,
+            prior_output_data,
+        )
+        model.add_variables().add_constraints().add_objectives()
+        update_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        status = model.optimize()
+        solve_time = time.perf_counter() - start_time
+        rows.append(
+            {
+                "dataset_name": dataset_name,
+                "method": "rebuild",
+                "status": status,
+                "update_time": update_time,
+                "solve_time": solve_time,
+                "total_cost": model.get_result().total_cost,
+            }
+        )
+
+        # 構築済みのモデルに差分を反映する
+        model = IncrementalNaiveModel(input_data, config_data, prior_output_data)
+        model.add_variables().add_constraints().add_objectives()
+        model.optimize()
+        start_time = time.perf_counter()
+        for order_name in list_cancel:
+            model.cancel_order(order_name)
+        model.update_order(list_order_data[0])
+        model.add_order(list_order_data[1])
+        update_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        status = model.optimize()
+        solve_time = time.perf_counter() - start_time
+        rows.append(
+            {
+                "dataset_name": dataset_name,
+                "method": "incremental",
+                "status": status,
+                "update_time": update_time,
+                "solve_time": solve_time,
+                "total_cost": model.get_result().total_cost,
+            }
+        )
+
+    with pl.Config(tbl_cols=-1, tbl_rows=-1, tbl_width_chars=250):
+        print(pl.DataFrame(rows))
+
+
+if __name__ == "__main__":
+    main(["small_dataset", "medium_dataset"], time_limit=60)
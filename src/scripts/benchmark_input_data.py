@@ -0,0 +1,69 @@
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import polars as pl
+
+from data_processor.loader import read_workbook
+from data_processor.make_input_data import build_input_data
+from models.heuristic_model import HeuristicModel
+from scripts.benchmark_loader import make_synthetic_workbook
+from scripts.benchmark_utils import make_benchmark_config
+
+
+def measure_build(list_df: tuple[pl.DataFrame, ...], use_order_table: bool) -> dict:
+    """
+    入力データの作成時間と、作成中のPythonのメモリ使用量の最大値
+    続けて、モデルが荷物の配列を作る時間と、全ての配送注文データを参照する時間も測る
+    """
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    input_data = build_input_data(*list_df, use_order_table=use_order_table)
+    build_time = time.perf_counter() - start_time
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start_time = time.perf_counter()
+    HeuristicModel(input_data, make_benchmark_config("synthetic"))
+    model_init_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for r in input_data.list_order_name:
+        # 配送注文データを遅延して作る場合はその作成時間も含めて測るため、値は使わずに参照だけする
+        _ = input_data.order_name2data[r].weight
+    access_time = time.perf_counter() - start_time
+    return {
+        "build_time": build_time,
+        "peak_memory_mb": peak_memory / 1024**2,
+        "model_init_time": model_init_time,
+        "access_all_time": access_time,
+    }
+
+
+def main(list_num_order: list[int]):
+    """
+    荷物ごとに配送注文データを作る入力データと、配送注文を列ごとの配列で持つ入力データの
+    作成時間とメモリ使用量を比較する
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_order in list_num_order:
+            filepath = Path(tmp_dir) / f"synthetic_{num_order}.xlsx"
+            make_synthetic_workbook(filepath, num_order)
+            list_df = read_workbook(filepath)
+            for use_order_table in [False, True]:
+                rows.append(
+                    {
+                        "num_order": num_order,
+                        "use_order_table": use_order_table,
+                        **measure_build(list_df, use_order_table),
+                    }
+                )
+
+    with pl.Config(tbl_cols=-1, tbl_rows=-1, tbl_width_chars=250):
+        print(pl.DataFrame(rows))
+
+
+if __name__ == "__main__":
+    main([10_000, 100_000])
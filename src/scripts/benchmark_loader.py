@@ -0,0 +1,151 @@
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+from xlsxwriter import Workbook
+
+from consts import ROOT
+from data_processor.loader import (
+    load_distances_mst,
+    load_locations_mst,
+    load_orders,
+    load_workbook,
+)
+from data_processor.schema import DistanceSchema, LocationsSchema, OrdersSchema
+
+
+def load_with_read_excel(filepath: Path):
+    """
+    変更前の読み込み方法（シートごとにpl.read_excelで開き直し、読み込んだ後に型を変換して検証する）
+    """
+    df_locations = pl.read_excel(filepath, sheet_name="locations_mst").with_columns(
+        pl.col("x_cord").cast(pl.Float64),
+        pl.col("y_cord").cast(pl.Float64),
+    )
+    df_distances = pl.read_excel(filepath, sheet_name="distances_mst").with_columns(
+        pl.col("time_to_move").cast(pl.Float64)
+    )
+    df_orders = pl.read_excel(filepath, sheet_name="orders").with_columns(
+        pl.col("weight").cast(pl.Float64)
+    )
+    return (
+        LocationsSchema.validate(df_locations),
+        DistanceSchema.validate(df_distances),
+        OrdersSchema.validate(df_orders),
+    )
+
+
+def load_by_sheet(filepath: Path):
+    """
+    シートごとにワークブックを開き直して読み込む
+    """
+    return (
+        load_locations_mst(filepath),
+        load_distances_mst(filepath),
+        load_orders(filepath),
+    )
+
+
+def make_synthetic_workbook(
+    filepath: Path,
+    num_order: int,
+    num_store: int = 50,
+    num_date: int = 20,
+    seed: int = 0,
+):
+    """
+    入力データと同じシート構成で、荷物数を指定した人工データのワークブックを作る
+    """
+    rng = np.random.default_rng(seed)
+    list_location = ["p"] + [f"s{i}" for i in range(num_store)]
+    x_cord = np.concatenate([[0.0], rng.uniform(-10, 10, num_store)])
+    y_cord = np.concatenate([[0.0], rng.uniform(-10, 10, num_store)])
+    df_locations = pl.DataFrame(
+        {
+            "location": list_location,
+            "x_cord": x_cord,
+            "y_cord": y_cord,
+            "is_depot": [1] + [0] * num_store,
+        }
+    )
+    distance = np.hypot(
+        x_cord[:, None] - x_cord[None, :], y_cord[:, None] - y_cord[None, :]
+    )
+    df_distances = pl.DataFrame(
+        {
+            "location1": np.repeat(list_location, len(list_location)),
+            "location2": np.tile(list_location, len(list_location)),
+            "time_to_move": distance.ravel(),
+        }
+    )
+    time_window_start = rng.integers(1, num_date + 1, num_order)
+    df_orders = pl.DataFrame(
+        {
+            "order": [f"r{i:06d}" for i in range(num_order)],
+            "store": rng.choice(list_location[1:], num_order),
+            "weight": rng.integers(1, 20, num_order) * 50.0,
+            "time_window_start": time_window_start,
+            "time_window_end": np.minimum(
+                time_window_start + rng.integers(0, 5, num_order), num_date
+            ),
+        }
+    )
+    with Workbook(filepath) as wb:
+        df_locations.write_excel(workbook=wb, worksheet="locations_mst")
+        df_distances.write_excel(workbook=wb, worksheet="distances_mst")
+        df_orders.write_excel(workbook=wb, worksheet="orders")
+
+
+def measure_load_time(filepath: Path, num_repeat: int) -> dict:
+    """
+    読み込み方法ごとの読み込み時間（num_repeat回の最小値）
+    """
+    method_name2load = {
+        "read_excel_x3": load_with_read_excel,
+        "by_sheet_x3": load_by_sheet,
+        "workbook": load_workbook,
+    }
+    ret = {}
+    for method_name, load in method_name2load.items():
+        list_time = []
+        for _ in range(num_repeat):
+            start_time = time.perf_counter()
+            load(filepath)
+            list_time.append(time.perf_counter() - start_time)
+        ret[method_name] = min(list_time)
+    return ret
+
+
+def main(list_dataset_name: list[str], list_num_order: list[int], num_repeat: int):
+    """
+    シートごとにワークブックを開き直す読み込みと、一度だけ開く読み込みの時間を比較する
+    """
+    rows = []
+    for dataset_name in list_dataset_name:
+        rows.append(
+            {
+                "dataset_name": dataset_name,
+                **measure_load_time(
+                    ROOT / "data" / "raw" / f"{dataset_name}.xlsx", num_repeat
+                ),
+            }
+        )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_order in list_num_order:
+            filepath = Path(tmp_dir) / f"synthetic_{num_order}.xlsx"
+            make_synthetic_workbook(filepath, num_order)
+            rows.append(
+                {
+                    "dataset_name": f"synthetic_{num_order}",
+                    **measure_load_time(filepath, num_repeat),
+                }
+            )
+
+    with pl.Config(tbl_cols=-1, tbl_rows=-1, tbl_width_chars=250):
+        print(pl.DataFrame(rows))
+
+
+if __name__ == "__main__":
+    main(["small_dataset", "medium_dataset"], [100_000], num_repeat=3)
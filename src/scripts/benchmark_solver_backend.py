@@ -0,0 +1,47 @@
+import polars as pl
+
+from data_processor.make_input_data import make_input_data
+from scripts.benchmark_utils import make_benchmark_config, run_benchmark
+
+
+def main(
+    list_dataset_name: list[str],
+    list_solver_model_type: list[str],
+    list_solver_backend: list[str],
+    time_limit: int,
+):
+    """
+    MIPソルバーごとに、モデルの求解時間と求解後の上下界を比較する
+    最初の暫定解が得られるまでの時間はSCIPのログからのみ求めるため、GSCIP以外では空になる
+    """
+    rows = []
+    for dataset_name in list_dataset_name:
+        input_data = make_input_data(dataset_name)
+        for solver_model_type in list_solver_model_type:
+            for solver_backend in list_solver_backend:
+                config_data = make_benchmark_config(
+                    dataset_name,
+                    solver_model_type=solver_model_type,
+                    solver_backend=solver_backend,
+                    time_limit=time_limit,
+                )
+                rows.append(
+                    {
+                        "dataset_name": dataset_name,
+                        "solver_model_type": solver_model_type,
+                        "solver_backend": solver_backend,
+                        **run_benchmark(input_data, config_data),
+                    }
+                )
+
+    with pl.Config(tbl_cols=-1, tbl_rows=-1, tbl_width_chars=250):
+        print(pl.DataFrame(rows))
+
+
+if __name__ == "__main__":
+    main(
+        ["small_dataset", "medium_dataset"],
+        ["naive_model", "set_cover_model"],
+        ["gscip", "highs", "cp_sat"],
+        time_limit=60,
+    )
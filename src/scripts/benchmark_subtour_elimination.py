@@ -0,0 +1,34 @@
+import polars as pl
+
+from data_processor.make_input_data import make_input_data
+from scripts.benchmark_utils import make_benchmark_config, run_benchmark
+
+
+def main(list_dataset_name: list[str], time_limit: int):
+    """
+    素朴なモデルの部分巡回路除去の定式化ごとに、LP緩和の下界と求解時間を比較する
+    """
+    rows = []
+    for dataset_name in list_dataset_name:
+        input_data = make_input_data(dataset_name)
+        for subtour_elimination_type in ["mtz", "flow", "lazy"]:
+            config_data = make_benchmark_config(
+                dataset_name,
+                solver_model_type="naive_model",
+                time_limit=time_limit,
+                subtour_elimination_type=subtour_elimination_type,
+            )
+            rows.append(
+                {
+                    "dataset_name": dataset_name,
+                    "subtour_elimination_type": subtour_elimination_type,
+                    **run_benchmark(input_data, config_data),
+                }
+            )
+
+    with pl.Config(tbl_cols=-1, tbl_width_chars=200):
+        print(pl.DataFrame(rows))
+
+
+if __name__ == "__main__":
+    main(["small_dataset", "medium_dataset"], time_limit=60)
@@ -0,0 +1,121 @@
+import re
+import time
+
+from ortools.math_opt.python import mathopt
+
+from execute_model import solver_model_name2model_class
+from optimize_dataclass.config_dataclass import (
+    ConfigData,
+    ConstraintData,
+    ObjectiveData,
+)
+from optimize_dataclass.io_dataclass import InputData, OutputData
+
+
+def make_benchmark_config(dataset_name: str, **kwargs) -> ConfigData:
+    """
+    ベンチマーク用の設定データ（run_optimize.pyと同じ設定で、ソルバーのログは出力しない）
+    """
+    params = {
+        "dataset_name": dataset_name,
+        "time_limit": 60,
+        "threads": 4,
+        "enable_solver_output": False,
+        "standartd_work_time": 8.0,
+        "max_overtime": 3.0,
+        "overtime_cost_per_hour": 3000.0,
+        "outsourcing_cost_per_weight": 46.0,
+        "truck_capacity": 4000.0,
+        "total_move_time_objective": ObjectiveData(priority=1, direction="minimize"),
+        "total_cost_objective": ObjectiveData(priority=2, direction="minimize"),
+        "max_overtime_constraint": ConstraintData(is_applied=True),
+        "truck_capacity_constraint": ConstraintData(is_applied=True),
+    }
+    params.update(kwargs)
+    return ConfigData(**params)
+
+
+def compute_lp_relaxation_bound(model: mathopt.Model) -> float:
+    """
+    整数条件を緩和したLPの最適値
+    """
+    lp_model = mathopt.Model.from_model_proto(model.export_model())
+    for var in lp_model.variables():
+        var.integer = False
+    result = mathopt.solve(lp_model, mathopt.SolverType.GLOP)
+    return result.objective_value()
+
+
+def parse_scip_primal_progress(list_line: list[str]) -> list[tuple[float, float]]:
+    """
+    SCIPのログから、経過時間（秒）と暫定解の目的関数値の推移を取り出す
+    表の列構成は並列計算の有無で変わるため、見出し行からprimalboundの列を探す
+    表の出力前に初期解（ヒント）が受理された場合は経過時間0とする
+    """
+    progress = []
+    primal_bound_index = None
+    current_time = 0.0
+    for line in list_line:
+        match = re.search(r"new primal bound ([-+\d.eE]+)", line)
+        if match is not None:
+            progress.append((current_time, float(match.group(1))))
+            continue
+        fields = [field.strip() for field in line.split("|")]
+        if "primalbound" in fields:
+            primal_bound_index = fields.index("primalbound")
+            continue
+        match = re.fullmatch(r"\S?\s*([\d.]+)s", fields[0])
+        if match is None or primal_bound_index is None:
+            continue
+        current_time = float(match.group(1))
+        try:
+            progress.append((current_time, float(fields[primal_bound_index])))
+        except (IndexError, ValueError):
+            continue
+    return progress
+
+
+def run_benchmark(
+    input_data: InputData,
+    config_data: ConfigData,
+    prior_output_data: OutputData | None = None,
+    target_cost: float | None = None,
+) -> dict:
+    """
+    モデルの構築時間、求解時間、LP緩和の下界、求解後の上下界、
+    最初の暫定解と目的関数値がtarget_cost以下の暫定解が得られるまでの時間を計測する
+    """
+    model = solver_model_name2model_class[config_data.solver_model_type](
+        input_data, config_data, prior_output_data
+    )
+    list_line = []
+    model.message_callback = list_line.extend
+    start_time = time.perf_counter()
+    model.add_variables().add_constraints().add_objectives()
+    build_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    status = model.optimize()
+    solve_time = time.perf_counter() - start_time
+
+    objective_bounds = model.result.termination.objective_bounds
+    primal_bound = objective_bounds.primal_bound
+    dual_bound = objective_bounds.dual_bound
+    progress = parse_scip_primal_progress(list_line)
+    return {
+        "status": status,
+        "build_time": build_time,
+        "solve_time": solve_time,
+        "time_to_first_feasible": progress[0][0] if progress else None,
+        "time_to_target_cost": next(
+            (t for t, bound in progress if bound <= target_cost * (1 + 1e-6)), None
+        )
+        if target_cost is not None
+        else None,
+        "lp_bound": compute_lp_relaxation_bound(model.model),
+        "primal_bound": primal_bound,
+        "dual_bound": dual_bound,
+        "gap": (primal_bound - dual_bound) / abs(primal_bound)
+        if primal_bound not in [0, float("inf")]
+        else None,
+    }
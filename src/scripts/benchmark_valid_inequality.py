@@ -0,0 +1,74 @@
+import polars as pl
+
+from data_processor.make_input_data import make_input_data
+from optimize_dataclass.config_dataclass import ConstraintData
+from optimize_dataclass.io_dataclass import InputData
+from scripts.benchmark_utils import make_benchmark_config, run_benchmark
+
+list_valid_inequality_name = [
+    "day_symmetry_constraint",
+    "knapsack_cover_constraint",
+    "store_capacity_linking_constraint",
+    "tour_lower_bound_constraint",
+]
+
+
+def make_wide_time_window_input_data(input_data: InputData) -> InputData:
+    """
+    全ての荷物の指定配送期間を計画期間全体に広げた入力データ（全ての配送日が入れ替え可能になる）
+    """
+    start, end = min(input_data.list_delivery_date), max(input_data.list_delivery_date)
+    return input_data.model_copy(
+        update={
+            "order_name2data": {
+                r: order_data.model_copy(
+                    update={"time_window_start": start, "time_window_end": end}
+                )
+                for r, order_data in input_data.order_name2data.items()
+            }
+        }
+    )
+
+
+def main(list_dataset_name: list[str], time_limit: int):
+    """
+    妥当不等式を1つずつ、および全て加えた素朴なモデルで、LP緩和の下界と求解時間、求解後の上下界を比較する
+    配送日間の対称性除去は、指定配送期間を広げて全ての配送日が入れ替え可能な入力データでも比較する
+    """
+    name2list_applied = {
+        "none": [],
+        **{name: [name] for name in list_valid_inequality_name},
+        "all": list_valid_inequality_name,
+    }
+    rows = []
+    for dataset_name in list_dataset_name:
+        input_data = make_input_data(dataset_name)
+        for instance_name, tar_input_data in [
+            ("original", input_data),
+            ("wide_time_window", make_wide_time_window_input_data(input_data)),
+        ]:
+            for name, list_applied in name2list_applied.items():
+                config_data = make_benchmark_config(
+                    dataset_name,
+                    solver_model_type="naive_model",
+                    time_limit=time_limit,
+                    **{
+                        f: ConstraintData(is_applied=f in list_applied)
+                        for f in list_valid_inequality_name
+                    },
+                )
+                rows.append(
+                    {
+                        "dataset_name": dataset_name,
+                        "instance": instance_name,
+                        "valid_inequality": name,
+                        **run_benchmark(tar_input_data, config_data),
+                    }
+                )
+
+    with pl.Config(tbl_cols=-1, tbl_rows=-1, tbl_width_chars=250):
+        print(pl.DataFrame(rows))
+
+
+if __name__ == "__main__":
+    main(["small_dataset", "medium_dataset"], time_limit=60)
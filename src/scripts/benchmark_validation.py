@@ -0,0 +1,94 @@
+import tempfile
+import time
+from pathlib import Path
+
+import polars as pl
+
+from data_processor.input_cache import (
+    INPUT_CACHE_DIR,
+    VALIDATION_STAMP_FILE_NAME,
+    get_input_cache_fingerprint,
+    get_list_source_path,
+    load_dataset,
+)
+from data_processor.loader import read_workbook, validate_dataset
+from scripts.benchmark_loader import make_synthetic_workbook
+
+
+def measure_validation_time(
+    list_df: tuple[pl.DataFrame, ...], sample_size: int
+) -> list[dict]:
+    """
+    検証方法ごとの、スキーマごとの検証時間（秒）
+    """
+    rows = []
+    for validation_mode in ["full", "lazy", "sampled"]:
+        schema_name2validation_time = validate_dataset(
+            list_df, validation_mode, sample_size
+        )
+        rows.append(
+            {
+                "validation_mode": validation_mode,
+                **schema_name2validation_time,
+                "total": sum(schema_name2validation_time.values()),
+            }
+        )
+    return rows
+
+
+def measure_load_time(dataset_name: str) -> dict:
+    """
+    キャッシュから読み込むときの、検証済みの記録がない場合とある場合の読み込み時間（秒）
+    """
+    load_dataset(dataset_name)
+    stamp_path = (
+        INPUT_CACHE_DIR
+        / get_input_cache_fingerprint(get_list_source_path(dataset_name))
+        / VALIDATION_STAMP_FILE_NAME
+    )
+    stamp_path.unlink()
+    start_time = time.perf_counter()
+    load_dataset(dataset_name)
+    revalidate_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    load_dataset(dataset_name)
+    stamped_time = time.perf_counter() - start_time
+    return {"revalidate": revalidate_time, "stamped": stamped_time}
+
+
+def main(
+    list_dataset_name: list[str],
+    list_num_order: list[int],
+    num_store: int,
+    sample_size: int,
+):
+    """
+    スキーマごとの検証時間を検証方法ごとに比較し、検証済みの記録による検証の省略の効果を測る
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_order in list_num_order:
+            filepath = Path(tmp_dir) / f"synthetic_{num_order}.xlsx"
+            make_synthetic_workbook(filepath, num_order, num_store=num_store)
+            list_df = read_workbook(filepath)
+            for row in measure_validation_time(list_df, sample_size):
+                rows.append({"dataset_name": f"synthetic_{num_order}", **row})
+    with pl.Config(tbl_cols=-1, tbl_rows=-1, tbl_width_chars=250):
+        print(pl.DataFrame(rows))
+
+    rows = [
+        {"dataset_name": dataset_name, **measure_load_time(dataset_name)}
+        for dataset_name in list_dataset_name
+    ]
+    with pl.Config(tbl_cols=-1, tbl_rows=-1, tbl_width_chars=250):
+        print(pl.DataFrame(rows))
+
+
+if __name__ == "__main__":
+    main(
+        ["small_dataset", "medium_dataset"],
+        [10_000, 100_000],
+        num_store=300,
+        sample_size=10_000,
+    )
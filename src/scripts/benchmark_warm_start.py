@@ -0,0 +1,51 @@
+import polars as pl
+
+from data_processor.make_input_data import make_input_data
+from execute_model import execute_model
+from scripts.benchmark_utils import make_benchmark_config, run_benchmark
+
+
+def main(
+    list_dataset_name: list[str], list_solver_model_type: list[str], time_limit: int
+):
+    """
+    発見的解法の解を初期解として与えた場合と与えない場合で、最初の暫定解と
+    発見的解法の解以上の暫定解が得られるまでの時間、最終的なギャップを比較する
+    """
+    rows = []
+    for dataset_name in list_dataset_name:
+        input_data = make_input_data(dataset_name)
+        prior_output_data = execute_model(
+            input_data,
+            make_benchmark_config(dataset_name, solver_model_type="heuristic_model"),
+        )
+        for solver_model_type in list_solver_model_type:
+            config_data = make_benchmark_config(
+                dataset_name, solver_model_type=solver_model_type, time_limit=time_limit
+            )
+            for warm_start in [False, True]:
+                rows.append(
+                    {
+                        "dataset_name": dataset_name,
+                        "solver_model_type": solver_model_type,
+                        "warm_start": warm_start,
+                        "heuristic_cost": prior_output_data.total_cost,
+                        **run_benchmark(
+                            input_data,
+                            config_data,
+                            prior_output_data if warm_start else None,
+                            target_cost=prior_output_data.total_cost,
+                        ),
+                    }
+                )
+
+    with pl.Config(tbl_cols=-1, tbl_rows=-1, tbl_width_chars=250):
+        print(pl.DataFrame(rows))
+
+
+if __name__ == "__main__":
+    main(
+        ["small_dataset", "medium_dataset"],
+        ["naive_model", "set_cover_model"],
+        time_limit=60,
+    )
@@ -0,0 +1,46 @@
+import pytest
+
+from data_processor.make_input_data import make_input_data
+from optimize_dataclass.config_dataclass import (
+    ConfigData,
+    ConstraintData,
+    ObjectiveData,
+)
+
+# 小規模データセットの最適値（総費用）
+SMALL_OPTIMAL_COST = 79249.22
+
+
+@pytest.fixture(scope="module")
+def small_input_data():
+    return make_input_data("small_dataset")
+
+
+@pytest.fixture(scope="session")
+def make_config():
+    """
+    小規模データセットを解く設定データを作る関数（キーワード引数で既定値を上書きする）
+    """
+
+    def _make_config(**kwargs) -> ConfigData:
+        params = {
+            "dataset_name": "small_dataset",
+            "time_limit": 30,
+            "threads": 1,
+            "enable_solver_output": False,
+            "standartd_work_time": 8.0,
+            "max_overtime": 3.0,
+            "overtime_cost_per_hour": 3000.0,
+            "outsourcing_cost_per_weight": 46.0,
+            "truck_capacity": 4000.0,
+            "total_move_time_objective": ObjectiveData(
+                priority=1, direction="minimize"
+            ),
+            "total_cost_objective": ObjectiveData(priority=2, direction="minimize"),
+            "max_overtime_constraint": ConstraintData(is_applied=True),
+            "truck_capacity_constraint": ConstraintData(is_applied=True),
+        }
+        params.update(kwargs)
+        return ConfigData(**params)
+
+    return _make_config
@@ -0,0 +1,27 @@
+import pytest
+from conftest import SMALL_OPTIMAL_COST
+
+from execute_model import execute_model
+
+
+def test_small_dataset(make_config, small_input_data):
+    """
+    列生成は価格付けで配送パターンが追加されなくなるまで反復し、
+    LP緩和の下界が最適値以下のまま、最適値の解が得られる
+    """
+    output_data = execute_model(
+        small_input_data, make_config(solver_model_type="column_generation_model")
+    )
+    assert output_data.total_cost == pytest.approx(SMALL_OPTIMAL_COST)
+
+    solve_info = output_data.solve_info
+    list_log = solve_info.list_column_generation_log
+    assert solve_info.num_pricing_round == len(list_log) > 1
+    assert [log.iteration for log in list_log] == list(range(1, len(list_log) + 1))
+    assert all(log.num_added_pattern > 0 for log in list_log[:-1])
+    assert list_log[-1].num_added_pattern == 0
+    for log in list_log:
+        assert log.lower_bound <= log.lp_objective + 1e-6
+        assert log.lower_bound <= output_data.total_cost + 1e-6
+    # 追加する配送パターンがなくなれば、LP緩和の目的関数値が下界になる
+    assert list_log[-1].lower_bound == pytest.approx(list_log[-1].lp_objective)
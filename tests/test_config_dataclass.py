@@ -0,0 +1,11 @@
+import pytest
+from pydantic import ValidationError
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"heuristic_num_start": 0}, {"lazy_round_time_limit": 0}],
+)
+def test_invalid_config(make_config, kwargs):
+    with pytest.raises(ValidationError):
+        make_config(**kwargs)
@@ -0,0 +1,109 @@
+import itertools
+
+import pytest
+
+from models.decomposition_model import DecompositionModel
+from route_processor.route_table import compute_route_table
+
+
+def test_solve_routes_in_parallel(make_config, small_input_data):
+    """
+    部分問題を並列に解いても、逐次に解いた場合と同じ最短巡回ルートが得られる
+    """
+    config = make_config(solver_model_type="decomposition_model")
+    list_store_set = [
+        frozenset(small_input_data.list_store_name[n : n + 3]) for n in range(4)
+    ]
+    serial_model = DecompositionModel(small_input_data, config)
+    serial_model._solve_routes(list_store_set)
+
+    parallel_model = DecompositionModel(
+        small_input_data, config.model_copy(update={"threads": 2})
+    )
+    # 並列に解く条件を満たすように、部分問題1つあたりの計算時間を大きくしておく
+    parallel_model.route_time_per_store_set = float("inf")
+    try:
+        assert parallel_model._solve_routes(list_store_set) == len(list_store_set)
+        assert parallel_model.executor is not None
+    finally:
+        parallel_model.executor.shutdown()
+    for store_set in list_store_set:
+        assert (
+            parallel_model.store_set2route_data[store_set]
+            == serial_model.store_set2route_data[store_set]
+        )
+
+
+def test_no_depot_move_time_on_days_without_visit(make_config, small_input_data):
+    """
+    店舗を訪問しない配送日は、デポの移動時間の下界が残業費用の下界に含まれない
+    """
+    config = make_config(
+        solver_model_type="decomposition_model",
+        standartd_work_time=0.0,
+    )
+    model = DecompositionModel(small_input_data, config)
+    model.add_variables().add_constraints().add_objectives()
+    d = small_input_data.list_delivery_date[0]
+    for s in model.date2list_store_name[d]:
+        model.z[d, s].upper_bound = 0
+    assert model.optimize() in ["Optimal", "Feasible"]
+    assert model.result.variable_values(model.theta[d]) == pytest.approx(0.0)
+
+
+def test_no_good_cuts_without_triangle_inequality(make_config, small_input_data):
+    """
+    移動時間が三角不等式を満たさない場合は、警告を出してno-goodカットのみで解き、
+    荷物の配送日の全ての組合せを列挙した場合と同じ最適値になる
+    """
+    move_time_array = small_input_data.move_time_array.copy()
+    depot = small_input_data.location_name2index[small_input_data.depot_data.name]
+    for s in small_input_data.list_store_name[:3]:
+        store = small_input_data.location_name2index[s]
+        move_time_array[depot, store] *= 10
+    input_data = small_input_data.model_copy(
+        update={"move_time_array": move_time_array}
+    )
+
+    with pytest.warns(UserWarning, match="三角不等式"):
+        model = DecompositionModel(
+            input_data, make_config(solver_model_type="decomposition_model")
+        )
+    assert not model.is_metric
+    model.add_variables().add_constraints().add_objectives()
+    assert model.optimize() == "Optimal"
+
+    # 荷物ごとに配送日（Noneは外注）を選ぶ全ての組合せの最小の目的関数値
+    route_table = compute_route_table(input_data)
+    list_order_name = input_data.list_order_name
+    min_objective_value = float("inf")
+    for list_date in itertools.product(
+        *[
+            [None] + [d for d in input_data.list_delivery_date if (d, r) in model.y]
+            for r in list_order_name
+        ]
+    ):
+        objective_value = sum(
+            model._get_outsourcing_cost(r)
+            for r, d in zip(list_order_name, list_date, strict=True)
+            if d is None
+        )
+        for d in input_data.list_delivery_date:
+            list_order = [
+                r for r, d2 in zip(list_order_name, list_date, strict=True) if d2 == d
+            ]
+            weight = sum(input_data.order_name2data[r].weight for r in list_order)
+            move_time = float(
+                route_table.move_time[
+                    route_table.get_mask(model._get_store_set(list_order))
+                ]
+            )
+            if (
+                weight > model.config.truck_capacity
+                or move_time > model._get_max_move_time()
+            ):
+                objective_value = float("inf")
+                break
+            objective_value += model._get_overtime_cost(move_time)
+        min_objective_value = min(min_objective_value, objective_value)
+    assert model.best_objective_value == pytest.approx(min_objective_value)
@@ -0,0 +1,100 @@
+import pytest
+from conftest import SMALL_OPTIMAL_COST
+
+import execute_model as execute_model_module
+from execute_model import execute_model
+from optimize_dataclass.config_dataclass import PortfolioMemberData, VehicleTypeData
+
+
+def test_rolling_horizon_totals(make_config, small_input_data, monkeypatch):
+    """
+    ローリングホライズンの総費用は、各区間で確定させた配送日の残業時間コストと車両の固定費用、
+    外注費用の合計になり、各区間には区間内の前回の最適化結果だけを渡す
+    """
+    config = make_config(
+        solver_model_type="fleet_model",
+        list_vehicle_type=[
+            VehicleTypeData(name="truck", count=1, capacity=4000.0, fixed_cost=1000.0)
+        ],
+    )
+    prior_output_data = execute_model(small_input_data, config)
+
+    list_window_output_data = []
+    original_execute_model = execute_model_module.execute_model
+
+    def spy_execute_model(input_data, config_data, prior_output_data=None):
+        if prior_output_data is not None:
+            assert set(prior_output_data.date2daily_data) <= set(
+                input_data.list_delivery_date
+            )
+            assert set(prior_output_data.order_name2delivery_status_data) <= set(
+                input_data.list_order_name
+            )
+        output_data = original_execute_model(input_data, config_data, prior_output_data)
+        list_window_output_data.append(output_data)
+        return output_data
+
+    monkeypatch.setattr(execute_model_module, "execute_model", spy_execute_model)
+    output_data = execute_model_module.execute_rolling_horizon(
+        small_input_data,
+        config.model_copy(
+            update={"rolling_horizon_window": 2, "rolling_horizon_overlap": 1}
+        ),
+        prior_output_data,
+    )
+    # 配送日1〜4を[1, 2], [2, 3], [3, 4]の区間で解き、1, 2, 3と4の配送日を確定させる
+    assert len(list_window_output_data) == 3
+    list_fixed_daily_data = [
+        list_window_output_data[0].date2daily_data[1],
+        list_window_output_data[1].date2daily_data[2],
+        list_window_output_data[2].date2daily_data[3],
+        list_window_output_data[2].date2daily_data[4],
+    ]
+    total_vehicle_cost = sum(
+        v.fixed_cost
+        for daily_data in list_fixed_daily_data
+        for v in daily_data.list_vehicle_route
+    )
+    assert total_vehicle_cost > 0.0
+    assert output_data.total_vehicle_cost == pytest.approx(total_vehicle_cost)
+    assert output_data.total_overtime_cost == pytest.approx(
+        sum(v.daily_overtime_cost for v in list_fixed_daily_data)
+    )
+    assert output_data.total_cost == pytest.approx(
+        output_data.total_overtime_cost
+        + output_data.total_outsourcing_cost
+        + output_data.total_vehicle_cost
+    )
+    assert set(output_data.order_name2delivery_status_data) == set(
+        small_input_data.list_order_name
+    )
+
+
+def test_portfolio(make_config, small_input_data):
+    """
+    ポートフォリオは設定ごとの結果を記録し、最適性が証明された解を採用する
+    解けなかった設定があっても、他の設定の解を返す
+    """
+    config = make_config(
+        list_portfolio_member=[
+            PortfolioMemberData(solver_model_type="heuristic_model"),
+            PortfolioMemberData(solver_model_type="naive_model"),
+            PortfolioMemberData(solver_model_type="unknown_model"),
+        ],
+    )
+    output_data = execute_model(small_input_data, config)
+    assert output_data.solve_info.status == "Optimal"
+    assert output_data.total_cost == pytest.approx(SMALL_OPTIMAL_COST)
+
+    list_member_log = output_data.solve_info.list_portfolio_member_log
+    assert [log.solver_model_type for log in list_member_log] == [
+        "heuristic_model",
+        "naive_model",
+        "unknown_model",
+    ]
+    assert [log.is_selected for log in list_member_log] == [False, True, False]
+    assert list_member_log[1].status == "Optimal"
+    assert list_member_log[1].total_cost == pytest.approx(output_data.total_cost)
+    assert list_member_log[2].status in ["Undefined", "NotSolved"]
+    assert list_member_log[2].total_cost is None
+    assert all(log.elapsed_time >= 0 for log in list_member_log)
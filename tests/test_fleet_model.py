@@ -0,0 +1,78 @@
+import shutil
+
+import polars as pl
+import pytest
+from conftest import SMALL_OPTIMAL_COST
+from pandera.errors import SchemaError
+
+from data_processor.input_cache import (
+    RAW_DATA_FROM_BOOK_DIR,
+    load_input_cache,
+    save_input_cache,
+)
+from data_processor.loader import read_csv_dir, validate_dataset
+from data_processor.make_input_data import build_input_data
+from models.fleet_model import FleetModel
+from optimize_dataclass.config_dataclass import VehicleTypeData
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    """
+    small_datasetのCSVに、積載量4000kgのトラック1台の車種データを加えたディレクトリ
+    """
+    csv_dir = tmp_path / "small_dataset"
+    shutil.copytree(RAW_DATA_FROM_BOOK_DIR / "small_dataset", csv_dir)
+    pl.DataFrame(
+        {"vehicle": ["truck"], "count": [1], "capacity": [4000.0], "fixed_cost": [0.0]}
+    ).write_csv(csv_dir / "vehicles.csv")
+    return csv_dir
+
+
+def test_vehicles_from_input_data(make_config, csv_dir):
+    list_df = read_csv_dir(csv_dir)
+    validate_dataset(list_df)
+    input_data = build_input_data(*list_df)
+    assert input_data.list_vehicle_type == [
+        VehicleTypeData(name="truck", count=1, capacity=4000.0)
+    ]
+
+    config = make_config(solver_model_type="fleet_model")
+    model = FleetModel(input_data, config)
+    assert model.list_vehicle_type == input_data.list_vehicle_type
+    model.add_variables().add_constraints().add_objectives()
+    assert model.optimize() == "Optimal"
+    assert model.get_result().total_cost == pytest.approx(SMALL_OPTIMAL_COST)
+
+    # 設定データの車種は入力データの車種より優先する
+    list_vehicle_type = [VehicleTypeData(name="small", count=2, capacity=2000.0)]
+    model = FleetModel(
+        input_data, config.model_copy(update={"list_vehicle_type": list_vehicle_type})
+    )
+    assert model.list_vehicle_type == list_vehicle_type
+
+
+def test_vehicles_are_optional(csv_dir, tmp_path):
+    (csv_dir / "vehicles.csv").unlink()
+    list_df = read_csv_dir(csv_dir)
+    assert list_df[3] is None
+    validate_dataset(list_df)
+    assert build_input_data(*list_df).list_vehicle_type == []
+
+    # 車種データがない場合もキャッシュから同じ構成で読み込める
+    cache_dir = tmp_path / "cache"
+    save_input_cache(list_df, "fingerprint", cache_dir=cache_dir)
+    cached = load_input_cache("fingerprint", cache_dir=cache_dir)
+    assert cached[3] is None
+    assert all(
+        df.equals(cached_df)
+        for df, cached_df in zip(list_df[:3], cached[:3], strict=True)
+    )
+
+
+def test_invalid_vehicles(csv_dir):
+    pl.DataFrame(
+        {"vehicle": ["truck"], "count": [0], "capacity": [4000.0], "fixed_cost": [0.0]}
+    ).write_csv(csv_dir / "vehicles.csv")
+    with pytest.raises(SchemaError, match="count"):
+        validate_dataset(read_csv_dir(csv_dir))
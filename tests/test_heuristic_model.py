@@ -0,0 +1,38 @@
+from conftest import SMALL_OPTIMAL_COST
+
+from models.heuristic_model import HeuristicModel
+
+
+def test_small_dataset(make_config, small_input_data):
+    """
+    発見的解法の解は実行可能で、最適値以上になる
+    """
+    model = HeuristicModel(small_input_data, make_config())
+    model.add_variables().add_constraints().add_objectives()
+    assert model.optimize() == "Feasible"
+    output_data = model.get_result()
+    for daily_data in output_data.date2daily_data.values():
+        assert daily_data.daily_move_time <= model._get_max_move_time() + 1e-6
+        assert daily_data.daily_total_weight <= model._get_truck_capacity() + 1e-6
+    assert output_data.total_cost >= SMALL_OPTIMAL_COST - 1e-6
+
+
+def test_relocate_without_triangle_inequality(make_config, small_input_data):
+    """
+    移動時間が三角不等式を満たさず、荷物を外すとルートが最大移動時間を超える場合も、
+    その荷物を移さずに局所探索を続ける
+    """
+    move_time_array = small_input_data.move_time_array.copy()
+    depot = small_input_data.location_name2index[small_input_data.depot_data.name]
+    for s in small_input_data.list_store_name[:3]:
+        store = small_input_data.location_name2index[s]
+        move_time_array[depot, store] *= 10
+    input_data = small_input_data.model_copy(
+        update={"move_time_array": move_time_array}
+    )
+
+    model = HeuristicModel(input_data, make_config())
+    model.add_variables().add_constraints().add_objectives()
+    assert model.optimize() == "Feasible"
+    for daily_data in model.get_result().date2daily_data.values():
+        assert daily_data.daily_move_time <= model._get_max_move_time() + 1e-6
@@ -0,0 +1,85 @@
+import pytest
+
+from models.incremental_naive_model import IncrementalNaiveModel
+from models.naive_model import NaiveModel
+
+
+@pytest.mark.parametrize("subtour_elimination_type", ["mtz", "flow", "lazy"])
+def test_incremental_model_matches_rebuilt_model(
+    make_config, small_input_data, subtour_elimination_type
+):
+    """
+    荷物の追加・取消・変更を差分として反映したモデルと、変更後の入力データで作り直したモデルの
+    最適値が一致する（配送先の店舗を訪問しうる店舗に追加する場合を含む）
+    """
+    config_data = make_config(subtour_elimination_type=subtour_elimination_type)
+    order_name2data = small_input_data.order_name2data
+    list_cancel = ["r8"]
+    list_order_data = [
+        # 配送日1に店舗s4を追加する変更
+        order_name2data["r2"].model_copy(update={"destination": "s4"}),
+        order_name2data["r1"].model_copy(
+            update={"weight": 500.0, "time_window_end": 4}
+        ),
+        # 配送日1に店舗s3を追加する荷物
+        order_name2data["r3"].model_copy(
+            update={
+                "name": "new_order",
+                "weight": 800.0,
+                "time_window_start": 1,
+                "time_window_end": 1,
+            }
+        ),
+    ]
+
+    model = IncrementalNaiveModel(small_input_data, config_data)
+    model.add_variables().add_constraints().add_objectives()
+    assert model.optimize() == "Optimal"
+    for order_name in list_cancel:
+        model.cancel_order(order_name)
+    for order_data in list_order_data:
+        if order_data.name in model.order_name2index:
+            model.update_order(order_data)
+        else:
+            model.add_order(order_data)
+    assert model.optimize() == "Optimal"
+
+    changed_order_name2data = {
+        r: order_data
+        for r, order_data in order_name2data.items()
+        if r not in list_cancel
+    } | {order_data.name: order_data for order_data in list_order_data}
+    changed_input_data = small_input_data.model_copy(
+        update={
+            "list_order_name": list(changed_order_name2data),
+            "order_name2data": changed_order_name2data,
+        }
+    )
+    rebuilt_model = NaiveModel(changed_input_data, config_data)
+    rebuilt_model.add_variables().add_constraints().add_objectives()
+    assert rebuilt_model.optimize() == "Optimal"
+    assert model.get_result().total_cost == pytest.approx(
+        rebuilt_model.get_result().total_cost
+    )
+
+
+def test_add_order_adds_location_only_to_deliverable_dates(
+    make_config, small_input_data
+):
+    """
+    荷物の配送先の店舗は、その荷物を配送可能な配送日にだけ訪問しうる地点に加わる
+    """
+    model = IncrementalNaiveModel(small_input_data, make_config())
+    model.add_variables().add_constraints().add_objectives()
+    s3 = model.location_name2index["s3"]
+    assert s3 not in model.date2list_location[0]
+    num_x = len(model.x)
+
+    model.add_order(
+        small_input_data.order_name2data["r3"].model_copy(
+            update={"name": "new_order", "time_window_start": 1, "time_window_end": 1}
+        )
+    )
+    assert s3 in model.date2list_location[0]
+    # 配送日1の既存の地点（デポ, s1, s2）との間の往復の枝だけが増える
+    assert len(model.x) == num_x + 2 * 3
@@ -0,0 +1,142 @@
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from data_processor import input_cache
+from data_processor.input_cache import (
+    RAW_DATA_FROM_BOOK_DIR,
+    clear_input_cache,
+    evict_input_cache,
+    get_input_cache_fingerprint,
+    is_validated,
+    load_input_cache,
+    load_validation_stamp,
+    read_dataset,
+    save_input_cache,
+    save_validation_stamp,
+)
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    """
+    書き換えても元データに影響しないように複製した、小規模データセットのCSV
+    """
+    path = tmp_path / "small_dataset"
+    shutil.copytree(RAW_DATA_FROM_BOOK_DIR / "small_dataset", path)
+    return path
+
+
+def test_cache_round_trip(csv_dir, tmp_path):
+    """
+    キャッシュに保存したデータフレームを、そのまま読み込める
+    """
+    list_source_path = sorted(csv_dir.glob("*.csv"))
+    fingerprint = get_input_cache_fingerprint(list_source_path)
+    cache_dir = tmp_path / "cache"
+    assert load_input_cache(fingerprint, cache_dir=cache_dir) is None
+
+    list_df = read_dataset(list_source_path)
+    save_input_cache(list_df, fingerprint, cache_dir=cache_dir)
+    list_cached_df = load_input_cache(fingerprint, cache_dir=cache_dir)
+    assert list_cached_df is not None
+    for df, cached_df in zip(list_df, list_cached_df, strict=True):
+        assert (df is None and cached_df is None) or df.equals(cached_df)
+
+
+def test_fingerprint_changes_with_source(csv_dir, tmp_path):
+    """
+    元データの内容を書き換えると別のキャッシュを参照し、古いキャッシュは使われない
+    """
+    list_source_path = sorted(csv_dir.glob("*.csv"))
+    fingerprint = get_input_cache_fingerprint(list_source_path)
+    cache_dir = tmp_path / "cache"
+    save_input_cache(read_dataset(list_source_path), fingerprint, cache_dir=cache_dir)
+
+    orders_path = csv_dir / "orders.csv"
+    orders_path.write_text(orders_path.read_text().replace("1000", "1001", 1))
+    new_fingerprint = get_input_cache_fingerprint(list_source_path)
+    assert new_fingerprint != fingerprint
+    assert load_input_cache(new_fingerprint, cache_dir=cache_dir) is None
+
+
+def test_fingerprint_changes_with_format_version(csv_dir, monkeypatch):
+    """
+    キャッシュの形式の版を上げると、同じ元データでも別のキャッシュを参照する
+    """
+    list_source_path = sorted(csv_dir.glob("*.csv"))
+    fingerprint = get_input_cache_fingerprint(list_source_path)
+    monkeypatch.setattr(
+        input_cache, "CACHE_FORMAT_VERSION", input_cache.CACHE_FORMAT_VERSION + 1
+    )
+    assert get_input_cache_fingerprint(list_source_path) != fingerprint
+
+
+def test_validation_stamp(tmp_path, monkeypatch):
+    """
+    検証済みの記録は、同等以上の検証をした場合だけ検証の代わりになり、
+    スキーマを変更すると無効になる
+    """
+    fingerprint = "dataset"
+    (tmp_path / fingerprint).mkdir()
+    assert load_validation_stamp(fingerprint, cache_dir=tmp_path) is None
+    assert not is_validated(None, "full", 10000)
+
+    save_validation_stamp(fingerprint, "full", 10000, {}, cache_dir=tmp_path)
+    stamp = load_validation_stamp(fingerprint, cache_dir=tmp_path)
+    assert is_validated(stamp, "full", 10000)
+    assert is_validated(stamp, "lazy", 10000)
+    assert is_validated(stamp, "sampled", 10**6)
+
+    save_validation_stamp(fingerprint, "sampled", 100, {}, cache_dir=tmp_path)
+    stamp = load_validation_stamp(fingerprint, cache_dir=tmp_path)
+    assert is_validated(stamp, "sampled", 100)
+    assert not is_validated(stamp, "sampled", 200)
+    assert not is_validated(stamp, "full", 100)
+
+    monkeypatch.setattr(input_cache, "get_schema_fingerprint", lambda: "changed")
+    assert not is_validated(stamp, "sampled", 100)
+
+
+def test_concurrent_save(csv_dir, tmp_path):
+    """
+    同じデータセットを同時に保存しても、壊れていないキャッシュが1つだけ残る
+    """
+    list_source_path = sorted(csv_dir.glob("*.csv"))
+    fingerprint = get_input_cache_fingerprint(list_source_path)
+    cache_dir = tmp_path / "cache"
+    list_df = read_dataset(list_source_path)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(
+            executor.map(
+                lambda _: save_input_cache(list_df, fingerprint, cache_dir=cache_dir),
+                range(16),
+            )
+        )
+    assert [p.name for p in cache_dir.iterdir()] == [fingerprint]
+    list_cached_df = load_input_cache(fingerprint, cache_dir=cache_dir)
+    for df, cached_df in zip(list_df, list_cached_df, strict=True):
+        assert (df is None and cached_df is None) or df.equals(cached_df)
+
+
+def test_evict_and_clear_keep_temporary_dirs(csv_dir, tmp_path):
+    """
+    他のプロセスが書き込み中の一時ディレクトリは、キャッシュの削除の対象にしない
+    """
+    list_source_path = sorted(csv_dir.glob("*.csv"))
+    fingerprint = get_input_cache_fingerprint(list_source_path)
+    cache_dir = tmp_path / "cache"
+    list_df = read_dataset(list_source_path)
+    save_input_cache(list_df, fingerprint, cache_dir=cache_dir)
+    tmp_dir_path = cache_dir / "other.abc123.tmp"
+    tmp_dir_path.mkdir()
+    (tmp_dir_path / "orders.arrow").write_bytes(b"writing")
+
+    evict_input_cache(cache_dir, max_cache_bytes=0)
+    assert load_input_cache(fingerprint, cache_dir=cache_dir) is None
+    assert tmp_dir_path.exists()
+
+    save_input_cache(list_df, fingerprint, cache_dir=cache_dir)
+    clear_input_cache(cache_dir)
+    assert [p.name for p in cache_dir.iterdir()] == [tmp_dir_path.name]
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from data_processor.input_cache import get_list_source_path, read_dataset
+from data_processor.make_input_data import build_input_data
+from optimize_dataclass.io_dataclass import InputData, OrderDataView, OrderTable
+from route_processor.route_table import make_move_time_array
+
+
+@pytest.fixture(scope="module")
+def list_df():
+    return read_dataset(get_list_source_path("small_dataset"))
+
+
+def assert_order_table_equal(order_table: OrderTable, expected: OrderTable):
+    assert order_table.list_order_name == expected.list_order_name
+    assert (
+        order_table.get_destination(expected.list_location_name).tolist()
+        == expected.destination_index.tolist()
+    )
+    for name in ["weight", "time_window_start", "time_window_end"]:
+        np.testing.assert_array_equal(
+            getattr(order_table, name), getattr(expected, name)
+        )
+
+
+def test_order_data_view_matches_dict(list_df):
+    """
+    配送注文の表のビューで持つ入力データと、荷物ごとに配送注文データを作る入力データは、
+    同じ配送注文データと配送注文の表を返す
+    """
+    view_input_data = build_input_data(*list_df, use_order_table=True)
+    dict_input_data = build_input_data(*list_df, use_order_table=False)
+    assert isinstance(view_input_data.order_name2data, OrderDataView)
+    assert isinstance(dict_input_data.order_name2data, dict)
+
+    assert dict(view_input_data.order_name2data) == dict_input_data.order_name2data
+    assert_order_table_equal(
+        view_input_data.get_order_table(), dict_input_data.get_order_table()
+    )
+
+    # 一部の荷物を並べ替えた表
+    list_order_name = view_input_data.list_order_name[::-2]
+    assert_order_table_equal(
+        view_input_data.order_name2data.get_order_table(list_order_name),
+        OrderTable.from_list_order_data(
+            [dict_input_data.order_name2data[r] for r in list_order_name]
+        ),
+    )
+
+
+def test_order_data_view_json_round_trip(list_df):
+    """
+    ビューで持つ入力データをJSONに書き出して読み込むと、辞書で持つ同じ入力データになる
+    """
+    input_data = build_input_data(*list_df, use_order_table=True)
+    loaded_input_data = InputData.model_validate_json(input_data.model_dump_json())
+    assert isinstance(loaded_input_data.order_name2data, dict)
+    assert loaded_input_data.order_name2data == dict(input_data.order_name2data)
+    assert_order_table_equal(
+        loaded_input_data.get_order_table(), input_data.get_order_table()
+    )
+    np.testing.assert_array_equal(
+        loaded_input_data.move_time_array, input_data.move_time_array
+    )
+
+
+def test_move_time_array_matches_distances(list_df):
+    """
+    移動時間の行列は、デポを0番目とした地点の添字で店舗間距離のデータフレームの全ての行と一致し、
+    地点名のリストの順番に並べ替えた部分行列も作れる
+    """
+    df_distances = list_df[1]
+    input_data = build_input_data(*list_df)
+    assert input_data.location_name2index[input_data.depot_data.name] == 0
+    assert (
+        input_data.move_time_array.shape == (len(input_data.location_name2index),) * 2
+    )
+    for location1, location2, time_to_move in df_distances.iter_rows():
+        assert input_data.get_move_time(location1, location2) == time_to_move
+
+    list_location_name = list(input_data.list_store_name)[::-1]
+    move_time = make_move_time_array(input_data, list_location_name)
+    for k1, location1 in enumerate(list_location_name):
+        for k2, location2 in enumerate(list_location_name):
+            assert move_time[k1, k2] == input_data.get_move_time(location1, location2)
+
+
+def test_missing_move_time(list_df):
+    """
+    移動時間が定義されていない地点の組合せがあればエラーとする
+    """
+    df_locations, df_distances, df_orders, df_vehicles = list_df
+    with pytest.raises(ValueError, match="移動時間"):
+        build_input_data(df_locations, df_distances[1:], df_orders, df_vehicles)
@@ -0,0 +1,17 @@
+import pytest
+from conftest import SMALL_OPTIMAL_COST
+
+from models.lagrangian_bound import LagrangianBoundSolver
+
+
+def test_lagrangian_bound(make_config, small_input_data):
+    """
+    配送日ごとの価格付け問題を並列に解いても、逐次に解いた場合と同じ有効な下界が得られる
+    """
+    list_lower_bound = []
+    for threads in [1, 2]:
+        config = make_config(threads=threads, max_lagrangian_round=20)
+        solver = LagrangianBoundSolver(small_input_data, config)
+        list_lower_bound.append(solver.solve(upper_bound=SMALL_OPTIMAL_COST))
+    assert list_lower_bound[0] == pytest.approx(list_lower_bound[1])
+    assert list_lower_bound[0] <= SMALL_OPTIMAL_COST * (1 + 1e-6)
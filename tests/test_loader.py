@@ -0,0 +1,78 @@
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+from xlsxwriter import Workbook
+
+from data_processor.input_cache import RAW_DATA_DIR, RAW_DATA_FROM_BOOK_DIR
+from data_processor.loader import (
+    load_distances_mst,
+    load_locations_mst,
+    load_orders,
+    load_vehicles_mst,
+    load_workbook,
+    read_csv_dir,
+    read_workbook,
+    sheet_name2column_name2dtype,
+)
+
+dtype_name2dtype = {"string": pl.String, "float": pl.Float64, "int": pl.Int64}
+
+
+@pytest.mark.parametrize("dataset_name", ["small_dataset", "medium_dataset"])
+def test_workbook_matches_csv(dataset_name):
+    """
+    ワークブックを一度だけ開いて読み込んだシートは、指定した列と型で、同じデータセットのCSVと一致する
+    （浮動小数点数は、ExcelとCSVで丸め誤差の範囲で一致する）
+    """
+    list_df = read_workbook(RAW_DATA_DIR / f"{dataset_name}.xlsx")
+    list_csv_df = read_csv_dir(RAW_DATA_FROM_BOOK_DIR / dataset_name)
+    for sheet_name, df, csv_df in zip(
+        sheet_name2column_name2dtype, list_df, list_csv_df, strict=True
+    ):
+        if df is None:
+            assert csv_df is None
+            continue
+        column_name2dtype = sheet_name2column_name2dtype[sheet_name]
+        assert df.schema == pl.Schema(
+            {k: dtype_name2dtype[v] for k, v in column_name2dtype.items()}
+        )
+        assert_frame_equal(df, csv_df)
+
+
+def test_sheet_loaders(tmp_path):
+    """
+    シートごとの読み込みは、必要な列だけを読み込み、一度に読み込んだ場合と一致する
+    車種のシートは省略できる
+    """
+    list_df = read_workbook(RAW_DATA_DIR / "small_dataset.xlsx")
+    filepath = tmp_path / "dataset.xlsx"
+    with Workbook(filepath) as wb:
+        for sheet_name, df in zip(sheet_name2column_name2dtype, list_df, strict=True):
+            if df is not None:
+                df.with_columns(pl.lit("unused").alias("memo")).write_excel(
+                    workbook=wb, worksheet=sheet_name
+                )
+    for df, loaded_df, sheet_df in zip(
+        list_df[:3],
+        load_workbook(filepath),
+        [
+            load_locations_mst(filepath),
+            load_distances_mst(filepath),
+            load_orders(filepath),
+        ],
+        strict=True,
+    ):
+        assert_frame_equal(loaded_df, df)
+        assert_frame_equal(sheet_df, df)
+    assert load_vehicles_mst(filepath) is None
+
+    df_vehicles = pl.DataFrame(
+        {"vehicle": ["truck"], "count": [2], "capacity": [4000.0], "fixed_cost": [0.0]}
+    )
+    with Workbook(filepath) as wb:
+        for sheet_name, df in zip(
+            sheet_name2column_name2dtype, [*list_df[:3], df_vehicles], strict=True
+        ):
+            df.write_excel(workbook=wb, worksheet=sheet_name)
+    assert_frame_equal(read_workbook(filepath)[3], df_vehicles)
+    assert_frame_equal(load_vehicles_mst(filepath), df_vehicles)
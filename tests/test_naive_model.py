@@ -0,0 +1,195 @@
+import pytest
+from conftest import SMALL_OPTIMAL_COST
+
+from execute_model import execute_model
+from models.naive_model import NaiveModel
+from models.solver_backend import solve
+from optimize_dataclass.config_dataclass import ConstraintData, ObjectiveData
+
+# モデルを強化する妥当不等式の設定名
+LIST_VALID_INEQUALITY_NAME = [
+    "day_symmetry_constraint",
+    "knapsack_cover_constraint",
+    "store_capacity_linking_constraint",
+    "tour_lower_bound_constraint",
+]
+
+
+@pytest.mark.parametrize("is_truck_capacity_applied", [True, False])
+def test_flow_matches_mtz(make_config, small_input_data, is_truck_capacity_applied):
+    """
+    単一品種フロー定式化は、積載量の制約条件の有無によらずMTZ定式化と同じ最適値になる
+    """
+    list_total_cost = []
+    for subtour_elimination_type in ["mtz", "flow"]:
+        model = NaiveModel(
+            small_input_data,
+            make_config(
+                subtour_elimination_type=subtour_elimination_type,
+                truck_capacity_constraint=ConstraintData(
+                    is_applied=is_truck_capacity_applied
+                ),
+            ),
+        )
+        model.add_variables().add_constraints().add_objectives()
+        assert model.optimize() == "Optimal"
+        list_total_cost.append(model.get_result().total_cost)
+    assert list_total_cost[1] == pytest.approx(list_total_cost[0])
+    if is_truck_capacity_applied:
+        assert list_total_cost[0] == pytest.approx(SMALL_OPTIMAL_COST)
+    else:
+        assert list_total_cost[0] <= SMALL_OPTIMAL_COST
+
+
+def test_lazy_subtour_elimination(make_config, small_input_data):
+    model = NaiveModel(
+        small_input_data,
+        make_config(subtour_elimination_type="lazy"),
+    )
+    model.add_variables().add_constraints().add_objectives()
+    assert model.optimize() == "Optimal"
+    assert model.get_result().total_cost == pytest.approx(SMALL_OPTIMAL_COST)
+
+
+def test_lazy_progress_records_objective_value(make_config, small_input_data):
+    """
+    遅延制約で記録する暫定解は、総費用ではなく下界と同じ目的関数値とする
+    """
+    list_progress = []
+    output_data = execute_model(
+        small_input_data,
+        make_config(
+            subtour_elimination_type="lazy",
+            total_cost_objective=ObjectiveData(
+                priority=2, direction="minimize", is_applied=False
+            ),
+        ),
+        progress_callback=list_progress.append,
+    )
+    assert output_data.solve_info.status == "Optimal"
+    assert len(list_progress) > 0
+    for progress in list_progress:
+        if progress.primal_bound is not None and progress.dual_bound is not None:
+            assert progress.primal_bound >= progress.dual_bound - 1e-6
+    assert list_progress[-1].primal_bound == pytest.approx(
+        output_data.total_overtime_cost
+    )
+    assert output_data.total_cost > output_data.total_overtime_cost
+
+
+def test_repair_subtours(make_config, small_input_data):
+    """
+    部分巡回路除去の制約条件なしで解いた解を修復すると、
+    配送する荷物の店舗を全て最大移動時間内に巡回する実行可能解になる
+    """
+    model = NaiveModel(
+        small_input_data,
+        make_config(subtour_elimination_type="lazy"),
+    )
+    model.add_variables().add_constraints().add_objectives()
+    model.variable_values = solve(model.model, model.config).variable_values()
+    assert any(len(model._find_subtours(i)) > 0 for i in range(model.num_date))
+
+    model.variable_values = model._repair_subtours()
+    output_data = model.get_result()
+    for d, daily_data in output_data.date2daily_data.items():
+        set_visited = {s.name for s in daily_data.list_delivery_route[1:-1]}
+        set_delivered = {
+            small_input_data.order_name2data[r].destination
+            for r, status in output_data.order_name2delivery_status_data.items()
+            if status.delivered_date == d
+        }
+        assert set_visited == set_delivered
+        assert daily_data.daily_move_time <= model._get_max_move_time() + 1e-6
+    assert output_data.total_cost == pytest.approx(
+        output_data.total_overtime_cost + output_data.total_outsourcing_cost
+    )
+    assert output_data.total_cost >= SMALL_OPTIMAL_COST - 1e-6
+
+
+@pytest.mark.parametrize(
+    "list_name",
+    [[n] for n in LIST_VALID_INEQUALITY_NAME] + [LIST_VALID_INEQUALITY_NAME],
+)
+def test_valid_inequalities_keep_optimal_cost(make_config, small_input_data, list_name):
+    """
+    妥当不等式を加えても、最適値は変わらない
+    """
+    model = NaiveModel(
+        small_input_data,
+        make_config(**{n: ConstraintData(is_applied=True) for n in list_name}),
+    )
+    model.add_variables().add_constraints().add_objectives()
+    assert model.optimize() == "Optimal"
+    assert model.get_result().total_cost == pytest.approx(SMALL_OPTIMAL_COST)
+
+
+def test_tour_lower_bound_without_triangle_inequality(make_config, small_input_data):
+    """
+    移動時間が三角不等式を満たさない場合は、警告を出して巡回路の下界の不等式を加えず、
+    加えない場合と同じ最適値になる
+    """
+    move_time_array = small_input_data.move_time_array.copy()
+    depot = small_input_data.location_name2index[small_input_data.depot_data.name]
+    store = small_input_data.location_name2index[small_input_data.list_store_name[0]]
+    move_time_array[depot, store] *= 10
+    input_data = small_input_data.model_copy(
+        update={"move_time_array": move_time_array}
+    )
+
+    model = NaiveModel(input_data, make_config())
+    model.add_variables().add_constraints().add_objectives()
+    assert model.optimize() == "Optimal"
+    expected_cost = model.get_result().total_cost
+
+    model = NaiveModel(
+        input_data,
+        make_config(tour_lower_bound_constraint=ConstraintData(is_applied=True)),
+    )
+    with pytest.warns(UserWarning, match="三角不等式"):
+        model.add_variables().add_constraints().add_objectives()
+    assert model.optimize() == "Optimal"
+    assert model.get_result().total_cost == pytest.approx(expected_cost)
+
+
+def test_debug_names_and_build_time(make_config, small_input_data):
+    """
+    変数には、デバッグ時だけ名前を付ける。モデルの構築時間は求解時間と別に記録する
+    """
+    model = NaiveModel(small_input_data, make_config())
+    model.add_variables()
+    assert all(v.name == "" for v in [*model.x.values(), *model.y.values()])
+
+    model = NaiveModel(small_input_data, make_config(enable_debug_name=True))
+    model.add_variables()
+    list_name = [v.name for v in [*model.x.values(), *model.y.values()]]
+    assert all(name != "" for name in list_name)
+    assert len(set(list_name)) == len(list_name)
+
+    solve_info = execute_model(small_input_data, make_config()).solve_info
+    assert solve_info.build_time >= 0
+    assert solve_info.solve_time >= 0
+
+
+def test_only_nonzero_variables(make_config, small_input_data):
+    """
+    荷物の変数は指定配送期間内の配送日だけに作り、地点移動の変数はその日に配送可能な荷物の
+    店舗とデポの間だけに作る（自己ループは作らない）
+    """
+    model = NaiveModel(small_input_data, make_config())
+    model.add_variables()
+
+    set_expected_y = set()
+    set_expected_x = set()
+    for i, d in enumerate(small_input_data.list_delivery_date):
+        set_location_name = {small_input_data.depot_data.name}
+        for j, r in enumerate(small_input_data.list_order_name):
+            order_data = small_input_data.order_name2data[r]
+            if order_data.time_window_start <= d <= order_data.time_window_end:
+                set_expected_y.add((i, j))
+                set_location_name.add(order_data.destination)
+        list_k = [model.location_name2index[k] for k in set_location_name]
+        set_expected_x |= {(i, k1, k2) for k1 in list_k for k2 in list_k if k1 != k2}
+    assert set(model.y) == set_expected_y
+    assert set(model.x) == set_expected_x
+    assert len(model.y) < model.num_date * model.num_order
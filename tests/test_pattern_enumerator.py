@@ -0,0 +1,55 @@
+import itertools
+
+from route_processor.pattern_enumerator import (
+    PatternEnumerator,
+    get_list_deliverable_order_name,
+)
+from route_processor.route_table import compute_route_table
+
+TRUCK_CAPACITY = 4000.0
+MAX_MOVE_TIME = 11.0
+
+
+def test_patterns_match_brute_force(small_input_data):
+    """
+    深さ優先探索で列挙した配送パターンは、配送可能な荷物の全ての組合せから
+    積載量を超えるもの、実行可能な配送ルートがないもの、支配されるものを除いたものと一致する
+    """
+    route_table = compute_route_table(small_input_data)
+    enumerator = PatternEnumerator(
+        small_input_data, route_table, TRUCK_CAPACITY, MAX_MOVE_TIME
+    )
+    order_name2data = small_input_data.order_name2data
+    for d in small_input_data.list_delivery_date:
+        list_pattern = list(enumerator.iter_patterns(d))
+        for pattern in list_pattern:
+            mask = route_table.get_mask(
+                [order_name2data[r].destination for r in pattern.list_order_name]
+            )
+            assert pattern.route_data == route_table.get_route_data(mask)
+
+        list_order_name = get_list_deliverable_order_name(small_input_data, d)
+        set_expected = set()
+        for n in range(len(list_order_name) + 1):
+            for list_chosen in itertools.combinations(list_order_name, n):
+                weight = sum(order_name2data[r].weight for r in list_chosen)
+                set_store_name = {order_name2data[r].destination for r in list_chosen}
+                mask = route_table.get_mask(set_store_name)
+                if (
+                    weight > TRUCK_CAPACITY
+                    or route_table.move_time[mask] > MAX_MOVE_TIME
+                ):
+                    continue
+                # 同じ店舗の組合せで、さらに荷物を積めるなら支配される
+                if any(
+                    r not in list_chosen
+                    and order_name2data[r].destination in set_store_name
+                    and weight + order_name2data[r].weight <= TRUCK_CAPACITY
+                    for r in list_order_name
+                ):
+                    continue
+                set_expected.add(frozenset(list_chosen))
+
+        list_order_set = [frozenset(p.list_order_name) for p in list_pattern]
+        assert len(list_order_set) == len(set(list_order_set))
+        assert set(list_order_set) == set_expected
@@ -0,0 +1,17 @@
+import pytest
+
+from route_processor.pricing import get_weight_unit, is_exact_weight_unit
+
+
+@pytest.mark.parametrize(
+    ("list_weight", "capacity", "expected"),
+    [
+        ([1000.0, 1500.0], 4000.0, True),
+        ([1.0, 3001.0], 4001.0, False),  # 刻み数が多すぎて積載量を等分する
+        ([0.5, 1.25], 4000.0, False),
+    ],
+)
+def test_is_exact_weight_unit(list_weight, capacity, expected):
+    assert is_exact_weight_unit(list_weight, capacity) == expected
+    if expected:
+        assert get_weight_unit(list_weight, capacity) == 500.0
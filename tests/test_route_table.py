@@ -0,0 +1,56 @@
+import itertools
+
+import pytest
+
+from route_processor import route_table as route_table_module
+from route_processor.route_table import (
+    compute_route_table,
+    make_move_time_array,
+    satisfies_triangle_inequality,
+)
+
+
+def test_held_karp_matches_brute_force(small_input_data):
+    """
+    動的計画法で求めた全ての店舗の組合せの最短巡回ルートは、訪問順を全て列挙した場合と一致する
+    """
+    route_table = compute_route_table(small_input_data)
+    list_store_name = route_table.list_store_name
+    move_time = make_move_time_array(
+        small_input_data, [small_input_data.depot_data.name] + list_store_name
+    )
+    for mask in range(1, 1 << route_table.num_store):
+        list_store = [k + 1 for k in range(route_table.num_store) if mask >> k & 1]
+        min_move_time = min(
+            sum(move_time[k1, k2] for k1, k2 in itertools.pairwise([0, *path, 0]))
+            for path in itertools.permutations(list_store)
+        )
+        route_data = route_table.get_route_data(mask)
+        assert route_data.move_time == pytest.approx(min_move_time)
+        assert sorted(route_data.list_store_name) == route_table.get_list_store_name(
+            mask
+        )
+        path = [0] + [list_store_name.index(s) + 1 for s in route_data.list_store_name]
+        assert sum(
+            move_time[k1, k2] for k1, k2 in itertools.pairwise([*path, 0])
+        ) == pytest.approx(min_move_time)
+
+
+def test_too_many_stores(small_input_data, monkeypatch):
+    """
+    店舗数が上限を超える場合は、ルート表を作らずにエラーとする
+    """
+    monkeypatch.setattr(
+        route_table_module,
+        "MAX_ROUTE_TABLE_NUM_STORE",
+        len(small_input_data.list_store_name) - 1,
+    )
+    with pytest.raises(ValueError, match="上限"):
+        compute_route_table(small_input_data)
+
+
+def test_triangle_inequality(small_input_data):
+    move_time = small_input_data.move_time_array.copy()
+    assert satisfies_triangle_inequality(move_time)
+    move_time[0, 1] = move_time[0, 2] + move_time[2, 1] + 1.0
+    assert not satisfies_triangle_inequality(move_time)
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from route_processor.route_table import compute_route_table
+from route_processor.route_table_cache import (
+    clear_route_table_cache,
+    evict_route_table_cache,
+    get_route_table_fingerprint,
+    load_route_table,
+    save_route_table,
+)
+
+
+def test_warm_cache_matches_computation(small_input_data, tmp_path):
+    """
+    キャッシュから読み込んだルート表は、計算したルート表と一致する
+    """
+    fingerprint = get_route_table_fingerprint(small_input_data)
+    assert load_route_table(fingerprint, cache_dir=tmp_path) is None
+
+    route_table = compute_route_table(small_input_data)
+    save_route_table(route_table, fingerprint, cache_dir=tmp_path)
+    cached_route_table = load_route_table(fingerprint, cache_dir=tmp_path)
+    assert cached_route_table.list_store_name == route_table.list_store_name
+    for name in ["move_time", "last_store", "predecessor"]:
+        np.testing.assert_array_equal(
+            getattr(cached_route_table, name), getattr(route_table, name)
+        )
+
+
+def test_concurrent_save(small_input_data, tmp_path):
+    """
+    同じルート表を同時に保存しても、壊れていないキャッシュが1つだけ残る
+    """
+    fingerprint = get_route_table_fingerprint(small_input_data)
+    route_table = compute_route_table(small_input_data)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(
+            executor.map(
+                lambda _: save_route_table(
+                    route_table, fingerprint, cache_dir=tmp_path
+                ),
+                range(16),
+            )
+        )
+    assert [p.name for p in tmp_path.iterdir()] == [f"{fingerprint}.npz"]
+    cached_route_table = load_route_table(fingerprint, cache_dir=tmp_path)
+    np.testing.assert_array_equal(cached_route_table.move_time, route_table.move_time)
+
+
+def test_evict_and_clear_keep_temporary_files(small_input_data, tmp_path):
+    """
+    他のプロセスが書き込み中の一時ファイルは、キャッシュの削除の対象にしない
+    """
+    fingerprint = get_route_table_fingerprint(small_input_data)
+    save_route_table(
+        compute_route_table(small_input_data), fingerprint, cache_dir=tmp_path
+    )
+    tmp_file_path = tmp_path / "other.abc123.tmp"
+    tmp_file_path.write_bytes(b"writing")
+
+    evict_route_table_cache(tmp_path, max_cache_bytes=0)
+    assert load_route_table(fingerprint, cache_dir=tmp_path) is None
+    assert tmp_file_path.exists()
+
+    save_route_table(
+        compute_route_table(small_input_data), fingerprint, cache_dir=tmp_path
+    )
+    clear_route_table_cache(tmp_path)
+    assert [p.name for p in tmp_path.iterdir()] == [tmp_file_path.name]
@@ -0,0 +1,25 @@
+import pytest
+from conftest import SMALL_OPTIMAL_COST
+
+from execute_model import execute_model
+from models.set_cover_model import SetCoverModel
+
+
+def test_small_dataset(make_config, small_input_data):
+    """
+    配送パターンを利用したモデルは、素朴なモデルと同じ最適値になり、
+    配送結果は積載量と最大移動時間を守る
+    """
+    model = SetCoverModel(
+        small_input_data, make_config(solver_model_type="set_cover_model")
+    )
+    model.add_variables().add_constraints().add_objectives()
+    assert model.optimize() == "Optimal"
+    output_data = model.get_result()
+    assert output_data.total_cost == pytest.approx(SMALL_OPTIMAL_COST)
+    for daily_data in output_data.date2daily_data.values():
+        assert daily_data.daily_move_time <= model._get_max_move_time() + 1e-6
+        assert daily_data.daily_total_weight <= model._get_truck_capacity() + 1e-6
+
+    naive_output_data = execute_model(small_input_data, make_config())
+    assert output_data.total_cost == pytest.approx(naive_output_data.total_cost)
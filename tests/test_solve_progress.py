@@ -0,0 +1,92 @@
+import pytest
+from conftest import SMALL_OPTIMAL_COST
+from ortools.math_opt.python import mathopt
+
+from execute_model import execute_model, iter_execute_model
+from models.solve_progress import CpSatLogParser, SolveProgressRecorder
+from optimize_dataclass.io_dataclass import OutputData, ProgressData
+
+# CP-SATは係数を整数に拡大して解くため、目的関数値に丸め誤差が残る
+CP_SAT_REL_TOLERANCE = 1e-6
+
+
+def test_cp_sat_log_parser():
+    recorder = SolveProgressRecorder()
+    parser = CpSatLogParser(recorder)
+    parser(
+        [
+            "#1       0.01s best:120.5 next:[80.25,120.49] fixed_bools=0/10",
+            "#Model   0.02s var:10/10 constraints:5/5",
+            "#Bound   0.03s best:120.5 next:[95,120.49] max_lp",
+            "#Done    0.05s best:100 next:[] core",
+        ]
+    )
+    assert [(p.primal_bound, p.dual_bound) for p in recorder.list_progress] == [
+        (120.5, 80.25),
+        (120.5, 95.0),
+        (100.0, 100.0),
+    ]
+
+
+@pytest.mark.parametrize("solver_model_type", ["naive_model", "set_cover_model"])
+def test_cp_sat_with_progress_recorder(
+    make_config, small_input_data, solver_model_type
+):
+    list_progress = []
+    output_data = execute_model(
+        small_input_data,
+        make_config(
+            solver_model_type=solver_model_type,
+            solver_backend="cp_sat",
+        ),
+        progress_callback=list_progress.append,
+    )
+    assert output_data.solve_info.status == "Optimal"
+    assert output_data.total_cost == pytest.approx(
+        SMALL_OPTIMAL_COST, rel=CP_SAT_REL_TOLERANCE
+    )
+    assert len(list_progress) > 0
+    assert list_progress[-1].primal_bound == pytest.approx(
+        output_data.total_cost, rel=CP_SAT_REL_TOLERANCE
+    )
+    assert list_progress[-1].dual_bound == pytest.approx(
+        output_data.total_cost, rel=CP_SAT_REL_TOLERANCE
+    )
+
+
+def test_gscip_progress_with_multiple_threads(make_config, small_input_data):
+    """
+    GSCIPを並列計算で解く場合もスレッド数は変えず、終了時に進捗をまとめて通知する
+    """
+    config_data = make_config(solver_model_type="naive_model", threads=4)
+    list_data = list(iter_execute_model(small_input_data, config_data))
+    assert isinstance(list_data[-1], OutputData)
+    list_progress = list_data[:-1]
+    assert len(list_progress) > 0
+    assert all(isinstance(data, ProgressData) for data in list_progress)
+    assert list_progress[-1].primal_bound == pytest.approx(SMALL_OPTIMAL_COST, abs=0.01)
+
+
+def test_gscip_streams_progress_with_single_thread(
+    make_config, small_input_data, monkeypatch
+):
+    """
+    single_thread_gscip_progressを指定すると、進捗を逐次通知するために1スレッドで解く
+    """
+    list_threads = []
+    original_solve = mathopt.solve
+
+    def spy_solve(*args, params, **kwargs):
+        list_threads.append(params.threads)
+        return original_solve(*args, params=params, **kwargs)
+
+    monkeypatch.setattr(mathopt, "solve", spy_solve)
+    config_data = make_config(
+        solver_model_type="naive_model", threads=4, single_thread_gscip_progress=True
+    )
+    list_data = list(iter_execute_model(small_input_data, config_data))
+    assert list_threads == [1]
+    list_progress = list_data[:-1]
+    assert len(list_progress) > 1
+    assert all(isinstance(data, ProgressData) for data in list_progress)
+    assert list_progress[-1].primal_bound == pytest.approx(SMALL_OPTIMAL_COST, abs=0.01)
@@ -0,0 +1,44 @@
+import pytest
+from conftest import SMALL_OPTIMAL_COST
+
+from execute_model import execute_model
+
+
+@pytest.mark.parametrize("solver_backend", ["gscip", "highs", "cp_sat"])
+@pytest.mark.parametrize(
+    "solver_model_type",
+    [
+        "naive_model",
+        "set_cover_model",
+        "column_generation_model",
+        "decomposition_model",
+        "fleet_model",
+    ],
+)
+def test_small_optimal_cost(
+    make_config, small_input_data, solver_model_type, solver_backend
+):
+    """
+    どの最適化モデルとソルバーの組合せでも、小規模データセットの最適値が得られる
+    """
+    output_data = execute_model(
+        small_input_data,
+        make_config(
+            solver_model_type=solver_model_type,
+            solver_backend=solver_backend,
+        ),
+    )
+    assert output_data.solve_info.status == "Optimal"
+    assert output_data.total_cost == pytest.approx(SMALL_OPTIMAL_COST)
+
+
+def test_heuristic_small_cost(make_config, small_input_data):
+    """
+    ソルバーを使わない発見的解法でも、小規模データセットでは最適値の解が得られる
+    """
+    output_data = execute_model(
+        small_input_data,
+        make_config(solver_model_type="heuristic_model"),
+    )
+    assert output_data.solve_info.status == "Feasible"
+    assert output_data.total_cost == pytest.approx(SMALL_OPTIMAL_COST)
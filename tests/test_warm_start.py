@@ -0,0 +1,64 @@
+import pytest
+from conftest import SMALL_OPTIMAL_COST
+from ortools.math_opt.python import mathopt
+
+from execute_model import execute_model
+from models.naive_model import NaiveModel
+
+TOLERANCE = 1e-6
+
+
+def assert_feasible(model: mathopt.Model, values: dict[mathopt.Variable, float]):
+    """
+    全ての変数の値が定まっていて、変数の範囲・整数条件と全ての制約条件を満たす
+    """
+    for v in model.variables():
+        value = values[v]
+        assert v.lower_bound - TOLERANCE <= value <= v.upper_bound + TOLERANCE
+        if v.integer:
+            assert value == pytest.approx(round(value), abs=TOLERANCE)
+    for c in model.linear_constraints():
+        activity = sum(term.coefficient * values[term.variable] for term in c.terms())
+        assert c.lower_bound - TOLERANCE <= activity <= c.upper_bound + TOLERANCE
+
+
+@pytest.mark.parametrize("subtour_elimination_type", ["mtz", "flow"])
+def test_naive_model_hint_is_feasible(
+    make_config, small_input_data, subtour_elimination_type
+):
+    """
+    最適解を前回の最適化結果として与えると、初期解（ヒント）は実行可能で最適値になる
+    """
+    config = make_config(subtour_elimination_type=subtour_elimination_type)
+    prior_output_data = execute_model(small_input_data, config)
+
+    model = NaiveModel(small_input_data, config, prior_output_data)
+    model.add_variables().add_constraints().add_objectives()
+    values = model._make_solution_hint().variable_values
+    assert_feasible(model.model, values)
+    assert values[model.total_cost] == pytest.approx(SMALL_OPTIMAL_COST)
+
+
+@pytest.mark.parametrize(
+    "solver_model_type",
+    [
+        "naive_model",
+        "set_cover_model",
+        "column_generation_model",
+        "decomposition_model",
+        "fleet_model",
+    ],
+)
+def test_warm_start_from_heuristic(make_config, small_input_data, solver_model_type):
+    """
+    発見的解法の解を初期解として解いても、最適値が得られる
+    """
+    output_data = execute_model(
+        small_input_data,
+        make_config(
+            solver_model_type=solver_model_type,
+            warm_start_solver_model_type="heuristic_model",
+        ),
+    )
+    assert output_data.solve_info.warm_start_time is not None
+    assert output_data.total_cost == pytest.approx(SMALL_OPTIMAL_COST)